@@ -30,6 +30,9 @@ _FOLDERS = {
     "root": BASE_DIR,
     "data_raw": BASE_DIR / "data_raw",
     "data_plan": BASE_DIR / "data_plan",
+    "data_manifest": BASE_DIR / "data_manifest",
+    "data_remote": BASE_DIR / "data_remote",
+    "data_storage": BASE_DIR / "data_storage",
     
     # Procesamiento (Estructura data_processed)
     "proc_core01": BASE_DIR / "data_processed" / "a02_processing" / "core01_proc_one_file",
@@ -1,10 +1,11 @@
 # =============================================================================
 # FILE PATH: src/goes_processor/SoT/goes_prod.py
-# Version: 1.0.1 (Strict Library & Integrity Validation)
+# Version: 1.0.3 (Cached lazy integrity validation)
 # =============================================================================
 
 try:
     from types import MappingProxyType
+    from functools import lru_cache
     import re
 except ImportError as e:
     print("\n" + "="*80)
@@ -22,7 +23,7 @@ REQUIRED_KEYS = frozenset({
     "full_name", "description", "level", "init_file_name",
     "units", "typical_range", "main_use", "notes",
     "total_files_one_day", "time_lapse", "time_lapse_label",
-    "type", "default_time"
+    "type", "default_time", "match_tolerance_sec"
 })
 
 REQUIRED_RASTER_KEYS = frozenset({
@@ -53,6 +54,8 @@ _PRIVATE_PRODUCTS = {
         "cadence_full_disk": "1 hour",
         "resolution_nominal": "2 km",
         "shape_full_disk": (5424, 5424),
+        # Producto horario: el inicio real puede correrse varios minutos.
+        "match_tolerance_sec": 900,
         "default_time": {
             "hours": [f"{m:02d}" for m in range(0, 24, 1)],
             "minutes": None,
@@ -75,6 +78,7 @@ _PRIVATE_PRODUCTS = {
         "cadence_full_disk": "1 hour",
         "resolution_nominal": "2 km",
         "shape_full_disk": (5424, 5424),
+        "match_tolerance_sec": 120,
         "default_time": {
             "hours": [f"{m:02d}" for m in range(0, 24, 1)], 
             "minutes": [f"{m:02d}" for m in range(0, 60, 10)], 
@@ -97,6 +101,7 @@ _PRIVATE_PRODUCTS = {
         "cadence_full_disk": "1 hour",
         "resolution_nominal": "2 km",
         "shape_full_disk": (5424, 5424),
+        "match_tolerance_sec": 120,
         "default_time": {
             "hours": [f"{m:02d}" for m in range(0, 24, 1)], 
             "minutes": [f"{m:02d}" for m in range(0, 60, 10)], 
@@ -120,6 +125,8 @@ _PRIVATE_PRODUCTS = {
         "cadence_grouped": "1 min",
         "resolution_spatial": "8 km",
         "shape": None,
+        # Menos de la mitad de la cadencia (20 s) para no saltar al slot vecino.
+        "match_tolerance_sec": 5,
         "default_time": {
             "hours": [f"{m:02d}" for m in range(0, 24, 1)], 
             "minutes": [f"{m:02d}" for m in range(0, 60,  1)], 
@@ -131,8 +138,13 @@ _PRIVATE_PRODUCTS = {
 # ===================================================================
 # INTERNAL INTEGRITY CHECK
 # ===================================================================
+@lru_cache(maxsize=None)
 def _validate_module_integrity():
-    """Checks internal product dictionary consistency and required fields."""
+    """
+    Checks internal product dictionary consistency and required fields.
+    Runs once per process, on first use of the public interface (not on import):
+    a failure is not cached, so every later access fails the same way.
+    """
     ctx = "[CRITICAL - goes_prod.py - _validate_module_integrity]"
     
     for prod_id, data in _PRIVATE_PRODUCTS.items():
@@ -152,26 +164,37 @@ def _validate_module_integrity():
 
         if missing:
             raise ImportError(f"\n{ctx} Type '{p_type}' Mismatch in '{prod_id}'. Missing: {missing}\n")
-
-# Automatic execution upon import
-_validate_module_integrity()
+    return True
 
 # ===================================================================
 # PUBLIC INTERFACE
 # ===================================================================
-SAVED_INFO_PROD_GOES = MappingProxyType({
+_SAVED_INFO_PROD_GOES = MappingProxyType({
     k: MappingProxyType(v) if isinstance(v, dict) else v
     for k, v in _PRIVATE_PRODUCTS.items()
 })
 
-AVAILABLE_GOES_PRODUCTS = tuple(SAVED_INFO_PROD_GOES.keys())
+_AVAILABLE_GOES_PRODUCTS = tuple(_SAVED_INFO_PROD_GOES.keys())
+
+# Constantes públicas servidas vía __getattr__ (PEP 562): el primer acceso valida.
+_PUBLIC_CONSTANTS = {
+    "SAVED_INFO_PROD_GOES": "_SAVED_INFO_PROD_GOES",
+    "AVAILABLE_GOES_PRODUCTS": "_AVAILABLE_GOES_PRODUCTS",
+}
+
+def __getattr__(name):
+    if name in _PUBLIC_CONSTANTS:
+        _validate_module_integrity()
+        return globals()[_PUBLIC_CONSTANTS[name]]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def get_product_info(prod_id: str) -> MappingProxyType:
     """Returns the full metadata dictionary for a specific GOES product."""
     ctx = "[CRITICAL - goes_prod.py - get_product_info()]"
+    _validate_module_integrity()
     try:
-        if prod_id not in SAVED_INFO_PROD_GOES:
-            raise KeyError(f"Product ID '{prod_id}' not found. Available: {AVAILABLE_GOES_PRODUCTS}")
-        return SAVED_INFO_PROD_GOES[prod_id]
+        if prod_id not in _SAVED_INFO_PROD_GOES:
+            raise KeyError(f"Product ID '{prod_id}' not found. Available: {_AVAILABLE_GOES_PRODUCTS}")
+        return _SAVED_INFO_PROD_GOES[prod_id]
     except (KeyError, ValueError) as e:
         raise ValueError(f"\n[CRITICAL]{ctx}: {e}\n") from None
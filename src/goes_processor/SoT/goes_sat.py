@@ -1,11 +1,13 @@
 # =============================================================================
 # FILE PATH: src/goes_processor/SoT/goes_sat.py
-# Version: 0.1.8 (Fixed Syntax & True Julian/Gregorian separation)
+# Version: 0.2.0 (Precomputed satellite calendar + vectorized date resolution)
 # =============================================================================
 
 try:
     from types import MappingProxyType
     from datetime import datetime
+    from functools import lru_cache
+    from bisect import bisect_right
     import re
 except ImportError as e:
     print("\n" + "="*80)
@@ -90,17 +92,26 @@ _PRIVATE_SAT_INFO = {
     }
 }
 
-SAVED_INFO_SAT_GOES = MappingProxyType({
+_SAVED_INFO_SAT_GOES = MappingProxyType({
     k: MappingProxyType(v) if isinstance(v, dict) else v
     for k, v in _PRIVATE_SAT_INFO.items()
 })
 
+def __getattr__(name):
+    # SAVED_INFO_SAT_GOES público vía PEP 562: el primer acceso valida el diccionario.
+    if name == "SAVED_INFO_SAT_GOES":
+        _validate_module_integrity()
+        return _SAVED_INFO_SAT_GOES
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 # ===================================================================
 # INTERNAL VALIDATORS
 # ===================================================================
 def _validate_inputs(year=None, day_julian=None, sat_id=None, sat_position=None):
     # Define file context for the error message
     ctx = "[SoT - goes_sat.py -  _validate_inputs()]"
+    # Todas las funciones públicas pasan por aquí: integridad verificada una vez por proceso.
+    _validate_module_integrity()
     
     try:
         # 1. Year Validation
@@ -119,7 +130,7 @@ def _validate_inputs(year=None, day_julian=None, sat_id=None, sat_position=None)
                 
         # 4. Sat ID Validation
         if sat_id is not None:
-            valid_ids = [k for k in SAVED_INFO_SAT_GOES.keys() if k != "meta"]
+            valid_ids = [k for k in _SAVED_INFO_SAT_GOES.keys() if k != "meta"]
             if str(sat_id) not in valid_ids:
                 raise ValueError(f"Sat ID '{sat_id}' not found. Valid IDs: {valid_ids}")
 
@@ -127,65 +138,177 @@ def _validate_inputs(year=None, day_julian=None, sat_id=None, sat_position=None)
         # Wraps the specific error with the file context
         raise ValueError(f"\n[CRITICAL]{ctx}:  {e}") from None
 
+# ===================================================================
+# PRECOMPUTED CALENDAR (transitions -> satellite per day)
+# ===================================================================
+# Días se cuentan desde 1970-01-01: mismo entero que datetime64[D] de numpy.
+_EPOCH_ORDINAL = datetime(1970, 1, 1).toordinal()
+_TRANSITION_RE = re.compile(r"^(?P<position>[a-z]+)_(?P<old>\d+)_to_(?P<new>\d+)$")
+
+
+@lru_cache(maxsize=None)
+def _sat_calendar(kind: str = "julian") -> MappingProxyType:
+    """
+    {position: (boundaries, sat_ids)} built once from meta['transitions_<kind>'].
+    boundaries[i] is the first day (days since 1970-01-01) of sat_ids[i + 1], so day d
+    belongs to sat_ids[bisect_right(boundaries, d)].
+    """
+    ctx = "[SoT - goes_sat.py - _sat_calendar()]"
+    _validate_module_integrity()
+    try:
+        transitions = _SAVED_INFO_SAT_GOES["meta"][f"transitions_{kind}"]
+    except KeyError as e:
+        raise KeyError(f"{ctx} Internal Dictionary Error - Missing transitions: {e}") from None
+
+    by_position = {}
+    for key, when in transitions.items():
+        m = _TRANSITION_RE.match(key)
+        if m is None:
+            raise KeyError(f"{ctx} Transition key '{key}' must look like '<position>_<old>_to_<new>'.")
+        by_position.setdefault(m["position"], []).append((when.toordinal() - _EPOCH_ORDINAL, m["old"], m["new"]))
+
+    calendar = {}
+    for position, steps in by_position.items():
+        steps.sort()
+        # Cadena consistente: el satélite que entra en una transición es el que sale en la siguiente.
+        for (_, _, new), (_, old, _) in zip(steps, steps[1:]):
+            if new != old:
+                raise KeyError(f"{ctx} Broken '{position}' chain: {new} enters but {old} leaves.")
+        calendar[position] = (tuple(day for day, _, _ in steps), (steps[0][1],) + tuple(new for _, _, new in steps))
+
+    missing = set(AVAILABLE_GOES_SAT_POSITIONS) - set(calendar)
+    if missing:
+        raise KeyError(f"{ctx} No transitions for position(s): {sorted(missing)}")
+    return MappingProxyType(calendar)
+
+
+def _sat_for_day(day_number: int, sat_position: str, kind: str = "julian") -> str:
+    boundaries, sat_ids = _sat_calendar(kind)[sat_position]
+    return sat_ids[bisect_right(boundaries, day_number)]
+
+
+def _julian_day_number(year, day) -> int:
+    """YYYY + DDD -> days since 1970-01-01 (DDD beyond the end of the year is an error)."""
+    y, d = int(year), int(day)
+    first = datetime(y, 1, 1).toordinal()
+    if not 1 <= d <= datetime(y, 12, 31).toordinal() - first + 1:
+        raise ValueError(f"day {d:03d} does not exist in {y}")
+    return first + d - 1 - _EPOCH_ORDINAL
+
+
+def _numpy():
+    # numpy es opcional: el SoT no debe pagarlo al importarse.
+    try:
+        import numpy
+        return numpy
+    except ImportError:
+        return None
+
+
+def _day_numbers_numpy(np, dates):
+    """datetime64 array / 'YYYYDDD' / 'YYYY-DDD' / 'YYYY-MM-DD' / date objects -> int64 days since 1970-01-01."""
+    ctx = "[SoT - goes_sat.py - _day_numbers_numpy()]"
+    arr = np.atleast_1d(np.asarray(dates))
+    if arr.dtype.kind == "M":
+        return arr.astype("datetime64[D]").astype(np.int64)
+    if arr.dtype.kind in "US":
+        text = np.char.replace(arr.astype(str), "-", "")
+        if len(text) and (np.char.str_len(text) == 7).all() and np.char.isdigit(text).all():
+            v = text.astype(np.int64)
+            year, doy = v // 1000, v % 1000
+            first = (year - 1970).astype("datetime64[Y]").astype("datetime64[D]").astype(np.int64)
+            next_first = (year - 1969).astype("datetime64[Y]").astype("datetime64[D]").astype(np.int64)
+            bad = (doy < 1) | (first + doy - 1 >= next_first)
+            if bad.any():
+                raise ValueError(f"{ctx} Invalid Julian date(s): {arr[bad][:5].tolist()}")
+            return first + doy - 1
+    try:
+        return arr.astype("datetime64[D]").astype(np.int64)
+    except (ValueError, TypeError):
+        raise ValueError(f"{ctx} Unsupported date values (expected datetime64, 'YYYYDDD', 'YYYY-DDD' "
+                         f"or 'YYYY-MM-DD'): {arr[:5].tolist()}") from None
+
+
+def _day_number_python(value) -> int:
+    """Scalar fallback of _day_numbers_numpy (no numpy installed)."""
+    if hasattr(value, "toordinal"):
+        return value.toordinal() - _EPOCH_ORDINAL
+    text = str(value).strip()
+    compact = text.replace("-", "")
+    if len(compact) == 7 and compact.isdigit():
+        return _julian_day_number(compact[:4], compact[4:])
+    return datetime.strptime(text, "%Y-%m-%d").toordinal() - _EPOCH_ORDINAL
+
+
+def resolve_sat_calendar(dates, sat_position: str = "east", kind: str = "julian") -> dict:
+    """
+    Satellite ID, bucket and name06 for a whole array of dates in one call.
+    dates: numpy datetime64 array (any unit) or a sequence of 'YYYYDDD' / 'YYYY-DDD' /
+    'YYYY-MM-DD' strings or date objects.
+    Returns {"sat_id", "bucket", "name06"} as numpy arrays (lists when numpy is missing).
+    """
+    ctx = "[SoT - goes_sat.py - resolve_sat_calendar()]"
+    try:
+        _validate_inputs(sat_position=sat_position)
+        boundaries, sat_ids = _sat_calendar(kind)[sat_position]
+        buckets = tuple(_SAVED_INFO_SAT_GOES[i]["bucket"] for i in sat_ids)
+        names = tuple(_SAVED_INFO_SAT_GOES[i]["name06"] for i in sat_ids)
+
+        np = _numpy()
+        if np is not None:
+            idx = np.searchsorted(np.asarray(boundaries, dtype=np.int64), _day_numbers_numpy(np, dates), side="right")
+            return {"sat_id": np.asarray(sat_ids)[idx], "bucket": np.asarray(buckets)[idx],
+                    "name06": np.asarray(names)[idx]}
+
+        idx = [bisect_right(boundaries, _day_number_python(d)) for d in dates]
+        return {"sat_id": [sat_ids[i] for i in idx], "bucket": [buckets[i] for i in idx],
+                "name06": [names[i] for i in idx]}
+
+    except (ValueError, KeyError) as e:
+        raise ValueError(f"\n[CRITICAL]{ctx}: {e}\n") from None
+
 # ===================================================================
 # PUBLIC ACCESS METHODS
 # ===================================================================
 
+@lru_cache(maxsize=4096)
+def _resolve_julian(year: str, day: str, sat_position: str) -> str:
+    # Cacheado: los backfills repiten (año, día, posición) en planner, checker y downloader.
+    _validate_inputs(year=year, day_julian=day, sat_position=sat_position)
+    try:
+        day_number = _julian_day_number(year, day)
+    except ValueError as e:
+        raise ValueError(f"Invalid Julian Date format: {e}")
+    return _sat_for_day(day_number, sat_position, "julian")
+
+
 def get_goes_id_by_julian_date(year: str, day: str, sat_position: str = "east") -> str:
-    """Finds active satellite using YYYY and DDD."""
+    """Finds active satellite using YYYY and DDD (thin wrapper over the precomputed calendar)."""
     ctx = "[SoT - goes_sat.py - get_goes_id_by_julian_date()]"
     
     try:
-        # 1. Run the internal validation
-        _validate_inputs(year=year, day_julian=day, sat_position=sat_position)
-        
-        # 2. Date object creation (Julian format)
-        try:
-            date_obj = datetime.strptime(f"{year}-{day}", "%Y-%j")
-        except ValueError as e:
-            raise ValueError(f"Invalid Julian Date format: {e}")
-
-        # 3. Logic to determine the satellite
-        try:
-            trans = SAVED_INFO_SAT_GOES["meta"]["transitions_julian"]
-            
-            if sat_position == "east":
-                return "16" if date_obj < trans["east_16_to_19"] else "19"
-            
-            return "17" if date_obj < trans["west_17_to_18"] else "18"
-        except KeyError as e:
-            raise KeyError(f"Internal Dictionary Error - Missing transition key: {e}")
-
+        return _resolve_julian(str(year), str(day), sat_position)
     except (ValueError, KeyError) as e:
         # Unificamos la salida para mantener el estándar visual
         raise ValueError(f"\n[CRITICAL]{ctx}: {e}\n") from None
 
 
 def get_goes_id_by_gregorian_date(year: str, month: str, day: str, sat_position: str = "east") -> str:
-    """Finds active satellite using YYYY, MM, and DD."""
+    """Finds active satellite using YYYY, MM, and DD (thin wrapper over the precomputed calendar)."""
     ctx = "[SoT - goes_sat.py - get_goes_id_by_gregorian_date()]"
     
     try:
         # 1. Run internal validation
         _validate_inputs(year=year, sat_position=sat_position)
         
-        # 2. Date object creation
+        # 2. Day number (days since 1970-01-01)
         try:
-            date_obj = datetime.strptime(f"{year}-{month}-{day}", "%Y-%m-%d")
-        except ValueError as e:
+            day_number = datetime(int(year), int(month), int(day)).toordinal() - _EPOCH_ORDINAL
+        except (ValueError, TypeError) as e:
             raise ValueError(f"Invalid Date format/values: {e}")
 
-        # 3. Logic to determine the satellite
-        # Capturamos posibles fallos de llaves en el diccionario meta
-        try:
-            trans = SAVED_INFO_SAT_GOES["meta"]["transitions_gregorian"]
-            
-            if sat_position == "east":
-                return "16" if date_obj < trans["east_16_to_19"] else "19"
-            
-            return "17" if date_obj < trans["west_17_to_18"] else "18"
-        except KeyError as e:
-            raise KeyError(f"Internal Dictionary Error - Missing transition key: {e}")
+        # 3. Calendar lookup
+        return _sat_for_day(day_number, sat_position, "gregorian")
 
     except (ValueError, KeyError) as e:
         # Ahora ambos tipos de error salen con este formato profesional
@@ -203,7 +326,7 @@ def get_satellite_info(sat_id: str) -> MappingProxyType:
         
         # 2. Attempt to retrieve the data
         try:
-            return SAVED_INFO_SAT_GOES[str(sat_id)]
+            return _SAVED_INFO_SAT_GOES[str(sat_id)]
         except KeyError:
             raise KeyError(f"Data for Satellite ID '{sat_id}' is missing from the Source of Truth dictionary.")
 
@@ -234,8 +357,12 @@ def get_goes_bucket(sat_id: str) -> str:
 # ===================================================================
 # INTEGRITY CHECK
 # ===================================================================
+@lru_cache(maxsize=None)
 def _validate_module_integrity():
-    """Checks internal dictionary consistency, required fields, and date formats."""
+    """
+    Checks internal dictionary consistency, required fields, and date formats.
+    Cached: runs on first use of the public interface, not on import.
+    """
     ctx = "[SoT - goes_sat.py - _validate_module_integrity()]"
     
     # Regex pre-compilados para performance
@@ -272,6 +399,4 @@ def _validate_module_integrity():
                     f"    Value:     '{val}'\n"
                     f"    Expected:  {expected}\n"
                 )
-
-# Execute integrity check on import
-_validate_module_integrity()
+    return True
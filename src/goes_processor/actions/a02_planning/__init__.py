@@ -1,31 +1,40 @@
 # =============================================================================
 # FILE PATH: src/goes_processor/actions/a02_planning/__init__.py
-# Version: 0.1.8 (Package Exposure & Integrity)
+# Version: 0.1.9 (Package Exposure & Integrity - lazy shortcuts)
 # =============================================================================
 
 MY_NAME = "a02_planning/__init__.py"
 
 # 1. CAPA DE SISTEMA
 try:
-    from pathlib import Path
+    import importlib
 except ImportError as e:
     print(f"\n [SYSTEM ERROR] - In {MY_NAME}: {e}\n")
     raise SystemExit(1)
 
 # 2. CAPA DE PROYECTO (Exposición de interfaces)
-try:
-    # Exponemos el CLI principal para que sea importable desde la raíz
-    from .a02_planning_cli import planning_group
-    
-    # Exponemos funciones core de core01 para acceso rápido (Shortcut)
-    from .core01_planner_download.code01_gen_plan_download import generate_download_plan_day
-    from .core01_planner_download.code02_check_plan_download import check_dict_download_plan_day
-    
-except ImportError as e:
-    print("\n" + "="*80)
-    print(f" [PROJECT LIB ERROR] - File: {MY_NAME}")
-    print(f" Failed to initialize planning package: {e}")
-    print("="*80 + "\n")
-    # No levantamos SystemExit aquí para permitir que el error suba 
-    # y se identifique el origen en el traceback.
-    raise
+# Los atajos se resuelven en el primer acceso (PEP 562): importar el paquete para
+# llegar al CLI no arrastra el planner ni el checker (ni numpy).
+_SHORTCUTS = {
+    # CLI principal, importable desde la raíz
+    "planning_group": ".a02_planning_cli",
+    # Funciones core de core01 (Shortcut)
+    "generate_download_plan_day": ".core01_planner_download.code01_gen_plan_download",
+    "check_dict_download_plan_day": ".core01_planner_download.code02_check_plan_download",
+}
+
+def __getattr__(name):
+    if name not in _SHORTCUTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        value = getattr(importlib.import_module(_SHORTCUTS[name], __name__), name)
+    except ImportError as e:
+        print("\n" + "="*80)
+        print(f" [PROJECT LIB ERROR] - File: {MY_NAME}")
+        print(f" Failed to initialize planning package: {e}")
+        print("="*80 + "\n")
+        # No levantamos SystemExit aquí para permitir que el error suba 
+        # y se identifique el origen en el traceback.
+        raise
+    globals()[name] = value
+    return value
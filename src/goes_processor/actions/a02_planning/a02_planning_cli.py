@@ -1,33 +1,21 @@
 """
 Path: src/goes_processor/actions/a02_planning/a02_planning_cli.py
 Description: Planning orchestrator. Action ID: a02
+             Subcommands are imported on demand (LazyGroup): 'planning catalog gaps' does
+             not load the planner nor the checker.
 """
 import click
-import sys
 
-# Import Gen Plan
-try:
-    from goes_processor.actions.a02_planning.core01_planner_download.cli01_gen_plan_download import gen_plan_download_command
-except ImportError as e:
-    print(f"❌ Error importing gen-plan: {e}")
-    gen_plan_download_command = None
+from goes_processor.utils.cli_lazy_group import LazyGroup
 
-# Import Check Plan
-try:
-    from goes_processor.actions.a02_planning.core01_planner_download.cli02_check_plan import check_plan_command
-except ImportError as e:
-    print(f"❌ Error importing check-plan: {e}")
-    check_plan_command = None
+# Los nombres DEBEN coincidir con @click.command(name=...) de cada cli.
+PLANNING_COMMANDS = {
+    "gen-plan-download": "goes_processor.actions.a02_planning.core01_planner_download.cli01_gen_plan_download:gen_plan_download_command",
+    "check-plan-download": "goes_processor.actions.a02_planning.core01_planner_download.cli02_check_plan:check_plan_command",
+    "catalog": "goes_processor.actions.a02_planning.core02_plan_catalog.cli01_catalog:catalog_group",
+}
 
-@click.group(name="planning")
+@click.group(name="planning", cls=LazyGroup, lazy_subcommands=PLANNING_COMMANDS)
 def planning_group():
     """Actions for data planning and verification."""
     pass
-
-# Registration
-if gen_plan_download_command:
-    planning_group.add_command(gen_plan_download_command)
-
-if check_plan_command:
-    # This MUST match the @click.command(name="check-plan-download") in cli02
-    planning_group.add_command(check_plan_command)
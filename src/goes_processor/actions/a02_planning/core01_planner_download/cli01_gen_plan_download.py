@@ -1,6 +1,6 @@
 """
 Path: src/goes_processor/actions/a02_planning/core01_planner_download/cli01_gen_plan_download.py
-Version: 1.0.1 (Corrected SoT Path)
+Version: 1.0.4 (Corrected SoT Path + Sub-day time windows + Range planning + Compact plan format)
 """
 
 try:
@@ -17,9 +17,11 @@ try:
     from goes_processor.SoT.goes_prod import AVAILABLE_GOES_PRODUCTS
     
     try:
-        from .code01_gen_plan_download import execute_gen_plan
+        from .code01_gen_plan_download import execute_gen_plan, execute_gen_plan_range
+        from .fn03_time_window import parse_time_window
     except (ImportError, ValueError):
-        from goes_processor.actions.a02_planning.core01_planner_download.code01_gen_plan_download import execute_gen_plan
+        from goes_processor.actions.a02_planning.core01_planner_download.code01_gen_plan_download import execute_gen_plan, execute_gen_plan_range
+        from goes_processor.actions.a02_planning.core01_planner_download.fn03_time_window import parse_time_window
 
 except ImportError as e:
     print("\n" + "!"*80)
@@ -34,17 +36,33 @@ except ImportError as e:
 @click.command(name="gen-plan-download")
 @click.option('--sat-position', required=True, type=click.Choice(['east', 'west']))
 @click.option('--product', required=True)
-@click.option('--year', required=True, type=int)
-@click.option('--day', required=True, type=str)
+@click.option('--year', default=None, type=int, help='Year (YYYY). Not needed with --from/--to.')
+@click.option('--day', default=None, type=str, help='Julian Day (DDD). Not needed with --from/--to.')
+@click.option('--from', 'date_from', default=None, type=str, help="First day of a range, 'YYYY-DDD' (inclusive).")
+@click.option('--to', 'date_to', default=None, type=str, help="Last day of a range, 'YYYY-DDD' (inclusive).")
+@click.option('--workers', default=None, type=int, help='Processes for range planning (default: CPU count).')
 @click.option('--overwrite', default=False, type=bool)
 @click.option('--check-local', default=True, type=bool)
-def gen_plan_download_command(sat_position, product, year, day, overwrite, check_local):
+@click.option('--start-time', default=None, type=str,
+              help="Window start (inclusive): 'HH', 'HH:MM', 'YYYY-MM-DD_HH:MM' or 'YYYYJJJHHMM'.")
+@click.option('--end-time', default=None, type=str, help="Window end (exclusive), same forms as --start-time.")
+@click.option('--plan-format', default='auto', type=click.Choice(['auto', 'compact', 'legacy']),
+              help="On-disk plan layout. 'compact' = packed columnar JSON; 'auto' = compact for high-cadence products (GLM).")
+@click.option('--slots', default=None, type=str, help="Explicit slot list, e.g. '11:00,11:10,12:30'.")
+def gen_plan_download_command(sat_position, product, year, day, date_from, date_to, workers, overwrite, check_local,
+                              start_time, end_time, plan_format, slots):
     """GOES Download Planning Interface."""
 
     if execute_gen_plan is None:
         click.echo(click.style("🚫 Planning engine is unavailable.", fg='red', bold=True))
         sys.exit(1)
 
+    try:
+        time_window = parse_time_window(start_time, end_time, slots)
+    except ValueError as e:
+        click.echo(click.style(f"❌ ERROR: {e}", fg='red', bold=True))
+        return
+
     product_input = product.strip().upper()
     
     if product_input == "ALL":
@@ -57,10 +75,26 @@ def gen_plan_download_command(sat_position, product, year, day, overwrite, check
         click.echo(f"🔍 Valid Options: {', '.join(AVAILABLE_GOES_PRODUCTS)} or 'ALL'")
         return
 
+    # --- Range mode: every day x product in one invocation ---
+    if date_from or date_to:
+        if not (date_from and date_to) or year is not None or day is not None:
+            click.echo(click.style("❌ ERROR: use --from and --to together, without --year/--day.", fg='red', bold=True))
+            return
+        try:
+            execute_gen_plan_range(sat_position, list(products_to_process), date_from, date_to, overwrite,
+                                   time_window, workers, plan_format=plan_format)
+        except ValueError as e:
+            click.echo(click.style(f"💥 Error: {e}", fg='red'), err=True)
+        return
+
+    if year is None or day is None:
+        click.echo(click.style("❌ ERROR: give --year and --day, or a range with --from/--to.", fg='red', bold=True))
+        return
+
     for current_prod in products_to_process:
         click.echo(click.style(f"🛠️  Planning: {current_prod}", fg='green', bold=True))
         try:
-            execute_gen_plan(sat_position, current_prod, year, day, overwrite, check_local)
+            execute_gen_plan(sat_position, current_prod, year, day, overwrite, check_local, time_window, plan_format)
             click.echo(f"✅ Success: {current_prod} plan ready.\n")
         except Exception as e:
             click.echo(click.style(f"💥 Error in {current_prod}: {e}", fg='red'), err=True)
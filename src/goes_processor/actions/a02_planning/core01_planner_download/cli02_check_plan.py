@@ -1,8 +1,9 @@
 """
 Path: src/goes_processor/actions/a02_planning/core01_planner_download/cli02_check_plan.py
-Version: 1.0.1 (Stable - ALL keyword support)
+Version: 1.1.0 (Incremental check with stat cache, --full to bypass it + parallel range audit)
 Description: CLI to verify the status of generated JSON plans. 
-             Supports batch checking using the 'ALL' keyword.
+             Supports batch checking using the 'ALL' keyword (products and positions)
+             and date ranges (--from/--to) audited over a process pool.
 """
 
 # =============================================================================
@@ -22,12 +23,15 @@ except ImportError as e:
 try:
     # Source of Truth
     from goes_processor.SoT.goes_prod import AVAILABLE_GOES_PRODUCTS
+    from goes_processor.SoT.goes_sat import AVAILABLE_GOES_SAT_POSITIONS
     
     # Logic Engine
     try:
-        from .code02_check_plan_download import execute_check_plan
+        from .code02_check_plan_download import execute_check_plan, execute_check_plan_range
     except (ImportError, ValueError):
-        from goes_processor.actions.a02_planning.core01_planner_download.code02_check_plan_download import execute_check_plan
+        from goes_processor.actions.a02_planning.core01_planner_download.code02_check_plan_download import (
+            execute_check_plan, execute_check_plan_range
+        )
 
 except ImportError as e:
     print("\n" + "!"*80)
@@ -43,15 +47,22 @@ except ImportError as e:
 # =============================================================================
 
 @click.command(name="check-plan-download")
-@click.option('--sat-position', required=True, type=click.Choice(['east', 'west']),
-              help='Satellite position (east/west)')
+@click.option('--sat-position', required=True, type=click.Choice(['east', 'west', 'ALL']),
+              help="Satellite position (east/west) or 'ALL' for both (audit mode).")
 @click.option('--product', required=True, 
               help="Product ID or 'ALL' to check every generated plan.")
-@click.option('--year', required=True, type=int, help='Year (YYYY)')
-@click.option('--day', required=True, type=str, help='Julian Day (DDD)')
-def check_plan_command(sat_position, product, year, day):
+@click.option('--year', default=None, type=int, help='Year (YYYY). Not needed with --from/--to.')
+@click.option('--day', default=None, type=str, help='Julian Day (DDD). Not needed with --from/--to.')
+@click.option('--from', 'date_from', default=None, type=str, help="First day of a range, 'YYYY-DDD' (inclusive).")
+@click.option('--to', 'date_to', default=None, type=str, help="Last day of a range, 'YYYY-DDD' (inclusive).")
+@click.option('--workers', default=None, type=int, help='Processes for the audit mode (default: CPU count).')
+@click.option('--full', is_flag=True, default=False,
+              help='Ignore the stat cache: list every hour folder and rewrite the plan.')
+def check_plan_command(sat_position, product, year, day, date_from, date_to, workers, full):
     """
     Check if download plans exist and verify their internal status.
+    With --from/--to or --sat-position ALL every plan is audited in parallel
+    and summarized in one table.
     """
 
     if execute_check_plan is None:
@@ -63,7 +74,8 @@ def check_plan_command(sat_position, product, year, day):
     
     if product_input == "ALL":
         products_to_process = AVAILABLE_GOES_PRODUCTS
-        click.echo(click.style(f"🔍 Checking all available plans for {year}-{day}...", fg='cyan'))
+        when = f"{year}-{day}" if year is not None else f"{date_from} -> {date_to}"
+        click.echo(click.style(f"🔍 Checking all available plans for {when}...", fg='cyan'))
     elif product_input in AVAILABLE_GOES_PRODUCTS:
         products_to_process = [product_input]
     else:
@@ -71,7 +83,29 @@ def check_plan_command(sat_position, product, year, day):
         click.echo(f"🔍 Valid Options: {', '.join(AVAILABLE_GOES_PRODUCTS)} or 'ALL'")
         return
 
-    # --- B. Status Audit Loop ---
+    # --- B. Audit mode: days x positions x products over a process pool ---
+    if date_from or date_to or sat_position == "ALL":
+        if date_from or date_to:
+            if not (date_from and date_to) or year is not None or day is not None:
+                click.echo(click.style("❌ ERROR: use --from and --to together, without --year/--day.", fg='red', bold=True))
+                return
+        elif year is None or day is None:
+            click.echo(click.style("❌ ERROR: give --year and --day, or a range with --from/--to.", fg='red', bold=True))
+            return
+        else:
+            date_from = date_to = f"{year}-{str(day).zfill(3)}"
+        positions = list(AVAILABLE_GOES_SAT_POSITIONS) if sat_position == "ALL" else [sat_position]
+        try:
+            execute_check_plan_range(positions, list(products_to_process), date_from, date_to, full, workers)
+        except ValueError as e:
+            click.echo(click.style(f"💥 Error: {e}", fg='red'), err=True)
+        return
+
+    if year is None or day is None:
+        click.echo(click.style("❌ ERROR: give --year and --day, or a range with --from/--to.", fg='red', bold=True))
+        return
+
+    # --- C. Status Audit Loop ---
     click.echo(f"📍 Satellite: {sat_position} | Date: {year}-{day}\n")
 
     for current_prod in products_to_process:
@@ -83,7 +117,8 @@ def check_plan_command(sat_position, product, year, day):
                 sat_position=sat_position, 
                 product=current_prod, 
                 year=year, 
-                day=day
+                day=day,
+                full=full
             )
         except Exception as e:
             # If a JSON is missing, we catch the error here to allow the loop to continue
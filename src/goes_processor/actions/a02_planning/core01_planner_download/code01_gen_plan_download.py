@@ -1,14 +1,21 @@
 """
 Path: src/goes_processor/actions/a02_planning/core01_planner_download/code01_gen_plan_download.py
-Version: 0.1.9 (Full SoT Integration & CLI Bridge)
+Version: 0.3.1 (Full SoT Integration & CLI Bridge + Sub-day time windows + Range planning + batch calendar
+         + typed plan model)
 Description: Logic engine for generating GOES download plans.
+             Full-day and windowed plans share one path per (day, product): without --overwrite
+             an existing plan with a different coverage is kept and reported, never silently
+             taken as the requested one.
 """
 
 # 1. SYSTEM LAYER
 try:
     import json
     import itertools
-    from datetime import datetime
+    import os
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    from datetime import datetime, timedelta
+    from functools import lru_cache
     from pathlib import Path
 except ImportError as e:
     print(f"\n[SYSTEM LIB ERROR] - Critical libraries missing: {e}\n")
@@ -17,9 +24,18 @@ except ImportError as e:
 # 2. PROJECT LAYER (SoT & Utils)
 try:
     from goes_processor.SoT.goes_hardcoded_folders import get_my_path
-    from goes_processor.SoT.goes_sat import get_goes_id_by_julian_date, get_satellite_info, AVAILABLE_GOES_SAT_POSITIONS
+    from goes_processor.SoT.goes_sat import (
+        get_goes_id_by_julian_date, get_satellite_info, resolve_sat_calendar, AVAILABLE_GOES_SAT_POSITIONS
+    )
     from goes_processor.SoT.goes_prod import SAVED_INFO_PROD_GOES, AVAILABLE_GOES_PRODUCTS
     from .fn01_file_name_plan_download import get_plan_download_file_name, get_plan_download_file_path
+    from .fn02_plan_journal import get_plan_journal_path
+    from .fn03_time_window import TimeWindow
+    from .fn04_plan_codec import dumps_plan, load_plan_model, resolve_plan_format, write_plan_text
+    from .fn06_plan_model import DownloadPlan, PlanSlot, SatProdInfo, SlotFolder, SlotLocal, SlotS3, SlotSummary
+    from goes_processor.actions.a02_planning.core02_plan_catalog.fn01_plan_catalog import (
+        sync_plan_safe, sync_plans_safe
+    )
 except ImportError as e:
     print(f"\n[PROJECT LIB ERROR] - Internal modules missing: {e}\n")
     # Note: Ensure __init__.py exists in all subfolders
@@ -45,9 +61,26 @@ def general_control(sat_position: str, product_id: str, year: str, day: str):
     if not (str(day).isdigit() and len(str(day)) == 3 and 1 <= int(day) <= 366):
         raise ValueError(f"{ctx} Day '{day}' must be DDD (001-366).")
 
-def generate_download_plan_day(sat_position: str, product_id: str, year: str, day: str) -> dict:
+@lru_cache(maxsize=None)
+def get_product_slot_suffixes(product_id: str) -> tuple:
     """
-    Generates the planning dictionary by reading configuration from SoT.
+    Sorted 'HH[MM[SS]]' suffixes of one product day, built once from SoT 'default_time'
+    and reused for every day planned in the same process.
+    """
+    d_time = SAVED_INFO_PROD_GOES[product_id]["default_time"]
+    hrs = d_time.get("hours") or [""]
+    mins = d_time.get("minutes") or [""]
+    secs = d_time.get("seconds") or [""]
+    return tuple(sorted("".join(filter(None, [h, m, s])) for h, m, s in itertools.product(hrs, mins, secs)))
+
+
+def generate_download_plan_day(sat_position: str, product_id: str, year: str, day: str,
+                               time_window: TimeWindow | None = None, sat_id: str | None = None) -> DownloadPlan:
+    """
+    Generates the plan (fn06 DownloadPlan) by reading configuration from SoT.
+    With a time_window only the matching slots are planned; file keys and 'pos_file'
+    keep their full-day numbering so partial and full plans stay comparable.
+    sat_id can be passed when the caller already resolved it (range planning).
     """
     ctx = "[Planning - generate_download_plan_day()]"
     
@@ -55,7 +88,7 @@ def generate_download_plan_day(sat_position: str, product_id: str, year: str, da
         general_control(sat_position, product_id, year, day)
 
         # --- METADATA RECOVERY FROM SOT ---
-        sat_id = get_goes_id_by_julian_date(year, day, sat_position=sat_position)
+        sat_id = sat_id or get_goes_id_by_julian_date(year, day, sat_position=sat_position)
         sat_info = get_satellite_info(sat_id)
         prod_info = SAVED_INFO_PROD_GOES[product_id] 
         
@@ -63,22 +96,22 @@ def generate_download_plan_day(sat_position: str, product_id: str, year: str, da
         init_fn = prod_info["init_file_name"]
         total_expected = prod_info["total_files_one_day"]
         
-        # Time management (Hours, Mins, Secs)
-        d_time = prod_info["default_time"]
-        hrs = d_time.get("hours") or [""]
-        mins = d_time.get("minutes") or [""]
-        secs = d_time.get("seconds") or [""]
-
         # Timestamp generation (Format: YYYYJJJHHMMSS)
-        time_slots = sorted(["".join(filter(None, [year, day, h, m, s])) 
-                            for h, m, s in itertools.product(hrs, mins, secs)])
+        time_slots = [year + day + suffix for suffix in get_product_slot_suffixes(product_id)]
+        selected_slots = set(time_window.filter_time_stamps(time_slots)) if time_window else None
+        if selected_slots is not None and not selected_slots:
+            raise ValueError(f"Time window {time_window.describe()} selects no slot of {product_id} on {year}-{day}.")
 
         # --- INVENTORY CONSTRUCTION ---
-        inventory_files = {}
+        slots = {}
         goes_raw_root = get_my_path("data_raw")
+        raw_root_resolved = goes_raw_root.resolve()
         max_digits = len(str(total_expected))
+        prefix_day = f"{product_id}/{year}/{day}"
 
         for counter, t_id in enumerate(time_slots, 1):
+            if selected_slots is not None and t_id not in selected_slots:
+                continue
             selected_file = f"{init_fn}{sat_id}_s{t_id}"
             selected_file_regex = f"{selected_file}*.nc"
             
@@ -87,69 +120,48 @@ def generate_download_plan_day(sat_position: str, product_id: str, year: str, da
             folder_path_part = Path(bucket) / product_id / year / day / hour_folder
             
             file_key = f"file{counter:0{max_digits}d}"
-            full_folder_path = (goes_raw_root / folder_path_part).resolve()
+            full_folder_path = raw_root_resolved / folder_path_part
             
-            
-            inventory_files[file_key] = {
-                "pos_file": f"{counter:0{max_digits}d} of {total_expected:0{max_digits}d}",
-                "time_stamp": t_id,
-                "mini_summary": {"is_ready": True, "exists_online": None, "exists_local": None, "is_done": None, "time_last_mod": None},
-                "file_s3": {
-                    "bucket": bucket,
-                    "prefix_day": f"{product_id}/{year}/{day}",
-                    "prefix_hour": f"{product_id}/{year}/{day}/{hour_folder}",
-                    "init_name": selected_file,
-                    "regex": selected_file_regex,
-                    "file_name": None,
-                    "exists_online": None,
-                    "file_size_mb": None,
-                    "time_init_download": None,
-                    "time_end_download": None,
-                    "dif_time_sec": None,
-                },
-                "file_local": {
-                    "init_name": selected_file,
-                    "regex": selected_file_regex,
-                    "file_name": None,
-                    "path_absolute": None,
-                    "path_relative": None, 
-                    "exists_local": None,
-                    "file_size_mb": None,
-                },
-               "folder_local": {
-                    "path_relative": str(full_folder_path.relative_to(goes_raw_root)),
-                    "path_absolute": str(full_folder_path),
-                    "folder_exists_local": None
-                }
-            }
+            slots[file_key] = PlanSlot(
+                file_key,
+                pos_file=f"{counter:0{max_digits}d} of {total_expected:0{max_digits}d}",
+                time_stamp=t_id,
+                mini_summary=SlotSummary(),
+                file_s3=SlotS3(bucket=bucket, prefix_day=prefix_day, prefix_hour=f"{prefix_day}/{hour_folder}",
+                               init_name=selected_file, regex=selected_file_regex),
+                file_local=SlotLocal(init_name=selected_file, regex=selected_file_regex),
+                folder_local=SlotFolder(path_relative=str(folder_path_part), path_absolute=str(full_folder_path)),
+            )
 
         # --- FINAL ASSEMBLY ---
         path_plan = get_plan_download_file_path(year, day, sat_id, sat_position, product_id)
+        now = datetime.now().isoformat()
         
-        return {
-            "sat_prod_info": {
-                "satellite": f"GOES-{sat_id}",
-                "sat_position": sat_position,
-                "product_id": product_id,
-                "bucket_name": bucket,
-                "date_julian": f"{year}{day}",
-                "total_files_one_day": total_expected,
-                "prefix_day": f"{product_id}/{year}/{day}",
-            },
-            "summary": {
+        return DownloadPlan(
+            sat_prod_info=SatProdInfo(
+                satellite=f"GOES-{sat_id}",
+                sat_position=sat_position,
+                product_id=product_id,
+                bucket_name=bucket,
+                date_julian=f"{year}{day}",
+                total_files_one_day=total_expected,
+                prefix_day=prefix_day,
+                time_window=None if time_window is None else {**time_window.to_dict(), "label": time_window.describe()},
+            ),
+            slots=slots,
+            summary={
                 "is_done": None,
-                "total_files_expected": total_expected,
+                "total_files_expected": len(slots),
                 "total_files_ready": 0,
-                "timestamp_file_creation": datetime.now().isoformat(),
-                "timestamp_file_last_mod": datetime.now().isoformat(),
-                "timestamp_file_done": datetime.now().isoformat(),
+                "timestamp_file_creation": now,
+                "timestamp_file_last_mod": now,
+                "timestamp_file_done": now,
             },
-            "plan_download_self_info": {
+            self_info={
                 "file_name": get_plan_download_file_name(year, day, sat_id, sat_position, product_id),
                 "path_absolute": str(path_plan.resolve())
             },
-            "download_inventory": inventory_files,
-        }
+        )
 
     except Exception as e:
         raise ValueError(f"\n[CRITICAL]{ctx}: {e}\n") from None
@@ -158,7 +170,32 @@ def generate_download_plan_day(sat_position: str, product_id: str, year: str, da
 # CLI BRIDGE (This is what cli01_gen_plan_download.py calls)
 # =============================================================================
 
-def execute_gen_plan(sat_position, product, year, day, overwrite, check_local):
+def _window_coverage(window) -> tuple:
+    """Comparable coverage of a plan window (None = full day); the label is only cosmetic."""
+    if not window:
+        return ()
+    return tuple((k, json.dumps(window.get(k), sort_keys=True)) for k in ("start", "end", "slots"))
+
+
+def describe_coverage_conflict(path_plan, time_window) -> str | None:
+    """
+    Why the existing plan at path_plan cannot stand in for the requested one, or None.
+    Download, follow, the checker and the catalog read that path as the plan of the day,
+    so a partial plan kept in place of a full-day one (or the reverse) must be said out loud.
+    """
+    requested = None if time_window is None else time_window.to_dict()
+    try:
+        existing = load_plan_model(path_plan).sat_prod_info.time_window
+    except (OSError, ValueError, KeyError) as e:
+        return f"existing plan is unreadable ({e})"
+    if _window_coverage(existing) == _window_coverage(requested):
+        return None
+    have = "full day" if not existing else f"window {existing.get('label') or existing}"
+    want = "full day" if time_window is None else f"window {time_window.describe()}"
+    return f"existing plan covers the {have}, requested the {want}"
+
+
+def execute_gen_plan(sat_position, product, year, day, overwrite, check_local, time_window=None, plan_format="auto"):
     """
     Bridge function to connect the CLI command with the logic engine.
     Handles data types, execution, and disk persistence (JSON saving).
@@ -169,26 +206,37 @@ def execute_gen_plan(sat_position, product, year, day, overwrite, check_local):
         year_str = str(year)
         day_str = str(day)
 
-        # 1. Generate the plan dictionary
-        plan_data = generate_download_plan_day(sat_position, product, year_str, day_str)
+        # 1. Generate the plan (typed model)
+        plan_data = generate_download_plan_day(sat_position, product, year_str, day_str, time_window)
         
         # 2. Extract path and handle persistence
-        abs_path = Path(plan_data["plan_download_self_info"]["path_absolute"])
+        abs_path = Path(plan_data.self_info["path_absolute"])
         
         # Ensure directories exist
         abs_path.parent.mkdir(parents=True, exist_ok=True)
         
         # Overwrite logic
         if abs_path.exists() and not overwrite:
+            conflict = describe_coverage_conflict(abs_path, time_window)
+            if conflict:
+                print(f"\n⚠️  [KEPT] Plan not replaced: {conflict}.")
+                print(f"   Download, follow and the checker will keep using the existing plan as the plan of the day.")
+                print(f"📂 Path: {abs_path}")
+                print(f"👉 Use --overwrite True to replace it.\n")
+                return
             print(f"\n⚠️  [SKIP] Plan already exists at: {abs_path}")
             print(f"👉 Use --overwrite True to refresh it.\n")
             return
 
-        # 3. Save to JSON
-        with open(abs_path, 'w', encoding='utf-8') as f:
-            json.dump(plan_data, f, indent=4)
-            
+        # 3. Save to JSON (un journal viejo pertenece al plan reemplazado)
+        get_plan_journal_path(abs_path).unlink(missing_ok=True)
+        write_plan_text(abs_path, dumps_plan(plan_data, resolve_plan_format(plan_format, plan_data)), plan_data,
+                        fsync=False)
+        sync_plan_safe(abs_path, plan_data)
+
         print(f"\n✅ [SUCCESS] Download plan generated and saved.")
+        if time_window is not None:
+            print(f"🕒 Window: {time_window.describe()} | {len(plan_data)} slots")
         print(f"📂 Path: {abs_path}\n")
 
         # Future: if check_local: trigger_local_validation()
@@ -197,3 +245,113 @@ def execute_gen_plan(sat_position, product, year, day, overwrite, check_local):
         print(f"\n💥 {ctx} Error: {e}")
         # We re-raise to let the CLI catch it in its own try/except
         raise
+
+# =============================================================================
+# RANGE PLANNING (--from YYYY-DDD --to YYYY-DDD)
+# =============================================================================
+
+def parse_julian_range(date_from: str, date_to: str) -> list:
+    """('2024-001', '2024-010') -> [('2024', '001'), ...]. Crosses year boundaries."""
+    ctx = "[Planning - parse_julian_range()]"
+    try:
+        start = datetime.strptime(str(date_from).strip(), "%Y-%j")
+        end = datetime.strptime(str(date_to).strip(), "%Y-%j")
+    except ValueError:
+        raise ValueError(f"{ctx} Dates must be YYYY-DDD (got '{date_from}', '{date_to}').") from None
+    if end < start:
+        raise ValueError(f"{ctx} --to ({date_to}) is before --from ({date_from}).")
+    return [((start + timedelta(days=n)).strftime("%Y"), (start + timedelta(days=n)).strftime("%j"))
+            for n in range((end - start).days + 1)]
+
+
+def _write_plans_bulk(plans: list, plan_format="auto"):
+    """One pass per batch: serialize everything first, then write (a stale journal belongs to the old plan)."""
+    payloads = [(path, dumps_plan(plan, resolve_plan_format(plan_format, plan)), plan) for path, plan in plans]
+    for path, text, plan in payloads:
+        get_plan_journal_path(path).unlink(missing_ok=True)
+        write_plan_text(path, text, plan, fsync=False)
+    sync_plans_safe(plans)
+
+
+def _plan_days_batch(sat_position, products, days, overwrite, time_window, plan_format="auto"):
+    """
+    Worker body (runs in a child process): builds every (day, product) plan of its batch,
+    resolving the satellites of all its days in one calendar lookup, and writes them in bulk.
+    Returns [(year, day, product, status, n_slots)].
+    """
+    rows, to_write = [], []
+    try:
+        sat_ids = resolve_sat_calendar([f"{year}{day}" for year, day in days], sat_position)["sat_id"]
+    except ValueError as e:
+        return [(year, day, p, f"ERROR: {str(e).strip()}", 0) for year, day in days for p in products]
+    for (year, day), sat_id in zip(days, sat_ids):
+        sat_id = str(sat_id)
+        for product in products:
+            path_plan = get_plan_download_file_path(year, day, sat_id, sat_position, product)
+            if path_plan.exists() and not overwrite:
+                conflict = describe_coverage_conflict(path_plan, time_window)
+                rows.append((year, day, product, f"KEPT: {conflict}" if conflict else "SKIPPED", 0))
+                continue
+            try:
+                plan = generate_download_plan_day(sat_position, product, year, day, time_window, sat_id=sat_id)
+            except ValueError as e:
+                rows.append((year, day, product, f"ERROR: {str(e).strip()}", 0))
+                continue
+            to_write.append((path_plan, plan))
+            rows.append((year, day, product, "SUCCESS", len(plan)))
+    _write_plans_bulk(to_write, plan_format)
+    return rows
+
+
+def execute_gen_plan_range(sat_position, products, date_from, date_to, overwrite=False, time_window=None,
+                           workers=None, days_per_batch=8, plan_format="auto"):
+    """
+    Builds every plan of [date_from, date_to] x products in one process tree: validation once,
+    slot tables once per product (cached per worker), days spread over a process pool.
+    """
+    ctx = "[BRIDGE - execute_gen_plan_range]"
+    if sat_position not in AVAILABLE_GOES_SAT_POSITIONS:
+        raise ValueError(f"{ctx} Invalid position '{sat_position}'. Available: {AVAILABLE_GOES_SAT_POSITIONS}")
+    unknown = [p for p in products if p not in AVAILABLE_GOES_PRODUCTS]
+    if unknown:
+        raise ValueError(f"{ctx} Products not found in SoT: {unknown}")
+
+    days = parse_julian_range(date_from, date_to)
+    workers = max(1, min(int(workers or os.cpu_count() or 1), len(days)))
+    batches = [days[i:i + days_per_batch] for i in range(0, len(days), days_per_batch)]
+    print(f"\n🗓️  [RANGE] {date_from} -> {date_to} | {len(days)} days x {len(products)} products "
+          f"| {workers} workers, {len(batches)} batches")
+
+    t0 = datetime.now()
+    rows = []
+    if workers == 1:
+        for batch in batches:
+            rows.extend(_plan_days_batch(sat_position, list(products), batch, overwrite, time_window, plan_format))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_plan_days_batch, sat_position, list(products), batch, overwrite, time_window,
+                                       plan_format)
+                       for batch in batches]
+            for n, future in enumerate(as_completed(futures), 1):
+                rows.extend(future.result())
+                print(f"   [{n:0{len(str(len(futures)))}d}/{len(futures)}] batch done")
+
+    created = [r for r in rows if r[3] == "SUCCESS"]
+    skipped = [r for r in rows if r[3] == "SKIPPED"]
+    kept = [r for r in rows if r[3].startswith("KEPT")]
+    failed = [r for r in rows if r[3].startswith("ERROR")]
+    for year, day, product, status, _ in sorted(failed):
+        print(f"❌ {year}-{day} {product}: {status}")
+    for year, day, product, status, _ in sorted(kept):
+        print(f"⚠️  {year}-{day} {product}: {status.split(': ', 1)[1]} (not replaced)")
+
+    elapsed = (datetime.now() - t0).total_seconds()
+    print(f"\n✅ [SUCCESS] {len(created)} plans generated ({sum(r[4] for r in created)} slots) "
+          f"| {len(skipped)} already existed | {len(kept)} kept with another coverage | {len(failed)} failed "
+          f"| {elapsed:.1f}s")
+    if skipped or kept:
+        print(f"👉 Use --overwrite True to refresh existing plans.")
+    if time_window is not None:
+        print(f"🕒 Window: {time_window.describe()}")
+    print(f"📂 Folder: {get_my_path('data_plan')}\n")
+    return rows
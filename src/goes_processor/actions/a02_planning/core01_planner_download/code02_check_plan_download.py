@@ -1,12 +1,15 @@
 """
 Path: src/goes_processor/actions/a02_planning/core01_planner_download/code02_check_plan_download.py
-Version: 0.1.9 (Dual-Layer Guard & CLI Bridge)
+Version: 0.4.0 (Directory-index check + incremental stat cache + nearest-time slot matching + typed plan model
+         + parallel range audit)
 """
 
 # 1. CAPA DE SISTEMA
 try:
-    import json
-    import glob
+    import io
+    import os
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    from contextlib import redirect_stdout
     from datetime import datetime
     from pathlib import Path
 except ImportError as e:
@@ -16,8 +19,19 @@ except ImportError as e:
 # 2. CAPA DE PROYECTO
 try:
     from goes_processor.SoT.goes_hardcoded_folders import get_my_path
-    from goes_processor.SoT.goes_sat import get_goes_id_by_julian_date
+    from goes_processor.SoT.goes_sat import get_goes_id_by_julian_date, AVAILABLE_GOES_SAT_POSITIONS
+    from goes_processor.SoT.goes_prod import AVAILABLE_GOES_PRODUCTS
+    from .code01_gen_plan_download import parse_julian_range
     from .fn01_file_name_plan_download import get_plan_download_file_path
+    from .fn02_plan_journal import PlanJournal, write_plan_atomic
+    from .fn04_plan_codec import load_plan_model
+    from .fn06_plan_model import DownloadPlan, as_plan_model
+    from .fn05_local_folder_index import LocalFolderIndex, FolderStatCache
+    from goes_processor.actions.a03_download.core01_download_from_s3.fn02_s3_listing_index import S3ListingIndex
+    from goes_processor.actions.a03_download.core01_download_from_s3.fn05_s3_manifest_cache import S3ManifestCache
+    from goes_processor.actions.a03_download.core01_download_from_s3.fn09_slot_matcher import (
+        assign_slots, resolve_match_tolerance, summarize_match
+    )
 except ImportError as e:
     print(f"\n[PROJECT LIB ERROR] - Internal modules missing: {e}\n")
     raise SystemExit(1)
@@ -26,9 +40,13 @@ except ImportError as e:
 # CLI BRIDGE (Lo que llama cli02_check_plan.py)
 # =============================================================================
 
-def execute_check_plan(sat_position, product, year, day):
+def execute_check_plan(sat_position, product, year, day, full=False):
     """
     Bridge function to load the JSON plan, run the check, and save the updates.
+    With full=False unchanged hour folders come from the per-day stat cache and the plan
+    is only rewritten when at least one slot changed.
+    Returns the audit row of the plan: {'status': 'NO PLAN' | 'UNCHANGED' | 'UPDATED',
+    'files_ready', 'files_total', 'files_online', 'size_mb', 'slots_changed', ...}.
     """
     ctx = "[BRIDGE - execute_check_plan]"
     try:
@@ -38,112 +56,304 @@ def execute_check_plan(sat_position, product, year, day):
 
         if not path_plan.exists():
             print(f"❌ Plan file not found at: {path_plan}")
-            return
+            return {"status": "NO PLAN"}
 
-        # 2. Cargar el JSON
-        with open(path_plan, 'r', encoding='utf-8') as f:
-            plan_data = json.load(f)
+        # 2. Volcar recibos pendientes del journal (sesión de descarga interrumpida)
+        PlanJournal(path_plan).recover()
 
-        # 3. Ejecutar tu lógica de chequeo (in-place)
-        updated_plan = check_dict_download_plan_day(plan_data)
+        # 3. Cargar el plan (modelo tipado; .bin si el texto no cambió)
+        plan_data = load_plan_model(path_plan)
 
-        # 4. Guardar los cambios en el JSON (ahora con los campos 'is_done' actualizados)
-        with open(path_plan, 'w', encoding='utf-8') as f:
-            json.dump(updated_plan, f, indent=4)
+        # 4. Ejecutar tu lógica de chequeo (in-place)
+        report = {}
+        updated_plan = check_dict_download_plan_day(plan_data, incremental=not full, report=report)
+
+        summary = updated_plan.summary
+        row = {"files_ready": summary.get("total_files_ready", 0), "files_total": len(updated_plan),
+               "files_online": summary.get("total_files_online"), "size_mb": summary.get("total_size_mb", 0.0),
+               "slots_changed": report["slots_changed"], "folders_scanned": report["folders_scanned"],
+               "folders_cached": report["folders_cached"]}
+
+        # 5. Guardar los cambios en el JSON (ahora con los campos 'is_done' actualizados)
+        if report["slots_changed"] == 0 and not report["summary_changed"] and not full:
+            print(f"✅ Plan unchanged, nothing to write: {path_plan.name}")
+            return {"status": "UNCHANGED", **row}
+        write_plan_atomic(path_plan, updated_plan)
             
-        print(f"✅ Plan updated on disk: {path_plan.name}")
+        print(f"✅ Plan updated on disk: {path_plan.name} ({report['slots_changed']} slots changed)")
+        return {"status": "UPDATED", **row}
 
     except Exception as e:
         print(f"💥 {ctx} Error: {e}")
         raise
 
+# =============================================================================
+# RANGE AUDIT (--from / --to, posiciones 'ALL', pool de procesos)
+# =============================================================================
+
+def _audit_plan_day(sat_position, product, year, day, full=False) -> dict:
+    """
+    Worker body (child process): one (position, product, day) check. The per-plan console
+    output is captured so only the merged table reaches the terminal.
+    """
+    row = {"sat_position": sat_position, "product": product, "year": year, "day": day}
+    buffer = io.StringIO()
+    try:
+        with redirect_stdout(buffer):
+            row.update(execute_check_plan(sat_position, product, year, day, full=full))
+    except Exception as e:
+        row["status"] = f"ERROR: {' '.join(str(e).split())}"
+    return row
+
+
+def summarize_audit(rows) -> list:
+    """
+    Audit rows -> one line per (position, product):
+    [(sat_position, product, days, no_plan, complete, files_ready, files_total, files_online, size_mb, updated, errors)]
+    """
+    groups = {}
+    for row in rows:
+        g = groups.setdefault((row["sat_position"], row["product"]), [0, 0, 0, 0, 0, 0, 0.0, 0, 0])
+        g[0] += 1
+        status = row["status"]
+        if status == "NO PLAN":
+            g[1] += 1
+        elif status.startswith("ERROR"):
+            g[8] += 1
+        else:
+            g[2] += row["files_ready"] == row["files_total"]
+            g[3] += row["files_ready"]
+            g[4] += row["files_total"]
+            g[5] += row["files_online"] or 0
+            g[6] += row["size_mb"] or 0.0
+            g[7] += status == "UPDATED"
+    return [key + tuple(values) for key, values in sorted(groups.items())]
+
+
+def _print_audit_table(table):
+    print(f"\n{'POSITION':<8} {'PRODUCT':<16} {'DAYS':>5} {'NO PLAN':>7} {'COMPLETE':>8} "
+          f"{'FILES':>17} {'%':>6} {'ONLINE':>8} {'GB':>8} {'UPDATED':>7} {'ERRORS':>6}")
+    for pos, prod, days, no_plan, complete, ready, total, online, size_mb, updated, errors in table:
+        pct = 100.0 * ready / total if total else 0.0
+        print(f"{pos:<8} {prod:<16} {days:>5} {no_plan:>7} {complete:>8} {ready:>8}/{total:<8} {pct:>6.1f} "
+              f"{online:>8} {size_mb / 1024:>8.2f} {updated:>7} {errors:>6}")
+
+
+def execute_check_plan_range(sat_positions, products, date_from, date_to, full=False, workers=None):
+    """
+    Audits every plan of [date_from, date_to] x positions x products. Each (position, product,
+    day) is one task of a process pool, so the hour-folder stats of different plans overlap
+    instead of adding up. Prints one merged table and returns the per-plan rows.
+    """
+    ctx = "[BRIDGE - execute_check_plan_range]"
+    unknown = [p for p in sat_positions if p not in AVAILABLE_GOES_SAT_POSITIONS]
+    if unknown:
+        raise ValueError(f"{ctx} Invalid positions {unknown}. Available: {AVAILABLE_GOES_SAT_POSITIONS}")
+    unknown = [p for p in products if p not in AVAILABLE_GOES_PRODUCTS]
+    if unknown:
+        raise ValueError(f"{ctx} Products not found in SoT: {unknown}")
+
+    days = parse_julian_range(date_from, date_to)
+    tasks = [(pos, product, year, day) for year, day in days for pos in sat_positions for product in products]
+    workers = max(1, min(int(workers or os.cpu_count() or 1), len(tasks)))
+    print(f"\n🔍 [AUDIT] {date_from} -> {date_to} | {len(days)} days x {len(sat_positions)} positions "
+          f"x {len(products)} products = {len(tasks)} plans | {workers} workers")
+
+    t0 = datetime.now()
+    rows = []
+    step = max(1, len(tasks) // 10)
+    if workers == 1:
+        for n, task in enumerate(tasks, 1):
+            rows.append(_audit_plan_day(*task, full=full))
+            if n % step == 0 or n == len(tasks):
+                print(f"   [{n:0{len(str(len(tasks)))}d}/{len(tasks)}] plans audited")
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_audit_plan_day, *task, full=full) for task in tasks]
+            for n, future in enumerate(as_completed(futures), 1):
+                rows.append(future.result())
+                if n % step == 0 or n == len(tasks):
+                    print(f"   [{n:0{len(str(len(tasks)))}d}/{len(tasks)}] plans audited")
+
+    rows.sort(key=lambda r: (r["sat_position"], r["product"], r["year"], r["day"]))
+    _print_audit_table(summarize_audit(rows))
+    for row in rows:
+        if row["status"].startswith("ERROR"):
+            print(f"❌ {row['sat_position']} {row['product']} {row['year']}-{row['day']}: {row['status']}")
+    elapsed = (datetime.now() - t0).total_seconds()
+    print(f"\n🏁 [AUDIT] {len(rows)} plans in {elapsed:.1f}s")
+    return rows
+
 # =============================================================================
 # CORE LOGIC (Tu lógica original)
 # =============================================================================
 
-def check_dict_download_plan_day(plan: dict) -> dict:
+def _slot_state(slot) -> tuple:
+    """Fields the check writes; comparing them before/after tells if a slot changed."""
+    mini, local, s3 = slot.mini_summary, slot.file_local, slot.file_s3
+    return (mini.is_done, mini.exists_local, mini.exists_online, mini.time_last_mod,
+            local.file_name, local.file_size_mb_local, local.path_absolute,
+            s3.exists_online, s3.file_name, s3.file_size_mb)
+
+
+def _match_section(match: dict | None) -> dict | None:
+    """Plan-side view of a match report: counters + the names worth looking at."""
+    if match is None:
+        return None
+    section = summarize_match(match)
+    section["unmatched_files"] = sorted(Path(obj["Key"]).name for obj in match["unmatched"])
+    section["duplicate_files"] = {slot: sorted(Path(obj["Key"]).name for obj in objs)
+                                  for slot, objs in sorted(match["duplicates"].items())}
+    return section
+
+
+def _print_match(label: str, section: dict | None):
+    if section is None:
+        return
+    print(f" [~] Match {label:<6} {section['assigned']} assigned ({section['shifted']} off-prefix) | "
+          f"{section['duplicates']} duplicates | {section['unmatched']} unmatched")
+    for file_name in section["unmatched_files"][:3]:
+        print(f"     - unmatched: {file_name}")
+    for slot, names in list(section["duplicate_files"].items())[:3]:
+        print(f"     - duplicate for {slot}: {', '.join(names)}")
+
+
+def check_dict_download_plan_day(plan, use_manifest: bool = True, incremental: bool = False,
+                                 report: dict | None = None, match_tolerance=None):
     """
     Checks local existence of files in the download plan and updates 
     mini_summary and summary in-place.
+    'plan' is a DownloadPlan (fn06); a legacy plan dict is still accepted and is
+    rewritten in place with the result.
+    If a local S3 manifest exists (data_manifest), online status is filled from it
+    without any network call.
+    incremental=True reuses the per-day stat cache: hour folders whose mtime did not
+    change are not listed again. 'report' (if given) receives the change counters.
+    Slots are assigned to online/local files by nearest start time within the product
+    tolerance (match_tolerance overrides it; 0 = exact prefix only). Unmatched and
+    duplicate files are reported in summary['slot_match'].
     """
     ctx = "[Planning - check_dict_download_plan_day()]"
     
     try:
-        if not isinstance(plan, dict):
-            raise ValueError("The provided plan must be a dictionary.")
+        if not isinstance(plan, (dict, DownloadPlan)):
+            raise ValueError("The provided plan must be a DownloadPlan or a dictionary.")
+        plan_dict = plan if isinstance(plan, dict) else None
+        plan = as_plan_model(plan)
 
         data_raw_root = get_my_path("data_raw")
-        inventory = plan.get("download_inventory", {})
+        inventory = plan.slots
         local_exists_count = 0
         total_size_mb = 0.0
         latest_mod_time = None
 
-        sat_prod = plan.get("sat_prod_info", {})
-        product = sat_prod.get("product_id", "unknown")
-        date_j = sat_prod.get("date_julian", "unknown")
+        product = plan.sat_prod_info.product_id
+        date_j = plan.sat_prod_info.date_julian
 
         print(f"🔍 Checking local integrity: {product} | {date_j}")
+        tolerance = resolve_match_tolerance(product, match_tolerance)
 
-        for file_key, item in inventory.items():
-            found_path = None
-
-            # --- ESTRATEGIA 1: Ruta absoluta ---
-            abs_path_str = item["file_local"].get("path_absolute")
-            if abs_path_str:
-                expected_path = Path(abs_path_str)
-                if expected_path.exists() and expected_path.is_file():
-                    found_path = expected_path
-
-            # --- ESTRATEGIA 2: Fallback por Regex ---
-            if found_path is None:
-                s3_info = item.get("file_s3", {})
-                regex = s3_info.get("regex")
-                prefix = s3_info.get("prefix")
-                
-                if regex and prefix:
-                    bucket = s3_info.get("bucket", "")
-                    full_pattern = data_raw_root / bucket / prefix / regex
-                    candidates = glob.glob(str(full_pattern))
-                    valid_candidates = [Path(p) for p in candidates if Path(p).is_file()]
-                    if valid_candidates:
-                        found_path = max(valid_candidates, key=lambda p: p.stat().st_mtime)
+        # --- S3 MANIFEST (offline) ---
+        online_index, online_hours, online_match = None, set(), None
+        if use_manifest:
+            manifest = S3ManifestCache.from_plan(plan)
+            online_hours = set(manifest.cached_hours())
+            if online_hours:
+                online_index = S3ListingIndex(manifest.all_objects())
+                print(f" [i] S3 manifest: {len(online_index)} objects cached in {len(online_hours)} hours")
+                online_match = assign_slots(online_index, [slot.file_s3.init_name for slot in inventory.values()
+                                                           if slot.file_s3.prefix_hour in online_hours], tolerance)
+
+        # --- ÍNDICE LOCAL (incremental: carpetas sin cambios salen del stat cache) ---
+        stat_cache = FolderStatCache.from_plan(plan) if incremental else None
+        local_index = LocalFolderIndex(data_raw_root, stat_cache)
+        local_match = local_index.assign_slots(inventory.values(), tolerance)
+        online_count = 0
+        slots_changed = 0
+        summary = plan.summary
+        summary_before = dict(summary)
+        for slot in inventory.values():
+            state_before = _slot_state(slot)
+            mini, local, s3 = slot.mini_summary, slot.file_local, slot.file_s3
+            # --- ESTADO ONLINE desde el manifest (sin red) ---
+            if online_index is not None and s3.prefix_hour in online_hours:
+                obj = online_index.find(s3.init_name)
+                s3.exists_online = obj is not None
+                mini.exists_online = obj is not None
+                if obj is not None:
+                    online_count += 1
+                    s3.file_name = Path(obj["Key"]).name
+                    s3.file_size_mb = round((obj.get("Size") or 0) / (1024 * 1024), 3)
+
+            # --- ESTADO LOCAL: índice de la carpeta horaria (un scandir por hora) ---
+            entry = local_index.find(slot)
 
             # --- ACTUALIZACIÓN ---
-            if found_path:
-                stat = found_path.stat()
-                mtime = datetime.fromtimestamp(stat.st_mtime)
-                size_mb = round(stat.st_size / (1024 * 1024), 3)
+            if entry is not None:
+                found_path = Path(entry["path"])
+                mtime = datetime.fromtimestamp(entry["mtime"])
+                size_mb = round(entry["Size"] / (1024 * 1024), 3)
                 
-                item["mini_summary"]["is_done"] = True
-                item["mini_summary"]["time_last_mod"] = mtime.strftime("%Y-%m-%d %H:%M:%S")
-                item["file_local"]["file_exists_local"] = True
-                item["file_local"]["file_size_mb_local"] = size_mb
-                item["file_local"]["path_absolute"] = str(found_path.resolve())
+                mini.is_done = True
+                mini.exists_local = True
+                mini.time_last_mod = mtime.strftime("%Y-%m-%d %H:%M:%S")
+                local.file_exists_local = True
+                local.exists_local = True
+                local.file_name = entry["Key"]
+                local.file_size_mb_local = size_mb
+                local.path_absolute = str(found_path.resolve())
                 
                 try:
-                    item["file_local"]["path_relative"] = str(found_path.relative_to(data_raw_root))
+                    local.path_relative = str(found_path.relative_to(data_raw_root))
                 except ValueError:
-                    item["file_local"]["path_relative"] = found_path.name
+                    local.path_relative = found_path.name
                 
-                item["folder_local"]["folder_exists_local"] = True
+                slot.folder_local.folder_exists_local = True
                 local_exists_count += 1
                 total_size_mb += size_mb
                 if latest_mod_time is None or mtime > latest_mod_time:
                     latest_mod_time = mtime
             else:
-                item["mini_summary"]["is_done"] = False
-                item["file_local"]["file_exists_local"] = False
+                mini.is_done = False
+                mini.exists_local = False
+                local.file_exists_local = False
+                local.exists_local = False
+
+            if _slot_state(slot) != state_before:
+                slots_changed += 1
 
         # --- SUMMARY GENERAL ---
         total_items = len(inventory) if inventory else 1
-        plan["summary"]["is_done"] = (local_exists_count == total_items)
-        plan["summary"]["total_files_ready"] = local_exists_count
-        plan["summary"]["total_size_mb"] = round(total_size_mb, 2)
+        summary["is_done"] = (local_exists_count == total_items)
+        summary["total_files_ready"] = local_exists_count
+        summary["total_size_mb"] = round(total_size_mb, 2)
         
         if latest_mod_time:
-            plan["summary"]["time_last_mod"] = latest_mod_time.strftime("%Y-%m-%d %H:%M:%S")
+            summary["time_last_mod"] = latest_mod_time.strftime("%Y-%m-%d %H:%M:%S")
+
+        if online_index is not None:
+            summary["total_files_online"] = online_count
 
-        print(f" [+] Check complete: {local_exists_count}/{total_items} files found.")
+        # --- MATCHING POR TOLERANCIA: archivos sin slot y duplicados ---
+        if tolerance > 0:
+            sections = {"tolerance_sec": tolerance, "local": _match_section(local_match),
+                        "online": _match_section(online_match)}
+            _print_match("local", sections["local"])
+            _print_match("online", sections["online"])
+            summary["slot_match"] = sections
+        if stat_cache is not None:
+            stat_cache.save()
+        stats = local_index.stats
+        if report is not None:
+            report.update(stats, slots_changed=slots_changed, summary_changed=summary != summary_before)
+        print(f" [+] Check complete: {local_exists_count}/{total_items} files found "
+              f"({stats['folders_scanned']} folders scanned, {stats['folders_cached']} unchanged | "
+              f"{stats['files_changed']} new/modified files | {slots_changed} slots changed).")
+        if plan_dict is not None:
+            # Caller legacy: mismo dict, actualizado in-place.
+            plan_dict.clear()
+            plan_dict.update(plan.to_dict())
+            return plan_dict
         return plan
 
     except Exception as e:
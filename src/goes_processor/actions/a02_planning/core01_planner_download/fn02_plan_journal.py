@@ -0,0 +1,188 @@
+# =============================================================================
+# FILE PATH: .../a02_planning/core01_planner_download/fn02_plan_journal.py
+# Version: 0.2.1 (Write-Ahead Journal for download plans + typed plan model)
+# =============================================================================
+"""
+Append-only journal (JSON lines) that lives next to a download plan.
+
+Workers append one small receipt per file instead of reloading and rewriting
+the whole plan JSON. The journal is folded back into the plan (compaction)
+every N records, at session end, or on the next open after a crash.
+"""
+
+# 1. CAPA DE SISTEMA (Standard Libraries)
+try:
+    import json
+    import threading
+    from datetime import datetime
+    from pathlib import Path
+except ImportError as e:
+    print(f"\n[SYSTEM LIB ERROR] - Critical Python libraries missing in fn02_plan_journal.py: {e}\n")
+    raise SystemExit(1)
+
+# 2. CAPA DE PROYECTO
+try:
+    from .fn04_plan_codec import load_plan_model, save_plan
+    from .fn06_plan_model import DownloadPlan
+    from goes_processor.actions.a02_planning.core02_plan_catalog.fn01_plan_catalog import sync_plan_safe
+except ImportError as e:
+    print(f"\n[PROJECT LIB ERROR] - Internal modules missing in fn02_plan_journal.py: {e}\n")
+    raise SystemExit(1)
+
+JOURNAL_SUFFIX = ".journal.jsonl"
+DEFAULT_COMPACT_EVERY = 500
+
+# ===================================================================
+# PUBLIC HELPERS
+# ===================================================================
+
+def get_plan_journal_path(path_plan) -> Path:
+    """plan_01_download_....json -> plan_01_download_....journal.jsonl"""
+    path_plan = Path(path_plan)
+    return path_plan.with_name(path_plan.stem + JOURNAL_SUFFIX)
+
+
+def apply_journal_record(plan: DownloadPlan, record: dict) -> DownloadPlan:
+    """Applies one journal receipt to the in-memory plan (same rules as the old per-file rewrite)."""
+    ctx = "[fn02_plan_journal.py - apply_journal_record()]"
+    try:
+        slot = plan.slots[record["file_key"]]
+    except KeyError as e:
+        raise ValueError(f"{ctx} Journal record does not match the plan: missing {e}") from None
+
+    mini, local = slot.mini_summary, slot.file_local
+    mini.exists_online = record.get("exists_online")
+    receipt = record.get("receipt")
+    if receipt and "SUCCESS" in receipt.get("status", ""):
+        mini.is_done, mini.exists_local, mini.time_last_mod = True, True, receipt.get("t_end")
+        local.exists_local, local.file_size_mb = True, receipt.get("size_mb")
+        # Nombre real en disco (puede no empezar con init_name si el archivo cayó fuera del slot nominal).
+        local.file_name = receipt.get("file_name") or local.file_name
+    elif receipt and receipt.get("status") == "EVICTED":
+        # Borrado por el gestor de espacio (core04_storage_budget): el slot vuelve a estar pendiente.
+        mini.is_done, mini.exists_local, mini.time_last_mod = False, False, receipt.get("t_end")
+        local.exists_local, local.file_size_mb, local.file_name = False, None, None
+    return plan
+
+
+def write_plan_atomic(path_plan, plan: DownloadPlan, plan_format: str | None = None):
+    """
+    Writes the plan through a temp file + os.replace (never leaves a half-written JSON).
+    Keeps the on-disk layout (legacy / compact) of the plan it replaces unless told otherwise.
+    The SQLite catalog follows every rewrite (compaction, checker).
+    """
+    save_plan(path_plan, plan, plan_format)
+    sync_plan_safe(path_plan, plan)
+
+# ===================================================================
+# JOURNAL
+# ===================================================================
+
+class PlanJournal:
+    """
+    Thread-safe write-ahead journal for one plan file.
+
+    Usage:
+        journal = PlanJournal(path_plan).recover()
+        journal.append("file0001", exists_online=True, receipt=receipt)
+        journal.close()   # final compaction
+    """
+
+    def __init__(self, path_plan, compact_every: int = DEFAULT_COMPACT_EVERY):
+        self.path_plan = Path(path_plan)
+        self.path_journal = get_plan_journal_path(self.path_plan)
+        self.compact_every = max(1, int(compact_every))
+        self._lock = threading.Lock()
+        self._fh = None
+        self._pending = 0
+        self.stats = {"appended": 0, "compactions": 0, "replayed": 0, "corrupt_lines": 0}
+
+    # --- internal ------------------------------------------------------
+
+    def _read_records(self):
+        if not self.path_journal.exists():
+            return []
+        records = []
+        with open(self.path_journal, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Típico de un corte a mitad de escritura: sólo se pierde esa línea.
+                    self.stats["corrupt_lines"] += 1
+                    print(f"⚠️  [JOURNAL] Skipping corrupt line {line_no} in {self.path_journal.name}")
+        return records
+
+    def _compact_locked(self):
+        ctx = "[PlanJournal - compact()]"
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+        records = self._read_records()
+        if records:
+            try:
+                plan = load_plan_model(self.path_plan)
+                for rec in records:
+                    apply_journal_record(plan, rec)
+                plan.summary["timestamp_file_last_mod"] = datetime.now().isoformat()
+                write_plan_atomic(self.path_plan, plan)
+            except (OSError, ValueError) as e:
+                raise ValueError(f"\n[CRITICAL]{ctx}: Could not fold journal into {self.path_plan.name}: {e}\n") from None
+
+        # Sólo se trunca el journal una vez que el plan quedó persistido.
+        self.path_journal.unlink(missing_ok=True)
+        self._pending = 0
+        self.stats["compactions"] += 1
+        return len(records)
+
+    # --- public --------------------------------------------------------
+
+    def recover(self):
+        """Replays a journal left behind by an interrupted session into the plan."""
+        with self._lock:
+            if self.path_journal.exists():
+                replayed = self._compact_locked()
+                self.stats["replayed"] += replayed
+                if replayed:
+                    print(f"♻️  [JOURNAL] Recovered {replayed} pending receipts into {self.path_plan.name}")
+        return self
+
+    def append(self, file_key: str, exists_online, receipt: dict | None = None):
+        """Appends one receipt. Compacts automatically every `compact_every` records."""
+        ctx = "[PlanJournal - append()]"
+        record = {"file_key": file_key, "exists_online": exists_online, "receipt": receipt}
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+
+        with self._lock:
+            try:
+                if self._fh is None:
+                    self._fh = open(self.path_journal, "a", encoding="utf-8")
+                self._fh.write(line)
+                self._fh.flush()
+            except OSError as e:
+                raise ValueError(f"\n[CRITICAL]{ctx}: Cannot write journal {self.path_journal}: {e}\n") from None
+
+            self._pending += 1
+            self.stats["appended"] += 1
+            if self._pending >= self.compact_every:
+                self._compact_locked()
+
+    def compact(self) -> int:
+        """Folds every pending record into the plan JSON. Returns the number of records applied."""
+        with self._lock:
+            return self._compact_locked()
+
+    def close(self):
+        """Final compaction at session end."""
+        return self.compact()
+
+    def __enter__(self):
+        return self.recover()
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
@@ -0,0 +1,157 @@
+"""
+Path: src/goes_processor/actions/a02_planning/core01_planner_download/fn03_time_window.py
+Version: 0.1.0 (Sub-day time windows)
+Description: Restricts a day plan (or a download run) to part of the day.
+             --start-time / --end-time  : [start, end) window. Accepted forms:
+                                          'HH', 'HH:MM', 'HH:MM:SS'         (relative to the plan day)
+                                          'YYYY-MM-DD_HH:MM[:SS]'           (calendar timestamp, README form)
+                                          'YYYYJJJHH[MM[SS]]'               (GOES start-token form)
+             --slots                    : explicit comma list with the same forms; a slot is kept
+                                          when its nominal start time equals one of them.
+             Slots are compared on their nominal time (time_stamp = YYYYJJJHH[MM[SS]]).
+"""
+
+# 1. SYSTEM LAYER
+try:
+    import re
+    from datetime import datetime, timezone
+except ImportError as e:
+    print(f"\n[SYSTEM LIB ERROR] - Critical libraries missing: {e}\n")
+    raise SystemExit(1)
+
+_CLOCK_RE = re.compile(r"^(\d{1,2})(?::(\d{2}))?(?::(\d{2}))?$")
+_CALENDAR_RE = re.compile(r"^(\d{4})-(\d{2})-(\d{2})[_T ](\d{1,2})(?::(\d{2}))?(?::(\d{2}))?$")
+_JULIAN_RE = re.compile(r"^(\d{4})(\d{3})(\d{2})(\d{2})?(\d{2})?$")
+
+# =============================================================================
+# PARSING
+# =============================================================================
+
+def _day_start_epoch(year, day) -> float:
+    return datetime.strptime(f"{year}{str(day).zfill(3)}", "%Y%j").replace(tzinfo=timezone.utc).timestamp()
+
+
+def parse_time_point(raw: str):
+    """
+    Returns ('rel', seconds_of_day) or ('abs', epoch_seconds). Raises ValueError on bad input.
+    """
+    ctx = "[fn03_time_window.py - parse_time_point()]"
+    text = str(raw).strip()
+
+    m = _CLOCK_RE.match(text)
+    if m:
+        hh, mm, ss = int(m.group(1)), int(m.group(2) or 0), int(m.group(3) or 0)
+        if hh > 24 or mm > 59 or ss > 59 or (hh == 24 and (mm or ss)):
+            raise ValueError(f"{ctx} Invalid clock time '{raw}'.")
+        return "rel", hh * 3600 + mm * 60 + ss
+
+    m = _CALENDAR_RE.match(text)
+    if m:
+        y, mo, d, hh = (int(m.group(i)) for i in range(1, 5))
+        mm, ss = int(m.group(5) or 0), int(m.group(6) or 0)
+        try:
+            return "abs", datetime(y, mo, d, hh, mm, ss, tzinfo=timezone.utc).timestamp()
+        except ValueError:
+            raise ValueError(f"{ctx} Invalid calendar time '{raw}'.") from None
+
+    m = _JULIAN_RE.match(text)
+    if m:
+        y, jday, hh = m.group(1), m.group(2), int(m.group(3))
+        mm, ss = int(m.group(4) or 0), int(m.group(5) or 0)
+        if not (1 <= int(jday) <= 366) or hh > 23 or mm > 59 or ss > 59:
+            raise ValueError(f"{ctx} Invalid Julian timestamp '{raw}'.")
+        return "abs", _day_start_epoch(y, jday) + hh * 3600 + mm * 60 + ss
+
+    raise ValueError(f"{ctx} Unrecognized time '{raw}'. Use HH[:MM[:SS]], YYYY-MM-DD_HH:MM or YYYYJJJHHMM.")
+
+
+def slot_epoch(time_stamp: str) -> float:
+    """'YYYYJJJHH[MM[SS]]' -> epoch seconds (UTC)."""
+    base = _day_start_epoch(time_stamp[:4], time_stamp[4:7])
+    return base + int(time_stamp[7:9] or 0) * 3600 + int(time_stamp[9:11] or 0) * 60 + int(time_stamp[11:13] or 0)
+
+# =============================================================================
+# WINDOW
+# =============================================================================
+
+class TimeWindow:
+    """[start, end) and/or explicit slot list, evaluated on a slot's nominal start time."""
+
+    def __init__(self, start=None, end=None, slots=None):
+        self.start = start        # ('rel'|'abs', seconds) | None
+        self.end = end
+        self.slots = slots        # [('rel'|'abs', seconds), ...] | None
+
+    def _resolve(self, point, day_start):
+        kind, value = point
+        return day_start + value if kind == "rel" else value
+
+    def bounds_for_day(self, year, day):
+        """(start_epoch, end_epoch, slot_epochs) for one plan day."""
+        day_start = _day_start_epoch(year, day)
+        start = self._resolve(self.start, day_start) if self.start else None
+        end = self._resolve(self.end, day_start) if self.end else None
+        slots = {self._resolve(p, day_start) for p in self.slots} if self.slots else None
+        return start, end, slots
+
+    def contains(self, time_stamp: str) -> bool:
+        start, end, slots = self.bounds_for_day(time_stamp[:4], time_stamp[4:7])
+        t = slot_epoch(time_stamp)
+        if start is not None and t < start:
+            return False
+        if end is not None and t >= end:
+            return False
+        if slots is not None and t not in slots:
+            return False
+        return True
+
+    def filter_time_stamps(self, time_stamps):
+        """Keeps plan order. One bounds computation per day (plans are single-day)."""
+        cache = {}
+        out = []
+        for ts in time_stamps:
+            key = ts[:7]
+            if key not in cache:
+                cache[key] = self.bounds_for_day(ts[:4], ts[4:7])
+            start, end, slots = cache[key]
+            t = slot_epoch(ts)
+            if (start is None or t >= start) and (end is None or t < end) and (slots is None or t in slots):
+                out.append(ts)
+        return out
+
+    def to_dict(self) -> dict:
+        def fmt(p):
+            return None if p is None else {"kind": p[0], "seconds": p[1]}
+        return {"start": fmt(self.start), "end": fmt(self.end),
+                "slots": None if self.slots is None else [fmt(p) for p in self.slots]}
+
+    def describe(self) -> str:
+        def fmt(p):
+            kind, value = p
+            if kind == "rel":
+                return f"{int(value) // 3600:02d}:{int(value) % 3600 // 60:02d}:{int(value) % 60:02d}"
+            return datetime.fromtimestamp(value, tz=timezone.utc).strftime("%Y-%m-%d_%H:%M:%S")
+        parts = []
+        if self.start or self.end:
+            parts.append(f"[{fmt(self.start) if self.start else 'day start'} -> {fmt(self.end) if self.end else 'day end'})")
+        if self.slots:
+            parts.append(f"{len(self.slots)} explicit slots")
+        return " + ".join(parts)
+
+
+def parse_time_window(start_time=None, end_time=None, slots=None):
+    """CLI values -> TimeWindow, or None when no restriction was requested."""
+    ctx = "[fn03_time_window.py - parse_time_window()]"
+    start = parse_time_point(start_time) if start_time else None
+    end = parse_time_point(end_time) if end_time else None
+    slot_points = None
+    if slots:
+        slot_points = [parse_time_point(s) for s in str(slots).split(",") if s.strip()]
+        if not slot_points:
+            raise ValueError(f"{ctx} --slots was given but contains no time.")
+
+    if start is None and end is None and slot_points is None:
+        return None
+    if start and end and start[0] == end[0] and end[1] <= start[1]:
+        raise ValueError(f"{ctx} --end-time must be after --start-time.")
+    return TimeWindow(start, end, slot_points)
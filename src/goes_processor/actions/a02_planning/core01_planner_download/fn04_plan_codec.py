@@ -0,0 +1,418 @@
+"""
+Path: src/goes_processor/actions/a02_planning/core01_planner_download/fn04_plan_codec.py
+Version: 0.2.1 (Compact plan storage + typed model + binary cache)
+Description: Two on-disk layouts for the same plan dict, same file name (.json):
+             - 'legacy'  : the nested 'download_inventory' written with indent=4 (human readable).
+             - 'compact' : packed JSON with a schema header. Every inventory field becomes a column;
+                           a column is stored once when all slots share it ('shared'), as a template
+                           when it only varies with the slot ({ts} time stamp, {hh} hour, {n} slot
+                           number), run-length encoded when it has long runs, or as a plain list.
+                           Templates are only kept if they rebuild every value exactly (lossless).
+             load_plan() detects the layout and always returns the legacy dict (for tools that
+             still want 'download_inventory' whatever is on disk). load_plan_table() decodes only
+             the requested columns for read-only queries.
+             load_plan_model() returns the typed fn06 DownloadPlan every stage works on. The text
+             file stays the source of truth; a binary mirror (marshal, next to the plan as .bin and
+             in memory) stamped with the text's size + CRC32 and the Python version (marshal's
+             format is not stable across versions) lets the next stage or the next process skip
+             JSON parsing. Only plan writers refresh the .bin on disk; readers (check, reproject...)
+             never write next to a plan. save_plan() accepts the model or a dict.
+"""
+
+# 1. SYSTEM LAYER
+try:
+    import json
+    import os
+    import re
+    import sys
+    import threading
+    import zlib
+    from collections import OrderedDict
+    from pathlib import Path
+except ImportError as e:
+    print(f"\n[SYSTEM LIB ERROR] - Critical libraries missing: {e}\n")
+    raise SystemExit(1)
+
+# 2. PROJECT LAYER
+try:
+    from .fn06_plan_model import DownloadPlan
+except ImportError as e:
+    print(f"\n[PROJECT LIB ERROR] - Internal modules missing: {e}\n")
+    raise SystemExit(1)
+
+PACKED_FORMAT = "goes-plan-packed"
+PACKED_VERSION = 1
+PLAN_FORMATS = ("auto", "compact", "legacy")
+# 'auto': planes con muchos slots por día (GLM: 4320) se guardan compactos.
+AUTO_COMPACT_MIN_SLOTS = 1000
+
+_MISSING = object()
+_HEADER_PROBE = f'{{"plan_format":"{PACKED_FORMAT}"'
+
+BINARY_CACHE_SUFFIX = ".bin"
+# marshal no garantiza el mismo formato entre versiones de Python: va en el stamp del espejo.
+_MARSHAL_PYTHON = tuple(sys.version_info[:2])
+# Espejos binarios recientes en memoria (bytes, no objetos: cada load devuelve un modelo propio).
+MEMORY_CACHE_PLANS = 8
+_memory_cache = OrderedDict()
+_memory_lock = threading.Lock()         # compactions de varios journals pueden correr en paralelo
+
+# =============================================================================
+# 1. FLATTEN / TEMPLATES
+# =============================================================================
+
+def _flatten(item: dict, prefix="", out=None) -> dict:
+    """{'a': {'b': 1}} -> {'a.b': 1}. Empty dicts stay as leaves."""
+    out = {} if out is None else out
+    for key, value in item.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict) and value:
+            _flatten(value, path + ".", out)
+        else:
+            out[path] = value
+    return out
+
+
+def _column_tree(columns: list) -> list:
+    """['a.b', 'a.c', 'd'] -> [('a', [('b', 0), ('c', 1)]), ('d', 2)] (keeps column order)."""
+    tree = {}
+    for index, path in enumerate(columns):
+        node = tree
+        parts = path.split(".")
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+        node[parts[-1]] = index
+
+    def _to_list(node):
+        return [(k, _to_list(v) if isinstance(v, dict) else v) for k, v in node.items()]
+    return _to_list(tree)
+
+
+def _build_rows(tree: list, decoded: list, sparse: set) -> list:
+    """Column-wise assembly: one list of dicts per (sub)section, built with dict(zip()) per row."""
+    keys, columns, has_missing = [], [], False
+    for key, child in tree:
+        keys.append(key)
+        if isinstance(child, list):
+            columns.append(_build_rows(child, decoded, sparse))
+        else:
+            columns.append(decoded[child])
+            has_missing = has_missing or child in sparse
+    if not has_missing:
+        return [dict(zip(keys, values)) for values in zip(*columns)]
+    return [{k: v for k, v in zip(keys, values) if v is not _MISSING} for values in zip(*columns)]
+
+
+def _slot_tokens(file_key: str, row: dict) -> dict:
+    ts = str(row.get("time_stamp") or "")
+    return {"{ts}": ts, "{hh}": ts[7:9], "{n}": file_key[4:] if file_key.startswith("file") else ""}
+
+
+def _make_template(value: str, tokens: dict):
+    if tokens["{ts}"]:
+        value = value.replace(tokens["{ts}"], "{ts}")
+    if tokens["{hh}"]:
+        value = re.sub(rf"/{tokens['{hh}']}(?=/|$)", "/{hh}", value)
+    if tokens["{n}"] and value.startswith(tokens["{n}"]):
+        value = "{n}" + value[len(tokens["{n}"]):]
+    return value
+
+
+def _render(template: str, tokens: dict) -> str:
+    for token, value in tokens.items():
+        template = template.replace(token, value)
+    return template
+
+
+def _compile_template(template: str) -> str:
+    """'{ts}_x/{hh}' -> '{0}_x/{1}' for str.format (literal braces escaped)."""
+    fmt = template.replace("{", "{{").replace("}", "}}")
+    for index, token in enumerate(("{ts}", "{hh}", "{n}")):
+        fmt = fmt.replace("{" + token + "}", "{%d}" % index)
+    return fmt
+
+# =============================================================================
+# 2. COLUMN ENCODING
+# =============================================================================
+
+def _encode_column(values: list, tokens: list | None):
+    present = [v is not _MISSING for v in values]
+    missing = [i for i, p in enumerate(present) if not p]
+    vals = [v for v in values if v is not _MISSING]
+    entry = {}
+    if missing:
+        entry["missing"] = missing
+
+    if vals and all(v == vals[0] for v in vals):
+        entry.update({"mode": "shared", "value": vals[0]})
+        return entry
+
+    if tokens is not None and vals and all(isinstance(v, str) for v in vals):
+        rows = [t for t, p in zip(tokens, present) if p]
+        template = _make_template(vals[0], rows[0])
+        if template != vals[0] and all(_render(template, t) == v for t, v in zip(rows, vals)):
+            entry.update({"mode": "template", "value": template})
+            return entry
+
+    runs = []
+    for v in vals:
+        if runs and runs[-1][0] == v:
+            runs[-1][1] += 1
+        else:
+            runs.append([v, 1])
+    if len(runs) * 4 <= len(vals):
+        entry.update({"mode": "rle", "runs": runs})
+    else:
+        entry.update({"mode": "plain", "values": vals})
+    return entry
+
+
+def _decode_column(entry: dict, n_rows: int, tokens: list) -> list:
+    missing = set(entry.get("missing", ()))
+    rows = [i for i in range(n_rows) if i not in missing]
+    mode = entry["mode"]
+    if mode == "shared":
+        vals = [entry["value"]] * len(rows)
+    elif mode == "template":
+        fmt = _compile_template(entry["value"])
+        vals = [fmt.format(*tokens[i].values()) for i in rows]
+    elif mode == "rle":
+        vals = [v for v, count in entry["runs"] for _ in range(count)]
+    else:
+        vals = entry["values"]
+    if vals and isinstance(vals[0], (dict, list)) and mode in ("shared", "rle"):
+        # Cada slot necesita su propio objeto mutable (el journal los modifica in-place).
+        vals = [json.loads(json.dumps(v)) for v in vals]
+    if not missing:
+        return list(vals)
+    out = [_MISSING] * n_rows
+    for i, v in zip(rows, vals):
+        out[i] = v
+    return out
+
+# =============================================================================
+# 3. PLAN <-> PACKED
+# =============================================================================
+
+def pack_plan(plan: dict) -> dict:
+    """Legacy plan dict -> packed dict (schema header + columnar inventory)."""
+    inventory = plan.get("download_inventory", {})
+    keys = list(inventory)
+    flat_rows = [_flatten(inventory[k]) for k in keys]
+
+    columns = {}
+    for row in flat_rows:
+        for path in row:
+            columns.setdefault(path, None)
+    tokens = [_slot_tokens(k, row) for k, row in zip(keys, flat_rows)]
+
+    # 'time_stamp' es la fuente de los tokens: nunca se guarda como template.
+    packed_columns = {path: _encode_column([row.get(path, _MISSING) for row in flat_rows],
+                                           None if path == "time_stamp" else tokens)
+                      for path in columns}
+    head = {k: v for k, v in plan.items() if k != "download_inventory"}
+    return {"plan_format": PACKED_FORMAT, "format_version": PACKED_VERSION,
+            "schema": {"n_slots": len(keys), "columns": list(columns), "tokens": ["{ts}", "{hh}", "{n}"]},
+            **head,
+            "inventory": {"keys": keys, "columns": packed_columns}}
+
+
+def unpack_plan(packed: dict) -> dict:
+    """Packed dict -> legacy plan dict (same keys/order as code01 produces)."""
+    ctx = "[fn04_plan_codec.py - unpack_plan()]"
+    if packed.get("format_version", 0) > PACKED_VERSION:
+        raise ValueError(f"{ctx} Plan format v{packed.get('format_version')} is newer than this reader (v{PACKED_VERSION}).")
+
+    inv = packed["inventory"]
+    keys = inv["keys"]
+    columns = packed["schema"]["columns"]
+    n = len(keys)
+
+    # 'time_stamp' primero: los templates dependen de él.
+    decoded = {}
+    ts_values = _decode_column(inv["columns"]["time_stamp"], n, None) if "time_stamp" in inv["columns"] else [""] * n
+    tokens = [_slot_tokens(k, {"time_stamp": ts if ts is not _MISSING else ""}) for k, ts in zip(keys, ts_values)]
+    for path in columns:
+        decoded[path] = ts_values if path == "time_stamp" else _decode_column(inv["columns"][path], n, tokens)
+
+    by_index = [decoded[path] for path in columns]
+    sparse = {i for i, path in enumerate(columns) if inv["columns"][path].get("missing")}
+    inventory = dict(zip(keys, _build_rows(_column_tree(columns), by_index, sparse))) if columns else {k: {} for k in keys}
+
+    skip = {"plan_format", "format_version", "schema", "inventory"}
+    plan = {k: v for k, v in packed.items() if k not in skip}
+    plan["download_inventory"] = inventory
+    return plan
+
+def load_plan_table(path_plan, columns=None) -> tuple:
+    """
+    Fast read-only view: (file_keys, {'mini_summary.is_done': [...], ...}) without rebuilding the
+    nested inventory. Only the requested columns are decoded (compact plans: a few ms for GLM).
+    """
+    with open(path_plan, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("plan_format") != PACKED_FORMAT:
+        inventory = data.get("download_inventory", {})
+        rows = [_flatten(item) for item in inventory.values()]
+        wanted = columns or list(dict.fromkeys(p for row in rows for p in row))
+        return list(inventory), {c: [row.get(c) for row in rows] for c in wanted}
+
+    inv = data["inventory"]
+    keys = inv["keys"]
+    n = len(keys)
+    ts_values = _decode_column(inv["columns"]["time_stamp"], n, None) if "time_stamp" in inv["columns"] else [""] * n
+    tokens = [_slot_tokens(k, {"time_stamp": ts if ts is not _MISSING else ""}) for k, ts in zip(keys, ts_values)]
+    out = {}
+    for path in columns or data["schema"]["columns"]:
+        values = ts_values if path == "time_stamp" else _decode_column(inv["columns"][path], n, tokens)
+        out[path] = [None if v is _MISSING else v for v in values]
+    return keys, out
+
+# =============================================================================
+# 4. FILE I/O
+# =============================================================================
+
+def resolve_plan_format(plan_format: str, plan: dict) -> str:
+    """'auto' -> 'compact' for high-cadence products, 'legacy' otherwise."""
+    ctx = "[fn04_plan_codec.py - resolve_plan_format()]"
+    if plan_format not in PLAN_FORMATS:
+        raise ValueError(f"{ctx} Unknown plan format '{plan_format}'. Use: {PLAN_FORMATS}")
+    if plan_format != "auto":
+        return plan_format
+    if isinstance(plan, DownloadPlan):
+        total = plan.sat_prod_info.total_files_one_day or len(plan)
+    else:
+        total = plan.get("sat_prod_info", {}).get("total_files_one_day") or len(plan.get("download_inventory", {}))
+    return "compact" if total >= AUTO_COMPACT_MIN_SLOTS else "legacy"
+
+
+def detect_plan_format(path_plan) -> str | None:
+    """Reads only the first bytes. None if the file does not exist."""
+    try:
+        with open(path_plan, "r", encoding="utf-8") as f:
+            head = f.read(len(_HEADER_PROBE))
+    except FileNotFoundError:
+        return None
+    return "compact" if head == _HEADER_PROBE else "legacy"
+
+
+def dumps_plan(plan, plan_format: str = "legacy") -> str:
+    """DownloadPlan or legacy dict -> text in the requested layout."""
+    if isinstance(plan, DownloadPlan):
+        plan = plan.to_dict()
+    if plan_format == "compact":
+        return json.dumps(pack_plan(plan), separators=(",", ":"))
+    return json.dumps(plan, indent=4)
+
+
+def loads_plan(text: str) -> dict:
+    data = json.loads(text)
+    return unpack_plan(data) if data.get("plan_format") == PACKED_FORMAT else data
+
+
+def load_plan(path_plan) -> dict:
+    """Any layout on disk -> legacy plan dict."""
+    with open(path_plan, "r", encoding="utf-8") as f:
+        return loads_plan(f.read())
+
+# =============================================================================
+# 5. TYPED MODEL + BINARY CACHE
+# =============================================================================
+
+def get_plan_binary_path(path_plan) -> Path:
+    """plan_01_download_....json -> plan_01_download_....bin"""
+    path_plan = Path(path_plan)
+    return path_plan.with_name(path_plan.stem + BINARY_CACHE_SUFFIX)
+
+
+def _text_stamp(raw: bytes) -> tuple:
+    return (len(raw), zlib.crc32(raw)) + _MARSHAL_PYTHON
+
+
+def _remember(path_plan, stamp, blob: bytes):
+    key = str(Path(path_plan).resolve())
+    with _memory_lock:
+        _memory_cache[key] = (stamp, blob)
+        _memory_cache.move_to_end(key)
+        while len(_memory_cache) > MEMORY_CACHE_PLANS:
+            _memory_cache.popitem(last=False)
+
+
+def _write_binary_mirror(path_plan, plan: DownloadPlan, stamp):
+    """Best effort: without the mirror the next load just parses the text."""
+    blob = plan.to_binary(stamp)
+    _remember(path_plan, stamp, blob)
+    path_bin = get_plan_binary_path(path_plan)
+    # Temporal propio por proceso: dos escritores del mismo plan no se pisan el .tmp.
+    tmp_path = path_bin.with_name(f"{path_bin.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(blob)
+        os.replace(tmp_path, path_bin)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+
+
+def load_plan_model(path_plan) -> DownloadPlan:
+    """
+    Any layout on disk -> validated DownloadPlan.
+    The text is always read (CRC32 is the freshness check), but it is only parsed when
+    neither the in-memory nor the .bin mirror matches it. Read-only: a parsed plan is only
+    remembered in memory, the .bin on disk is written by write_plan_text() / save_plan().
+    """
+    with open(path_plan, "rb") as f:
+        raw = f.read()
+    stamp = _text_stamp(raw)
+
+    with _memory_lock:
+        cached = _memory_cache.get(str(Path(path_plan).resolve()))
+    if cached is not None and cached[0] == stamp:
+        plan = DownloadPlan.from_binary(cached[1], stamp)
+        if plan is not None:
+            return plan
+    try:
+        with open(get_plan_binary_path(path_plan), "rb") as f:
+            blob = f.read()
+        plan = DownloadPlan.from_binary(blob, stamp)
+        if plan is not None:
+            _remember(path_plan, stamp, blob)
+            return plan
+    except OSError:
+        pass
+
+    plan = DownloadPlan.from_dict(loads_plan(raw.decode("utf-8")))
+    _remember(path_plan, stamp, plan.to_binary(stamp))
+    return plan
+
+
+def write_plan_text(path_plan, text: str, plan: DownloadPlan | None = None, fsync: bool = True):
+    """
+    Atomic write of an already serialized plan (temp + os.replace). With the model at hand
+    its binary mirror is refreshed too; otherwise a stale mirror is dropped.
+    """
+    path_plan = Path(path_plan)
+    raw = text.encode("utf-8")
+    tmp_path = path_plan.with_name(path_plan.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(raw)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path_plan)
+    if plan is not None:
+        _write_binary_mirror(path_plan, plan, _text_stamp(raw))
+    else:
+        get_plan_binary_path(path_plan).unlink(missing_ok=True)
+        with _memory_lock:
+            _memory_cache.pop(str(path_plan.resolve()), None)
+
+
+def save_plan(path_plan, plan, plan_format: str | None = None, fsync: bool = True):
+    """
+    Atomic write of a DownloadPlan (or legacy dict). plan_format None keeps the layout of
+    the file being replaced (new files: 'auto').
+    """
+    if plan_format is None:
+        plan_format = detect_plan_format(path_plan) or "auto"
+    text = dumps_plan(plan, resolve_plan_format(plan_format, plan))
+    write_plan_text(path_plan, text, plan if isinstance(plan, DownloadPlan) else None, fsync)
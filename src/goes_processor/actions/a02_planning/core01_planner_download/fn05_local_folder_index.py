@@ -0,0 +1,235 @@
+"""
+Path: src/goes_processor/actions/a02_planning/core01_planner_download/fn05_local_folder_index.py
+Version: 0.3.0 (Directory index + per-day stat cache + nearest-time slot matching + typed plan model)
+Description: Resolves plan slots against data_raw with one os.scandir per hour folder.
+             Every folder is read once into an index keyed by scan start time
+             (same bisect index used for S3 listings), so a GLM day costs 24 directory
+             reads instead of 4,320 globs + stats.
+             FolderStatCache remembers, per day, each hour folder's mtime and its files
+             (name, size, mtime): an hour whose folder mtime did not move is served from
+             the cache with a single stat() and never listed again.
+             assign_slots() matches every folder's files to its slots by nearest start time
+             (fn09_slot_matcher) before the per-slot lookups.
+"""
+
+# 1. SYSTEM LAYER
+try:
+    import json
+    import os
+    import time
+    from pathlib import Path
+except ImportError as e:
+    print(f"\n[SYSTEM LIB ERROR] - Critical libraries missing: {e}\n")
+    raise SystemExit(1)
+
+# 2. PROJECT LAYER
+try:
+    from goes_processor.SoT.goes_hardcoded_folders import get_my_path
+    from goes_processor.actions.a03_download.core01_download_from_s3.fn02_s3_listing_index import S3ListingIndex
+    from goes_processor.actions.a03_download.core01_download_from_s3.fn09_slot_matcher import is_available, match_slots
+except ImportError as e:
+    print(f"\n[PROJECT LIB ERROR] - Internal modules missing: {e}\n")
+    raise SystemExit(1)
+
+STAT_CACHE_VERSION = 1
+# Un mtime tan reciente puede no reflejar escrituras del mismo tick del filesystem: esa carpeta
+# se vuelve a listar en la próxima pasada (mismo criterio que el "racy index" de git).
+RACY_WINDOW_SEC = 2.0
+
+# =============================================================================
+# FOLDER SCAN
+# =============================================================================
+
+def scan_hour_folder(folder) -> list:
+    """
+    One directory read -> [{'Key': name, 'Size': bytes, 'mtime': epoch, 'path': str}].
+    Only finished '.nc' files count (a '.part' from an interrupted transfer is not a file yet).
+    A missing folder is simply empty.
+    """
+    entries = []
+    try:
+        with os.scandir(folder) as it:
+            for entry in it:
+                if not entry.name.endswith(".nc") or not entry.is_file(follow_symlinks=True):
+                    continue
+                st = entry.stat()
+                entries.append({"Key": entry.name, "Size": st.st_size, "mtime": st.st_mtime, "path": entry.path})
+    except (FileNotFoundError, NotADirectoryError):
+        pass
+    return entries
+
+# =============================================================================
+# STAT CACHE (one file per bucket / product / day)
+# =============================================================================
+
+def get_stat_cache_path(bucket: str, product: str, year: str, day: str) -> Path:
+    """data_storage/check_cache/<bucket>/<product>/<year>/stat_cache_<year>_<day>_<product>.json"""
+    day_str = str(day).zfill(3)
+    return (get_my_path("data_storage") / "check_cache" / bucket / product / str(year)
+            / f"stat_cache_{year}_{day_str}_{product}.json")
+
+
+class FolderStatCache:
+    """
+    {"folders": {"<hour folder>": {"mtime_ns": int, "files": [[name, size, mtime], ...]}}}
+    A corrupt or foreign-version file is ignored (the day is simply listed again).
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._folders = {}
+        self._dirty = False
+        self.load()
+
+    @classmethod
+    def from_plan(cls, plan):
+        """plan: fn06 DownloadPlan."""
+        info = plan.sat_prod_info
+        return cls(get_stat_cache_path(info.bucket_name, info.product_id, info.year, info.day))
+
+    def load(self):
+        if not self.path.exists():
+            return self
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == STAT_CACHE_VERSION:
+                self._folders = data.get("folders", {})
+        except (OSError, ValueError):
+            self._folders = {}
+        return self
+
+    def save(self):
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": STAT_CACHE_VERSION, "folders": self._folders}, f, separators=(",", ":"))
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+    def get(self, folder: str, mtime_ns: int):
+        """Cached files of a folder, only if its mtime is exactly the one recorded."""
+        entry = self._folders.get(folder)
+        if entry is None or entry.get("mtime_ns") != mtime_ns:
+            return None
+        return entry["files"]
+
+    def previous(self, folder: str) -> dict:
+        """{name: (size, mtime)} of the last listing, whatever the folder mtime."""
+        entry = self._folders.get(folder)
+        return {name: (size, mtime) for name, size, mtime in entry["files"]} if entry else {}
+
+    def put(self, folder: str, mtime_ns, files):
+        if mtime_ns is None or time.time() - mtime_ns / 1e9 < RACY_WINDOW_SEC:
+            self._folders.pop(folder, None)
+        else:
+            self._folders[folder] = {"mtime_ns": mtime_ns, "files": files}
+        self._dirty = True
+
+# =============================================================================
+# DAY INDEX
+# =============================================================================
+
+class LocalFolderIndex:
+    """
+    Lazy {hour folder: S3ListingIndex} over data_raw. A folder is scanned the first time
+    one of its slots is resolved; the other slots of that hour reuse the same index.
+    """
+
+    def __init__(self, data_raw_root, stat_cache: FolderStatCache | None = None):
+        self.data_raw_root = Path(data_raw_root)
+        self.stat_cache = stat_cache
+        self._folders = {}
+        self._entries = {}
+        self._assigned = {}
+        self._resolved = {}
+        self.stats = {"folders_scanned": 0, "folders_cached": 0, "files_indexed": 0, "files_changed": 0}
+
+    def folder_for(self, slot) -> Path:
+        """
+        Hour folder of a slot (fn06 PlanSlot). The relative path is preferred (plans may come
+        from another machine); the absolute one is only used when the relative folder is not there.
+        """
+        folder_local, file_s3 = slot.folder_local, slot.file_s3
+        rel = folder_local.path_relative
+        if not rel and file_s3.prefix_hour:
+            rel = f"{file_s3.bucket}/{file_s3.prefix_hour}"
+        abs_path = folder_local.path_absolute
+        memo_key = (rel, abs_path)
+        if memo_key not in self._resolved:
+            # Un is_dir() por carpeta horaria, no por slot.
+            folder = self.data_raw_root / rel if rel else None
+            if abs_path and (folder is None or not folder.is_dir()):
+                folder = Path(abs_path)
+            self._resolved[memo_key] = folder
+        return self._resolved[memo_key]
+
+    def index_for(self, folder) -> S3ListingIndex:
+        key = str(folder)
+        index = self._folders.get(key)
+        if index is None:
+            if self.stat_cache is not None:
+                entries = self._cached_entries(key)
+            else:
+                entries = scan_hour_folder(folder)
+                self.stats["folders_scanned"] += 1
+            index = S3ListingIndex(entries)
+            self._folders[key] = index
+            self._entries[key] = entries
+            self.stats["files_indexed"] += len(entries)
+        return index
+
+    def _cached_entries(self, folder: str):
+        """
+        Unchanged folder mtime -> entries from the stat cache (one stat, no listing).
+        Otherwise the folder is listed and only new or modified files count as changed.
+        """
+        try:
+            mtime_ns = os.stat(folder).st_mtime_ns
+        except (FileNotFoundError, NotADirectoryError):
+            mtime_ns = None
+        files = self.stat_cache.get(folder, mtime_ns) if mtime_ns is not None else None
+        if files is not None:
+            self.stats["folders_cached"] += 1
+            return [{"Key": name, "Size": size, "mtime": mtime, "path": os.path.join(folder, name)}
+                    for name, size, mtime in files]
+
+        entries = scan_hour_folder(folder)
+        self.stats["folders_scanned"] += 1
+        previous = self.stat_cache.previous(folder)
+        self.stats["files_changed"] += sum(1 for e in entries if previous.get(e["Key"]) != (e["Size"], e["mtime"]))
+        self.stat_cache.put(folder, mtime_ns, [[e["Key"], e["Size"], e["mtime"]] for e in entries])
+        return entries
+
+    def find(self, slot, tolerance_sec: float = 0):
+        """Local entry ({'Key', 'Size', 'mtime', 'path'}) of a plan slot, or None."""
+        init_name = slot.file_local.init_name
+        if init_name in self._assigned:
+            return self._assigned[init_name]
+        folder = self.folder_for(slot)
+        if folder is None:
+            return None
+        return self.index_for(folder).find(init_name, tolerance_sec)
+
+    def assign_slots(self, slots, tolerance_sec: float):
+        """
+        Nearest-time assignment of all the given slots against the files of their hour
+        folders, in one batch (a file drifting across the hour boundary still finds its slot).
+        Winners are used by find(). Returns the fn09 report, or None when matching is off.
+        """
+        if not is_available() or not tolerance_sec or tolerance_sec <= 0:
+            return None
+        names, entries = [], []
+        for slot in slots:
+            folder = self.folder_for(slot)
+            if folder is None:
+                continue
+            self.index_for(folder)
+            names.append(slot.file_local.init_name)
+        for folder_entries in self._entries.values():
+            entries.extend(folder_entries)
+        report = match_slots(names, entries, tolerance_sec)
+        self._assigned.update(report["assigned"])
+        return report
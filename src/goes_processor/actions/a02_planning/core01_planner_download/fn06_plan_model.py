@@ -0,0 +1,309 @@
+"""
+Path: src/goes_processor/actions/a02_planning/core01_planner_download/fn06_plan_model.py
+Version: 0.1.1 (Typed in-memory plan model)
+Description: Slotted dataclasses for a download plan, used by every stage (planner, checker,
+             journal, catalog, downloader, follow, storage budget, remote read) instead of
+             nested dicts:
+                 DownloadPlan.sat_prod_info  -> SatProdInfo
+                 DownloadPlan.slots[file_key] -> PlanSlot (.mini_summary / .file_s3 /
+                                                 .file_local / .folder_local)
+             'summary' and 'plan_download_self_info' stay plain dicts (free-form reports).
+             Keys a section does not know are kept in its 'extra' dict, so
+             from_dict() -> to_dict() is lossless for plans written by other versions.
+             from_dict() validates the plan against PLAN_SCHEMA_VERSION; to_binary() /
+             from_binary() are the fast codec (marshal of plain tuples, no text parsing)
+             behind the per-plan binary cache of fn04_plan_codec (whose stamp carries the
+             Python version: marshal's format is not stable across versions).
+"""
+
+# 1. SYSTEM LAYER
+try:
+    import marshal
+    from dataclasses import dataclass, field, fields
+    from operator import attrgetter
+except ImportError as e:
+    print(f"\n[SYSTEM LIB ERROR] - Critical libraries missing: {e}\n")
+    raise SystemExit(1)
+
+# v1: layout de code01_gen_plan_download (planes sin 'schema_version' en disco son v1).
+PLAN_SCHEMA_VERSION = 1
+BINARY_FORMAT = "goes-plan-bin"
+BINARY_VERSION = 1
+
+_FLAG_VALUES = (True, False, None)
+
+# =============================================================================
+# 1. SECTIONS
+# =============================================================================
+
+@dataclass(slots=True)
+class SlotSummary:
+    is_ready: bool | None = True
+    exists_online: bool | None = None
+    exists_local: bool | None = None
+    is_done: bool | None = None
+    time_last_mod: str | None = None
+    extra: dict = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class SlotS3:
+    bucket: str = ""
+    prefix_day: str = ""
+    prefix_hour: str = ""
+    init_name: str = ""
+    regex: str | None = None
+    file_name: str | None = None
+    exists_online: bool | None = None
+    file_size_mb: float | None = None
+    time_init_download: str | None = None
+    time_end_download: str | None = None
+    dif_time_sec: float | None = None
+    extra: dict = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class SlotLocal:
+    init_name: str = ""
+    regex: str | None = None
+    file_name: str | None = None
+    path_absolute: str | None = None
+    path_relative: str | None = None
+    exists_local: bool | None = None
+    file_size_mb: float | None = None
+    # Escritos por el checker (code02): tamaño real en disco, no el reportado por S3.
+    file_exists_local: bool | None = None
+    file_size_mb_local: float | None = None
+    extra: dict = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class SlotFolder:
+    path_relative: str | None = None
+    path_absolute: str | None = None
+    folder_exists_local: bool | None = None
+    extra: dict = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class SatProdInfo:
+    satellite: str = ""
+    sat_position: str = ""
+    product_id: str = ""
+    bucket_name: str = ""
+    date_julian: str = ""
+    total_files_one_day: int | None = None
+    prefix_day: str | None = None
+    time_window: dict | None = None
+    extra: dict = field(default_factory=dict)
+
+    @property
+    def year(self) -> str:
+        return self.date_julian[:4]
+
+    @property
+    def day(self) -> str:
+        return self.date_julian[4:]
+
+
+# Campos conocidos por sección (sin 'extra'), en el orden en que se escriben.
+_SECTION_FIELDS = {cls: tuple(f.name for f in fields(cls) if f.name != "extra")
+                   for cls in (SlotSummary, SlotS3, SlotLocal, SlotFolder, SatProdInfo)}
+_SECTION_GETTERS = {cls: attrgetter(*names) for cls, names in _SECTION_FIELDS.items()}
+
+# Claves obligatorias: sin ellas ningún stage puede ubicar el slot.
+_REQUIRED = {
+    SatProdInfo: ("satellite", "sat_position", "product_id", "bucket_name", "date_julian"),
+    SlotS3: ("bucket", "prefix_hour", "init_name"),
+    SlotLocal: ("init_name",),
+    SlotSummary: (),
+    SlotFolder: (),
+}
+
+
+def _section_from_dict(cls, data, where: str, errors: list):
+    if not isinstance(data, dict):
+        errors.append(f"{where} must be an object (got {type(data).__name__})")
+        return cls()
+    missing = [k for k in _REQUIRED[cls] if data.get(k) is None]
+    if missing:
+        errors.append(f"{where} is missing {missing}")
+    known = _SECTION_FIELDS[cls]
+    obj = cls(**{k: data[k] for k in known if k in data})
+    obj.extra = {k: v for k, v in data.items() if k not in known}
+    return obj
+
+
+def _section_to_dict(obj) -> dict:
+    out = dict(zip(_SECTION_FIELDS[type(obj)], _SECTION_GETTERS[type(obj)](obj)))
+    if obj.extra:
+        out.update(obj.extra)
+    return out
+
+
+def _section_to_row(obj) -> tuple:
+    # 'extra' solo viaja si tiene algo: miles de dicts vacíos duplican el costo de marshal.loads.
+    values = _SECTION_GETTERS[type(obj)](obj)
+    return values + (obj.extra,) if obj.extra else values
+
+# =============================================================================
+# 2. SLOT
+# =============================================================================
+
+@dataclass(slots=True)
+class PlanSlot:
+    file_key: str
+    pos_file: str | None = None
+    time_stamp: str = ""
+    mini_summary: SlotSummary = field(default_factory=SlotSummary)
+    file_s3: SlotS3 = field(default_factory=SlotS3)
+    file_local: SlotLocal = field(default_factory=SlotLocal)
+    folder_local: SlotFolder = field(default_factory=SlotFolder)
+    extra: dict = field(default_factory=dict)
+
+    @property
+    def hour(self) -> str:
+        return self.time_stamp[7:9]
+
+    @classmethod
+    def from_dict(cls, file_key: str, data: dict, errors: list):
+        where = f"download_inventory['{file_key}']"
+        if not isinstance(data, dict):
+            errors.append(f"{where} must be an object")
+            return cls(file_key)
+        ts = data.get("time_stamp")
+        if not isinstance(ts, str) or not ts.isdigit() or len(ts) < 7:
+            errors.append(f"{where}.time_stamp must be 'YYYYJJJ[HHMMSS]' (got {ts!r})")
+        slot = cls(
+            file_key, data.get("pos_file"), ts if isinstance(ts, str) else "",
+            _section_from_dict(SlotSummary, data.get("mini_summary", {}), f"{where}.mini_summary", errors),
+            _section_from_dict(SlotS3, data.get("file_s3"), f"{where}.file_s3", errors),
+            _section_from_dict(SlotLocal, data.get("file_local"), f"{where}.file_local", errors),
+            _section_from_dict(SlotFolder, data.get("folder_local", {}), f"{where}.folder_local", errors),
+            {k: v for k, v in data.items() if k not in _SLOT_KEYS},
+        )
+        mini = slot.mini_summary
+        for name in ("exists_online", "exists_local", "is_done"):
+            if getattr(mini, name) not in _FLAG_VALUES:
+                errors.append(f"{where}.mini_summary.{name} must be true/false/null")
+        return slot
+
+    def to_dict(self) -> dict:
+        out = {"pos_file": self.pos_file, "time_stamp": self.time_stamp,
+               "mini_summary": _section_to_dict(self.mini_summary), "file_s3": _section_to_dict(self.file_s3),
+               "file_local": _section_to_dict(self.file_local), "folder_local": _section_to_dict(self.folder_local)}
+        if self.extra:
+            out.update(self.extra)
+        return out
+
+    def to_row(self) -> tuple:
+        row = (self.file_key, self.pos_file, self.time_stamp,
+               _section_to_row(self.mini_summary), _section_to_row(self.file_s3),
+               _section_to_row(self.file_local), _section_to_row(self.folder_local))
+        return row + (self.extra,) if self.extra else row
+
+    @classmethod
+    def from_row(cls, row: tuple):
+        file_key, pos_file, ts, mini, s3, local, folder, *extra = row
+        return cls(file_key, pos_file, ts, SlotSummary(*mini), SlotS3(*s3), SlotLocal(*local),
+                   SlotFolder(*folder), *extra)
+
+
+_SLOT_KEYS = frozenset({"pos_file", "time_stamp", "mini_summary", "file_s3", "file_local", "folder_local"})
+
+# =============================================================================
+# 3. PLAN
+# =============================================================================
+
+_PLAN_KEYS = frozenset({"schema_version", "sat_prod_info", "summary", "plan_download_self_info", "download_inventory"})
+
+
+@dataclass(slots=True)
+class DownloadPlan:
+    sat_prod_info: SatProdInfo
+    slots: dict = field(default_factory=dict)            # {file_key: PlanSlot}, plan order
+    summary: dict = field(default_factory=dict)
+    self_info: dict = field(default_factory=dict)        # 'plan_download_self_info'
+    schema_version: int = PLAN_SCHEMA_VERSION
+    extra: dict = field(default_factory=dict)
+
+    def __len__(self):
+        return len(self.slots)
+
+    def items(self):
+        return self.slots.items()
+
+    # --- dict layout (disk / legacy callers) ---------------------------------
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """Legacy plan dict -> DownloadPlan. Raises ValueError listing what is wrong."""
+        ctx = "[fn06_plan_model.py - DownloadPlan.from_dict()]"
+        if isinstance(data, cls):
+            return data
+        if not isinstance(data, dict):
+            raise ValueError(f"{ctx} A plan must be a dictionary (got {type(data).__name__}).")
+        version = data.get("schema_version", 1)
+        if not isinstance(version, int) or version > PLAN_SCHEMA_VERSION:
+            raise ValueError(f"{ctx} Plan schema v{version} is newer than this reader (v{PLAN_SCHEMA_VERSION}).")
+
+        errors = []
+        inventory = data.get("download_inventory")
+        if not isinstance(inventory, dict):
+            errors.append("'download_inventory' is missing")
+            inventory = {}
+        plan = cls(
+            _section_from_dict(SatProdInfo, data.get("sat_prod_info"), "sat_prod_info", errors),
+            {key: PlanSlot.from_dict(key, item, errors) for key, item in inventory.items()},
+            dict(data.get("summary") or {}),
+            dict(data.get("plan_download_self_info") or {}),
+            PLAN_SCHEMA_VERSION,
+            {k: v for k, v in data.items() if k not in _PLAN_KEYS},
+        )
+        if errors:
+            more = f" (+{len(errors) - 5} more)" if len(errors) > 5 else ""
+            raise ValueError(f"{ctx} Invalid plan: {'; '.join(errors[:5])}{more}")
+        return plan
+
+    def to_dict(self) -> dict:
+        """DownloadPlan -> legacy plan dict (what fn04_plan_codec writes)."""
+        out = {"schema_version": self.schema_version,
+               "sat_prod_info": _section_to_dict(self.sat_prod_info),
+               "summary": self.summary,
+               "plan_download_self_info": self.self_info,
+               "download_inventory": {key: slot.to_dict() for key, slot in self.slots.items()}}
+        if self.extra:
+            out.update(self.extra)
+        return out
+
+    # --- binary codec ---------------------------------------------------------
+
+    def to_binary(self, stamp=None) -> bytes:
+        """marshal of plain tuples; 'stamp' identifies the text file it mirrors (fn04 cache)."""
+        head = (self.schema_version, _section_to_row(self.sat_prod_info), self.summary, self.self_info, self.extra)
+        rows = [slot.to_row() for slot in self.slots.values()]
+        return marshal.dumps((BINARY_FORMAT, BINARY_VERSION, stamp, head, rows))
+
+    @classmethod
+    def from_binary(cls, blob: bytes, stamp=None):
+        """
+        Inverse of to_binary(). Returns None when the blob is foreign, from another codec
+        version or (if given) does not carry the expected stamp.
+        """
+        try:
+            fmt, version, blob_stamp, head, rows = marshal.loads(blob)
+        except (EOFError, ValueError, TypeError):
+            return None
+        if fmt != BINARY_FORMAT or version != BINARY_VERSION or (stamp is not None and tuple(blob_stamp or ()) != tuple(stamp)):
+            return None
+        schema_version, info, summary, self_info, extra = head
+        slots = {}
+        for row in rows:
+            slot = PlanSlot.from_row(row)
+            slots[slot.file_key] = slot
+        return cls(SatProdInfo(*info), slots, summary, self_info, schema_version, extra)
+
+
+def as_plan_model(plan) -> DownloadPlan:
+    """DownloadPlan passes through; a legacy dict is validated and converted."""
+    return DownloadPlan.from_dict(plan)
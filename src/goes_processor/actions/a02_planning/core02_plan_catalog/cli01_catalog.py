@@ -0,0 +1,108 @@
+"""
+Path: src/goes_processor/actions/a02_planning/core02_plan_catalog/cli01_catalog.py
+Version: 0.1.0 (SQLite catalog of plans, S3 listings and local state)
+"""
+import click
+import time
+
+RED = "\033[91m"
+RESET = "\033[0m"
+
+try:
+    from goes_processor.actions.a02_planning.core02_plan_catalog.code01_catalog_queries import (
+        rebuild_catalog, query_completion, query_gaps, query_sizes, parse_catalog_date, catalog_exists
+    )
+except ImportError as e:
+    print(f"{RED}❌ Critical Import Error:{RESET} {e}")
+    rebuild_catalog = None
+
+
+def _filters(f):
+    f = click.option('--product', default=None, type=str, help='Product ID (e.g. ABI-L2-FDCF).')(f)
+    f = click.option('--sat-position', default=None, type=click.Choice(['east', 'west']), help='Orbital position.')(f)
+    f = click.option('--from', 'date_from', default=None, type=str, help="First day 'YYYY-DDD' (inclusive).")(f)
+    f = click.option('--to', 'date_to', default=None, type=str, help="Last day 'YYYY-DDD' (inclusive).")(f)
+    return f
+
+
+def _run(query, **kwargs):
+    """Common guard: engine available, catalog present, dates parsed, elapsed time."""
+    if rebuild_catalog is None:
+        click.echo(f"{RED}🚫 Logic engine (core02 catalog) is unavailable.{RESET}", err=True)
+        return None
+    if not catalog_exists():
+        click.echo(f"{RED}❌ No catalog yet. Run 'planning catalog sync' first.{RESET}", err=True)
+        return None
+    try:
+        kwargs["date_from"] = parse_catalog_date(kwargs.get("date_from"))
+        kwargs["date_to"] = parse_catalog_date(kwargs.get("date_to"))
+        t0 = time.perf_counter()
+        rows = query(**kwargs)
+    except ValueError as e:
+        click.echo(f"{RED}❌ {e}{RESET}", err=True)
+        return None
+    click.echo(f"⏱️  {len(rows)} rows in {(time.perf_counter() - t0) * 1000:.1f} ms")
+    return rows
+
+
+@click.group(name="catalog")
+def catalog_group():
+    """
+    Catálogo SQLite de planes, listados S3 y estado local (consultas por rango sin abrir JSONs).
+    """
+    pass
+
+
+@catalog_group.command(name="sync")
+def catalog_sync_command():
+    """Reconstruye el catálogo desde todos los planes de data_plan."""
+    if rebuild_catalog is None:
+        click.echo(f"{RED}🚫 Logic engine (core02 catalog) is unavailable.{RESET}", err=True)
+        return
+    stats = rebuild_catalog()
+    click.echo(f"🗂️  Catalog synced: {stats['plans']} plans | {stats['slots']} slots | "
+               f"{stats['dropped']} dropped | {stats['errors']} errors | {stats['sec']} s")
+
+
+@catalog_group.command(name="completion")
+@_filters
+@click.option('--by', default='product', type=click.Choice(['product', 'day']), help='Grouping level.')
+def catalog_completion_command(product, sat_position, date_from, date_to, by):
+    """Porcentaje de slots descargados por producto o por día."""
+    rows = _run(query_completion, product=product, sat_position=sat_position,
+                date_from=date_from, date_to=date_to, by=by)
+    for row in rows or []:
+        group = " | ".join(str(v) for v in row[:-4])
+        total, done, online, pct = row[-4:]
+        click.echo(f"   {group:<40} {done or 0:>7}/{total:<7} done ({pct:5.1f}%) | online {online or 0}")
+
+
+@catalog_group.command(name="gaps")
+@_filters
+@click.option('--hour', 'hours', multiple=True, type=int, help='Restrict to these UTC hours. Repeatable.')
+@click.option('--limit', default=50, type=int, help='Max runs to print (0 = all).')
+def catalog_gaps_command(product, sat_position, date_from, date_to, hours, limit):
+    """Huecos: slots no descargados, agrupados en tramos consecutivos."""
+    rows = _run(query_gaps, product=product, sat_position=sat_position,
+                date_from=date_from, date_to=date_to, hours=hours)
+    if rows is None:
+        return
+    shown = rows if limit <= 0 else rows[:limit]
+    for prod, pos, date_j, first, last, n in shown:
+        click.echo(f"   {prod:<16} {pos:<5} {date_j} | {first} -> {last} | {n} slots")
+    if len(shown) < len(rows):
+        click.echo(f"   ... and {len(rows) - len(shown)} more runs")
+
+
+@catalog_group.command(name="sizes")
+@_filters
+@click.option('--by', default='product', type=click.Choice(['product', 'day']), help='Grouping level.')
+def catalog_sizes_command(product, sat_position, date_from, date_to, by):
+    """Volumen local y en S3 por producto o por día."""
+    rows = _run(query_sizes, product=product, sat_position=sat_position,
+                date_from=date_from, date_to=date_to, by=by)
+    for row in rows or []:
+        group = " | ".join(str(v) for v in row[:-4])
+        n_local, mb_local, n_online, mb_online = row[-4:]
+        click.echo(f"   {group:<40} local {n_local or 0:>7} files {mb_local / 1024:8.2f} GB | "
+                   f"S3 {n_online or 0:>7} files {mb_online / 1024:8.2f} GB")
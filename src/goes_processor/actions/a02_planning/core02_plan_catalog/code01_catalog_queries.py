@@ -0,0 +1,169 @@
+"""
+Path: src/goes_processor/actions/a02_planning/core02_plan_catalog/code01_catalog_queries.py
+Version: 0.1.1 (SQLite catalog of plans, S3 listings and local state + typed plan model)
+Description: Rebuild of the catalog from the JSON plans and the range queries behind
+             'planning catalog ...': gaps, completion percentage and sizes.
+"""
+
+# 1. SYSTEM LAYER
+try:
+    import json
+    import time
+    from datetime import datetime
+except ImportError as e:
+    print(f"\n[SYSTEM LIB ERROR] - Critical libraries missing: {e}\n")
+    raise SystemExit(1)
+
+# 2. PROJECT LAYER
+try:
+    from goes_processor.SoT.goes_hardcoded_folders import get_my_path
+    from goes_processor.actions.a02_planning.core01_planner_download.fn02_plan_journal import (
+        apply_journal_record, get_plan_journal_path
+    )
+    from goes_processor.actions.a02_planning.core01_planner_download.fn04_plan_codec import load_plan_model
+    from goes_processor.actions.a02_planning.core02_plan_catalog.fn01_plan_catalog import (
+        open_catalog, get_catalog_path, _sync_plan_in
+    )
+except ImportError as e:
+    print(f"\n[PROJECT LIB ERROR] - Internal modules missing: {e}\n")
+    raise SystemExit(1)
+
+# =============================================================================
+# 1. FILTERS
+# =============================================================================
+
+def parse_catalog_date(raw):
+    """'2025-032' -> '2025032' (None passes through)."""
+    ctx = "[code01_catalog_queries.py - parse_catalog_date()]"
+    if raw is None:
+        return None
+    try:
+        return datetime.strptime(str(raw).strip(), "%Y-%j").strftime("%Y%j")
+    except ValueError:
+        raise ValueError(f"{ctx} Date must be YYYY-DDD (got '{raw}').") from None
+
+
+def _where(product=None, sat_position=None, date_from=None, date_to=None, alias="s"):
+    clauses, params = [], []
+    if product:
+        clauses.append(f"{alias}.product = ?"); params.append(product)
+    if sat_position:
+        clauses.append(f"{alias}.sat_position = ?"); params.append(sat_position)
+    if date_from:
+        clauses.append(f"{alias}.date_julian >= ?"); params.append(date_from)
+    if date_to:
+        clauses.append(f"{alias}.date_julian <= ?"); params.append(date_to)
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+# =============================================================================
+# 2. REBUILD
+# =============================================================================
+
+def _pending_journal_records(path_plan):
+    """Read-only view of a journal a running download has not folded yet."""
+    path_journal = get_plan_journal_path(path_plan)
+    if not path_journal.exists():
+        return []
+    records = []
+    with open(path_journal, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+
+def rebuild_catalog() -> dict:
+    """
+    Mirrors every data_plan/<year>/<day>/plan_01_download_*.json (plus pending journal receipts)
+    in one transaction; plans that disappeared from disk are dropped.
+    """
+    t0 = time.time()
+    paths = sorted(get_my_path("data_plan").glob("*/*/plan_01_download_*.json"))
+    conn = open_catalog()
+    stats = {"plans": 0, "slots": 0, "dropped": 0, "errors": 0}
+    try:
+        with conn:
+            for path_plan in paths:
+                try:
+                    plan = load_plan_model(path_plan)
+                    for record in _pending_journal_records(path_plan):
+                        apply_journal_record(plan, record)
+                    stats["slots"] += _sync_plan_in(conn, path_plan, plan)
+                    stats["plans"] += 1
+                except (OSError, ValueError, KeyError) as e:
+                    stats["errors"] += 1
+                    print(f"⚠️  [CATALOG] Skipping {path_plan.name}: {e}")
+            on_disk = {str(p.resolve()) for p in paths}
+            stale = [row[0] for row in conn.execute("SELECT path FROM plans") if row[0] not in on_disk]
+            conn.executemany("DELETE FROM plans WHERE path = ?", [(p,) for p in stale])
+            stats["dropped"] = len(stale)
+    finally:
+        conn.close()
+    stats["sec"] = round(time.time() - t0, 2)
+    return stats
+
+# =============================================================================
+# 3. QUERIES
+# =============================================================================
+
+def query_completion(product=None, sat_position=None, date_from=None, date_to=None, by="product"):
+    """[(group..., slots, done, online, pct_done)] grouped by product or by product + day."""
+    where, params = _where(product, sat_position, date_from, date_to)
+    group = "s.product, s.sat_position" + (", s.date_julian" if by == "day" else "")
+    sql = (f"SELECT {group}, COUNT(*), SUM(s.is_done = 1), SUM(s.exists_online = 1) "
+           f"FROM slots s{where} GROUP BY {group} ORDER BY {group}")
+    conn = open_catalog()
+    try:
+        rows = conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+    return [row + (round(100.0 * (row[-2] or 0) / row[-3], 1) if row[-3] else 0.0,) for row in rows]
+
+
+def query_gaps(product=None, sat_position=None, date_from=None, date_to=None, hours=None):
+    """
+    Slots not done, merged into runs of consecutive slots of the same plan:
+    [(product, sat_position, date_julian, first_time_stamp, last_time_stamp, n_slots)].
+    """
+    where, params = _where(product, sat_position, date_from, date_to)
+    where += (" AND " if where else " WHERE ") + "(s.is_done IS NULL OR s.is_done = 0)"
+    if hours:
+        where += f" AND s.hour IN ({','.join('?' * len(hours))})"
+        params += [int(h) for h in hours]
+    sql = (f"SELECT s.product, s.sat_position, s.date_julian, s.plan_id, s.slot_index, s.time_stamp "
+           f"FROM slots s{where} ORDER BY s.product, s.sat_position, s.date_julian, s.plan_id, s.slot_index")
+    conn = open_catalog()
+    try:
+        rows = conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+    runs = []
+    for prod, pos, date_j, plan_id, idx, ts in rows:
+        last = runs[-1] if runs else None
+        if last and last[6] == plan_id and last[7] == idx - 1:
+            last[4], last[5], last[7] = ts, last[5] + 1, idx
+        else:
+            runs.append([prod, pos, date_j, ts, ts, 1, plan_id, idx])
+    return [tuple(r[:6]) for r in runs]
+
+
+def query_sizes(product=None, sat_position=None, date_from=None, date_to=None, by="product"):
+    """[(group..., files_local, mb_local, files_online, mb_online)]."""
+    where, params = _where(product, sat_position, date_from, date_to)
+    group = "s.product, s.sat_position" + (", s.date_julian" if by == "day" else "")
+    sql = (f"SELECT {group}, SUM(s.exists_local = 1), "
+           f"ROUND(COALESCE(SUM(CASE WHEN s.exists_local = 1 THEN s.local_size_mb END), 0), 2), "
+           f"SUM(s.exists_online = 1), ROUND(COALESCE(SUM(s.s3_size_mb), 0), 2) "
+           f"FROM slots s{where} GROUP BY {group} ORDER BY {group}")
+    conn = open_catalog()
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+
+def catalog_exists() -> bool:
+    return get_catalog_path().exists()
@@ -0,0 +1,217 @@
+"""
+Path: src/goes_processor/actions/a02_planning/core02_plan_catalog/fn01_plan_catalog.py
+Version: 0.1.1 (SQLite catalog of plans, S3 listings and local state + typed plan model)
+Description: One indexed SQLite file (data_plan/catalog_plans.sqlite3) that mirrors:
+             - plans     : one row per plan file (position, satellite, product, day).
+             - slots     : one row per planned slot with its online/local/done state and sizes.
+             - s3_objects: keys seen in S3 listings (from the manifest cache).
+             Writers (planner, journal compaction, checker, manifest) call the sync_* helpers;
+             each call is one transaction. The JSON plans stay the source of truth: a broken
+             or missing catalog is rebuilt with 'planning catalog sync'.
+"""
+
+# 1. SYSTEM LAYER
+try:
+    import sqlite3
+    import time
+    from pathlib import Path
+except ImportError as e:
+    print(f"\n[SYSTEM LIB ERROR] - Critical libraries missing: {e}\n")
+    raise SystemExit(1)
+
+# 2. PROJECT LAYER
+try:
+    from goes_processor.SoT.goes_hardcoded_folders import get_my_path
+except ImportError as e:
+    print(f"\n[PROJECT LIB ERROR] - Internal modules missing: {e}\n")
+    raise SystemExit(1)
+
+CATALOG_NAME = "catalog_plans.sqlite3"
+CATALOG_VERSION = 1
+MB = 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+
+CREATE TABLE IF NOT EXISTS plans (
+    plan_id      INTEGER PRIMARY KEY,
+    path         TEXT UNIQUE NOT NULL,
+    sat_position TEXT NOT NULL,
+    satellite    TEXT NOT NULL,
+    product      TEXT NOT NULL,
+    bucket       TEXT NOT NULL,
+    date_julian  TEXT NOT NULL,
+    n_slots      INTEGER NOT NULL,
+    updated_at   REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS slots (
+    plan_id        INTEGER NOT NULL REFERENCES plans(plan_id) ON DELETE CASCADE,
+    file_key       TEXT NOT NULL,
+    slot_index     INTEGER NOT NULL,
+    sat_position   TEXT NOT NULL,
+    satellite      TEXT NOT NULL,
+    product        TEXT NOT NULL,
+    date_julian    TEXT NOT NULL,
+    time_stamp     TEXT NOT NULL,
+    hour           INTEGER NOT NULL,
+    exists_online  INTEGER,
+    exists_local   INTEGER,
+    is_done        INTEGER,
+    s3_file_name   TEXT,
+    s3_size_mb     REAL,
+    local_size_mb  REAL,
+    PRIMARY KEY (plan_id, file_key)
+);
+
+CREATE INDEX IF NOT EXISTS ix_slots_product_time ON slots (product, sat_position, time_stamp);
+CREATE INDEX IF NOT EXISTS ix_slots_satellite_time ON slots (satellite, time_stamp);
+CREATE INDEX IF NOT EXISTS ix_slots_status ON slots (product, is_done, date_julian);
+CREATE INDEX IF NOT EXISTS ix_plans_day ON plans (product, sat_position, date_julian);
+
+CREATE TABLE IF NOT EXISTS s3_objects (
+    bucket     TEXT NOT NULL,
+    key        TEXT NOT NULL,
+    product    TEXT NOT NULL,
+    start      TEXT NOT NULL,
+    size       INTEGER,
+    etag       TEXT,
+    listed_at  REAL,
+    PRIMARY KEY (bucket, key)
+);
+
+CREATE INDEX IF NOT EXISTS ix_s3_product_start ON s3_objects (product, start);
+"""
+
+# =============================================================================
+# CONNECTION
+# =============================================================================
+
+def get_catalog_path() -> Path:
+    return get_my_path("data_plan") / CATALOG_NAME
+
+
+def open_catalog(path=None) -> sqlite3.Connection:
+    """WAL + busy timeout: the downloader's workers and a CLI query can share the file."""
+    conn = sqlite3.connect(str(path or get_catalog_path()), timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.executescript(_SCHEMA)
+    conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('version', ?)", (str(CATALOG_VERSION),))
+    return conn
+
+# =============================================================================
+# SYNC (one transaction per call)
+# =============================================================================
+
+def _flag(value):
+    return None if value is None else int(bool(value))
+
+
+def _slot_rows(plan_id: int, plan):
+    info = plan.sat_prod_info
+    sat_position, satellite = info.sat_position, info.satellite
+    product, date_julian = info.product_id, info.date_julian
+    for file_key, slot in plan.slots.items():
+        mini, s3, local = slot.mini_summary, slot.file_s3, slot.file_local
+        exists_local = mini.exists_local
+        if exists_local is None:
+            exists_local = local.exists_local if local.exists_local is not None else local.file_exists_local
+        exists_online = mini.exists_online if mini.exists_online is not None else s3.exists_online
+        local_mb = local.file_size_mb_local if local.file_size_mb_local is not None else local.file_size_mb
+        ts = slot.time_stamp
+        yield (plan_id, file_key, int(file_key[4:]) if file_key[4:].isdigit() else 0,
+               sat_position, satellite, product, date_julian, ts, int(ts[7:9] or 0),
+               _flag(exists_online), _flag(exists_local),
+               _flag(mini.is_done), s3.file_name, s3.file_size_mb, local_mb)
+
+
+def _sync_plan_in(conn, path_plan, plan):
+    """plan: fn06 DownloadPlan."""
+    info = plan.sat_prod_info
+    conn.execute(
+        "INSERT INTO plans (path, sat_position, satellite, product, bucket, date_julian, n_slots, updated_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT(path) DO UPDATE SET sat_position=excluded.sat_position, satellite=excluded.satellite, "
+        "product=excluded.product, bucket=excluded.bucket, date_julian=excluded.date_julian, "
+        "n_slots=excluded.n_slots, updated_at=excluded.updated_at",
+        (str(Path(path_plan).resolve()), info.sat_position, info.satellite, info.product_id,
+         info.bucket_name, info.date_julian, len(plan.slots), time.time()))
+    plan_id = conn.execute("SELECT plan_id FROM plans WHERE path = ?", (str(Path(path_plan).resolve()),)).fetchone()[0]
+    conn.execute("DELETE FROM slots WHERE plan_id = ?", (plan_id,))
+    conn.executemany("INSERT INTO slots VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                     _slot_rows(plan_id, plan))
+    return len(plan.slots)
+
+
+def sync_plan(path_plan, plan, conn=None) -> int:
+    """Replaces the catalog rows of one plan (planner, journal compaction, checker)."""
+    own = conn is None
+    conn = conn or open_catalog()
+    try:
+        with conn:
+            return _sync_plan_in(conn, path_plan, plan)
+    finally:
+        if own:
+            conn.close()
+
+
+def sync_plans_safe(items):
+    """
+    [(path_plan, plan), ...] in one transaction. Never raises: the JSON plans were already
+    written, the catalog can catch up later with 'planning catalog sync'.
+    """
+    items = list(items)
+    if not items:
+        return
+    try:
+        conn = open_catalog()
+        try:
+            with conn:
+                for path_plan, plan in items:
+                    _sync_plan_in(conn, path_plan, plan)
+        finally:
+            conn.close()
+    except (sqlite3.Error, KeyError, OSError, ValueError) as e:
+        print(f"⚠️  [CATALOG] Could not sync {len(items)} plan(s): {e} (run 'planning catalog sync')")
+
+
+def sync_plan_safe(path_plan, plan):
+    sync_plans_safe([(path_plan, plan)])
+
+
+def drop_plan(path_plan, conn=None):
+    own = conn is None
+    conn = conn or open_catalog()
+    try:
+        with conn:
+            conn.execute("DELETE FROM plans WHERE path = ?", (str(Path(path_plan).resolve()),))
+    finally:
+        if own:
+            conn.close()
+
+
+def sync_s3_objects_safe(bucket: str, product: str, objects, listed_at=None):
+    """Mirrors listing results ([{'Key', 'Size', 'ETag'}]) in s3_objects. Never raises."""
+    listed_at = time.time() if listed_at is None else listed_at
+    rows = []
+    for obj in objects:
+        name = obj["Key"].rsplit("/", 1)[-1]
+        pos = name.find("_s")
+        start = name[pos + 2:pos + 16] if pos >= 0 else ""
+        rows.append((bucket, obj["Key"], product, start, obj.get("Size"),
+                     str(obj.get("ETag") or "").strip('"') or None, listed_at))
+    if not rows:
+        return
+    try:
+        conn = open_catalog()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT INTO s3_objects VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT(bucket, key) DO UPDATE SET "
+                    "size=excluded.size, etag=excluded.etag, listed_at=excluded.listed_at", rows)
+        finally:
+            conn.close()
+    except (sqlite3.Error, OSError, ValueError) as e:
+        print(f"⚠️  [CATALOG] Could not record {len(rows)} S3 objects: {e}")
@@ -1,20 +1,21 @@
 """
 Path: src/goes_processor/actions/a03_download/a03_download_cli.py
 Description: Action-level orchestrator for data acquisition.
+             Subcommands are imported on demand (LazyGroup): a cron 'follow' run does not
+             load the remote-read or storage-budget engines.
 """
 import click
-import sys
 
-try:
-    from goes_processor.actions.a03_download.core01_download_from_s3.cli01_download_s3_engine import download_s3_command
-except ImportError as e:
-    print(f"❌ Error importing download-s3: {e}")
-    download_s3_command = None
+from goes_processor.utils.cli_lazy_group import LazyGroup
 
-@click.group(name="download")
+DOWNLOAD_COMMANDS = {
+    "run-download-s3": "goes_processor.actions.a03_download.core01_download_from_s3.cli01_download_s3_engine:download_s3_command",
+    "follow": "goes_processor.actions.a03_download.core02_follow_s3.cli01_follow_s3:follow_command",
+    "run-remote-read": "goes_processor.actions.a03_download.core03_remote_read_s3.cli01_remote_read:remote_read_command",
+    "storage-budget": "goes_processor.actions.a03_download.core04_storage_budget.cli01_storage_budget:storage_budget_command",
+}
+
+@click.group(name="download", cls=LazyGroup, lazy_subcommands=DOWNLOAD_COMMANDS)
 def download_group():
     """Actions for satellite data acquisition. Action ID: a03"""
     pass
-
-if download_s3_command:
-    download_group.add_command(download_s3_command)
@@ -1,6 +1,7 @@
 """
 Path: src/goes_processor/actions/a03_download/core01_download_from_s3/cli01_download_s3_engine.py
-Version: 1.1.2 (Fixed Imports for goes_prod.py)
+Version: 1.2.5 (Global scheduler + Hour-sharded listing + Session metrics + Adaptive concurrency + Retries
+              + Sub-day time windows)
 """
 import click
 import sys
@@ -14,15 +15,22 @@ RESET = "\033[0m"
 # --- IMPORTS SINCRONIZADOS ---
 try:
     from .code01_download_s3_engine import execute_s3_download
+    from .code02_download_s3_scheduler import execute_s3_download_scheduled
+    from .fn04_session_dispatcher import parse_hours_filter
+    from goes_processor.actions.a02_planning.core01_planner_download.fn03_time_window import parse_time_window
     # Importamos la tupla pública de tu SoT
     from goes_processor.SoT.goes_prod import AVAILABLE_GOES_PRODUCTS
 except ImportError:
     try:
         from goes_processor.actions.a03_download.core01_download_from_s3.code01_download_s3_engine import execute_s3_download
+        from goes_processor.actions.a03_download.core01_download_from_s3.code02_download_s3_scheduler import execute_s3_download_scheduled
+        from goes_processor.actions.a03_download.core01_download_from_s3.fn04_session_dispatcher import parse_hours_filter
+        from goes_processor.actions.a02_planning.core01_planner_download.fn03_time_window import parse_time_window
         from goes_processor.SoT.goes_prod import AVAILABLE_GOES_PRODUCTS
     except ImportError as e:
         print(f"{RED}❌ Critical Import Error:{RESET} {e}")
         execute_s3_download = None
+        execute_s3_download_scheduled = None
         AVAILABLE_GOES_PRODUCTS = None
 
 @click.command(name="run-download-s3")
@@ -31,8 +39,44 @@ except ImportError:
 @click.option('--year', required=True, type=int)
 @click.option('--day', required=True, type=str)
 @click.option('--overwrite', required=True, type=bool)
-@click.option('--threads', default=4, type=int)
-def download_s3_command(sat_position, product, year, day, threads, overwrite):
+@click.option('--threads', default=4, type=int, help='Download workers (also sizes the pooled S3 connections).')
+@click.option('--match-tolerance', default=None, type=float,
+              help='Seconds between nominal slot and real start time for nearest-time matching. '
+                   'Default: per-product value from the SoT; 0 = exact prefix only.')
+@click.option('--compact-every', default=500, type=int,
+              help='Fold the plan journal into the plan JSON every N receipts.')
+@click.option('--transfer-mode', default='auto', type=click.Choice(['auto', 'single', 'ranged']),
+              help="'ranged' splits each object into parallel byte ranges with resume; 'auto' only for large files.")
+@click.option('--part-size-mb', default=8.0, type=float, help='Byte-range size for ranged transfers (MB).')
+@click.option('--part-threads', default=4, type=int, help='Parallel ranges per file in ranged transfers.')
+@click.option('--schedule', default='global', type=click.Choice(['global', 'serial']),
+              help="'global' shares one worker pool across all requested products; 'serial' runs them one after another.")
+@click.option('--weights', default=None, type=str,
+              help="Fair-share weights per product for the global scheduler, e.g. 'GLM-L2-LCFA=3,ABI-L2-FDCF=2'.")
+@click.option('--hours', default=None, type=str,
+              help="Only these hours (e.g. '00,05,12-14'). Default: every hour in the plan.")
+@click.option('--use-manifest', default=True, type=bool,
+              help='Serve S3 listings from the local manifest cache (data_manifest) when fresh.')
+@click.option('--manifest-ttl', default=600, type=float,
+              help='Seconds before a still-open hour in the manifest is refreshed (StartAfter). Closed hours never expire.')
+@click.option('--metrics', 'metrics_format', default='json', type=click.Choice(['json', 'csv', 'none']),
+              help='Per-session throughput/latency report written next to the plan (JSON summary+rows or CSV rows).')
+@click.option('--adaptive', is_flag=True, default=False,
+              help='AIMD concurrency: start at --threads, grow while throughput improves, back off on errors/latency spikes.')
+@click.option('--min-threads', default=1, type=int, help='Adaptive floor (workers).')
+@click.option('--max-threads', default=16, type=int, help='Adaptive ceiling (workers).')
+@click.option('--retries', default=3, type=int, help='Retries per transfer (exponential backoff with jitter).')
+@click.option('--retry-backoff', default=1.0, type=float, help='Base backoff in seconds (doubles per retry, capped at 30 s).')
+@click.option('--requeue', default=1, type=int,
+              help='Times a file that still fails (or fails verification) is re-queued within the same session.')
+@click.option('--start-time', default=None, type=str,
+              help="Only slots from this time (inclusive): 'HH', 'HH:MM', 'YYYY-MM-DD_HH:MM' or 'YYYYJJJHHMM'.")
+@click.option('--end-time', default=None, type=str, help="Only slots before this time (exclusive), same forms.")
+@click.option('--slots', default=None, type=str, help="Explicit slot list, e.g. '11:00,11:10,12:30'.")
+def download_s3_command(sat_position, product, year, day, threads, overwrite, match_tolerance, compact_every,
+                        transfer_mode, part_size_mb, part_threads, schedule, weights, hours, use_manifest, manifest_ttl,
+                        metrics_format, adaptive, min_threads, max_threads, retries, retry_backoff, requeue,
+                        start_time, end_time, slots):
     """
     Ejecuta la descarga usando los planes JSON. Soporta --product ALL.
     """
@@ -51,16 +95,40 @@ def download_s3_command(sat_position, product, year, day, threads, overwrite):
     else:
         products_to_process = [product]
 
+    try:
+        hours_filter = parse_hours_filter(hours)
+        time_window = parse_time_window(start_time, end_time, slots)
+    except ValueError as e:
+        click.echo(f"{RED}❌ {e}{RESET}", err=True)
+        return
+
     # 2. INFO INICIAL
     status_msg = f"{YELLOW}FORCING OVERWRITE{RESET}" if overwrite else f"{GREEN}SKIP IF EXISTS{RESET}"
     click.echo(f"🚀 Initializing download session for {year}-{day}")
     click.echo(f"🛠️  Mode: {status_msg} | Workers: {threads}\n")
 
-    # 3. EJECUCIÓN SERIAL POR PRODUCTO (INTERNO MULTI-THREAD)
+    # 3A. EJECUCIÓN GLOBAL: un único pool de workers para todos los productos
+    if schedule == "global" and len(products_to_process) > 1 and execute_s3_download_scheduled:
+        try:
+            execute_s3_download_scheduled(sat_position, products_to_process, year, day, threads, overwrite,
+                                          match_tolerance, compact_every, transfer_mode, part_size_mb,
+                                          part_threads, weights, hours_filter, use_manifest, manifest_ttl,
+                                          metrics_format, adaptive, min_threads, max_threads, retries,
+                                          retry_backoff, requeue, time_window)
+        except Exception as e:
+            click.echo(f"{RED}💥 Global session failed:{RESET} {e}", err=True)
+            return
+        click.echo(f"\n🏁 {GREEN}Full session completed successfully.{RESET}")
+        return
+
+    # 3B. EJECUCIÓN SERIAL POR PRODUCTO (INTERNO MULTI-THREAD)
     for current_prod in products_to_process:
         try:
             # El motor (code01) ya tiene los checks verdes y el manejo de errores
-            execute_s3_download(sat_position, current_prod, year, day, threads, overwrite)
+            execute_s3_download(sat_position, current_prod, year, day, threads, overwrite, match_tolerance, compact_every,
+                                transfer_mode, part_size_mb, part_threads, hours_filter, use_manifest, manifest_ttl,
+                                metrics_format, adaptive, min_threads, max_threads, retries, retry_backoff, requeue,
+                                time_window)
         except Exception as e:
             click.echo(f"{RED}💥 Failed to process {current_prod}:{RESET} {e}", err=True)
             continue
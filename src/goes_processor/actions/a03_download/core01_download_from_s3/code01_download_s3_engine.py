@@ -1,23 +1,36 @@
 """
 Path: src/goes_processor/actions/a03_download/core01_download_from_s3/code01_download_s3_engine.py
-Version: 1.0.8 (Clean Exit + Green Checks + Sys Control)
+Version: 1.2.11 (Pooled clients + Hour-sharded indexed listing + S3 manifest + Plan journal + Ranged transfers
+              + Session metrics + Adaptive concurrency + Retries with verified streaming + Storage ledger
+              + Tolerance-based slot matching + Typed plan model)
 """
 
-import json
-import boto3
+import hashlib
 import time
 import threading
 import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from botocore import UNSIGNED
-from botocore.config import Config
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
 from goes_processor.SoT.goes_sat import get_goes_id_by_julian_date
 from goes_processor.actions.a02_planning.core01_planner_download.fn01_file_name_plan_download import get_plan_download_file_path
-
-json_lock = threading.Lock()
+from goes_processor.actions.a02_planning.core01_planner_download.fn02_plan_journal import PlanJournal
+from goes_processor.actions.a02_planning.core01_planner_download.fn04_plan_codec import load_plan_model
+from goes_processor.actions.a03_download.core01_download_from_s3.fn01_s3_client_pool import S3ClientPool
+from goes_processor.actions.a03_download.core01_download_from_s3.fn02_s3_listing_index import S3ListingIndex
+from goes_processor.actions.a03_download.core01_download_from_s3.fn03_ranged_transfer import (
+    RangedTransfer, use_ranged_transfer, DEFAULT_PART_SIZE_MB, DEFAULT_PART_THREADS, MB
+)
+from goes_processor.actions.a03_download.core01_download_from_s3.fn04_session_dispatcher import run_session
+from goes_processor.actions.a03_download.core01_download_from_s3.fn05_s3_manifest_cache import S3ManifestCache, DEFAULT_TTL_SEC
+from goes_processor.actions.a03_download.core01_download_from_s3.fn06_session_metrics import SessionMetrics
+from goes_processor.actions.a03_download.core01_download_from_s3.fn07_adaptive_concurrency import AimdController
+from goes_processor.actions.a03_download.core01_download_from_s3.fn08_transfer_integrity import (
+    verify_transfer, backoff_delay, is_retryable, DEFAULT_RETRIES, DEFAULT_BACKOFF_SEC
+)
+from goes_processor.actions.a03_download.core01_download_from_s3.fn09_slot_matcher import resolve_match_tolerance
+from goes_processor.actions.a03_download.core04_storage_budget.fn01_storage_ledger import record_usage
 
 # --- COLORS ---
 GREEN = "\033[92m"
@@ -27,10 +40,10 @@ RESET = "\033[0m"
 # 1. ATOMIC DOWNLOAD TASK
 # =============================================================================
 
-def download_task(i, total, file_key, info, all_objects, bucket, path_plan, overwrite):
+def download_task(i, total, file_key, info, listing_index, bucket, journal, overwrite, client_pool, match_tolerance=0, transfer_opts=None):
     try:
-        search_pattern = info["file_local"]["init_name"]
-        local_folder = Path(info["folder_local"]["path_absolute"])
+        search_pattern = info.file_local.init_name
+        local_folder = Path(info.folder_local.path_absolute)
         # --- Dynamic PADDING ---
         width = len(str(total))
         progress = f"[{i:0{width}d}/{total:0{width}d}]"
@@ -39,13 +52,10 @@ def download_task(i, total, file_key, info, all_objects, bucket, path_plan, over
         if not local_folder.exists():
             local_folder.mkdir(parents=True, exist_ok=True)
 
-        session = boto3.session.Session()
-        s3_client = session.client('s3', config=Config(signature_version=UNSIGNED))
-
-        found_obj = next((obj for obj in all_objects if search_pattern in obj['Key']), None)
+        found_obj = listing_index.find(search_pattern, tolerance_sec=match_tolerance)
         if not found_obj:
-            _update_json_v108(path_plan, file_key, exists_online=False)
-            return {"status": "NOT_FOUND", "size_mb": 0}
+            journal.append(file_key, exists_online=False)
+            return {"status": "NOT_FOUND", "size_mb": 0, "file_name": search_pattern}
 
         file_name = Path(found_obj['Key']).name
         s3_size = found_obj['Size']
@@ -55,14 +65,15 @@ def download_task(i, total, file_key, info, all_objects, bucket, path_plan, over
         if final_path.exists() and not overwrite:
             if final_path.stat().st_size == s3_size:
                 print(f"{progress} ✅ {GREEN}[ALREADY LOCAL]{RESET} {file_name}")
-                _update_json_v108(path_plan, file_key, exists_online=True)
-                return {"status": "SKIPPED", "size_mb": 0}
+                record_usage("touch", final_path, s3_size)
+                journal.append(file_key, exists_online=True)
+                return {"status": "SKIPPED", "size_mb": 0, "file_name": file_name}
 
         prefix = "♻️  [OVERWRITE]" if (final_path.exists() and overwrite) else "📥 [DOWNLOADING]"
         print(f"{progress} {prefix} {file_name} ({size_mb} MB)...")
         
-        receipt = _execute_transfer_v108(s3_client, bucket, found_obj['Key'], local_folder, s3_size)
-        _update_json_v108(path_plan, file_key, exists_online=True, receipt=receipt)
+        receipt = _execute_transfer_v108(client_pool, bucket, found_obj, local_folder, transfer_opts or {})
+        journal.append(file_key, exists_online=True, receipt=receipt)
 
         if "SUCCESS" in receipt["status"]:
             print(f"{progress} ✅ {GREEN}[SUCCESS]{RESET} {file_name} confirmed.")
@@ -73,87 +84,234 @@ def download_task(i, total, file_key, info, all_objects, bucket, path_plan, over
     except KeyboardInterrupt:
         return None
 
-def _execute_transfer_v108(s3_client, bucket, remote_key, local_folder, s3_size):
+def _stream_single_get(client_pool, bucket, remote_key, temp_path):
+    """One GET streamed to disk; the MD5 is computed on the same pass. Returns (bytes, md5_hex)."""
+    md5 = hashlib.md5()
+    written = 0
+    with client_pool.lease() as s3_client:
+        body = s3_client.get_object(Bucket=bucket, Key=remote_key)["Body"]
+        try:
+            with open(temp_path, "wb") as f:
+                while True:
+                    chunk = body.read(MB)
+                    if not chunk:
+                        break
+                    md5.update(chunk)
+                    f.write(chunk)
+                    written += len(chunk)
+        finally:
+            body.close()
+    return written, md5.hexdigest()
+
+def _execute_transfer_v108(client_pool, bucket, s3_obj, local_folder, transfer_opts):
+    remote_key, s3_size = s3_obj['Key'], s3_obj['Size']
     real_file_name = Path(remote_key).name
     final_path = local_folder / real_file_name
     temp_path = final_path.with_suffix(f".tmp.{threading.get_ident()}") # Evita colisión de hilos
-    
+
+    mode = transfer_opts.get("mode", "auto")
+    part_size_mb = transfer_opts.get("part_size_mb", DEFAULT_PART_SIZE_MB)
+    retries = max(0, int(transfer_opts.get("retries", DEFAULT_RETRIES)))
+    backoff_sec = transfer_opts.get("backoff_sec", DEFAULT_BACKOFF_SEC)
+    ranged = use_ranged_transfer(mode, s3_size, part_size_mb * MB)
+
     receipt = {"status": "PENDING", "file_name": real_file_name, "size_mb": round(s3_size/(1024*1024), 2),
-               "t_start": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "t_end": None, "t_diff": None}
+               "t_start": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "t_end": None, "t_diff": None,
+               "mode": "ranged" if ranged else "single", "resumed_mb": 0, "bytes": 0, "retries": 0,
+               "verified": None}
 
-    try:
-        t0 = time.time()
-        s3_client.download_file(bucket, remote_key, str(temp_path))
-        t1 = time.time()
-        temp_path.rename(final_path)
-        receipt.update({"status": "SUCCESS", "t_end": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "t_diff": round(t1 - t0, 2)})
-    except Exception as e:
-        receipt["status"] = f"ERROR: {str(e)}"
-        if temp_path.exists(): temp_path.unlink()
+    t0 = time.time()
+    resumed_bytes = None
+    for attempt in range(retries + 1):
+        try:
+            if ranged:
+                # El .part se conserva ante errores de red: el próximo intento sólo baja los rangos faltantes.
+                transfer = RangedTransfer(client_pool, bucket, remote_key, final_path, s3_size, etag=s3_obj.get('ETag'),
+                                          part_size_mb=part_size_mb,
+                                          part_threads=transfer_opts.get("part_threads", DEFAULT_PART_THREADS))
+                transfer.run()
+                verified = transfer.verified
+                if resumed_bytes is None: resumed_bytes = transfer.resumed_bytes
+            else:
+                written, md5_hex = _stream_single_get(client_pool, bucket, remote_key, temp_path)
+                verified = verify_transfer(s3_size, written, etag=s3_obj.get('ETag'), whole_md5=md5_hex)
+                temp_path.rename(final_path)
+            resumed_bytes = resumed_bytes or 0
+            receipt.update({"status": "SUCCESS", "t_end": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                            "t_diff": round(time.time() - t0, 3), "bytes": s3_size - resumed_bytes,
+                            "resumed_mb": round(resumed_bytes / MB, 2), "verified": verified})
+            record_usage("add", final_path, s3_size)
+            break
+        except Exception as e:
+            if temp_path.exists(): temp_path.unlink()
+            receipt["status"] = f"ERROR: {str(e)}"
+            if attempt == retries or not is_retryable(e):
+                break
+            receipt["retries"] += 1
+            delay = backoff_delay(attempt, backoff_sec)
+            print(f"🔁 [RETRY {attempt + 1}/{retries}] {real_file_name} in {delay:.1f}s | {e}")
+            time.sleep(delay)
     return receipt
 
-def _update_json_v108(path_plan, file_key, exists_online, receipt=None):
-    with json_lock:
-        try:
-            with open(path_plan, 'r') as f: plan = json.load(f)
-            item = plan["download_inventory"][file_key]
-            item["mini_summary"]["exists_online"] = exists_online
-            if receipt and "SUCCESS" in receipt["status"]:
-                item["mini_summary"].update({"is_done": True, "exists_local": True, "time_last_mod": receipt["t_end"]})
-                item["file_local"].update({"exists_local": True, "file_size_mb": receipt["size_mb"]})
-            with open(path_plan, 'w') as f: json.dump(plan, f, indent=4)
-        except: pass
+# =============================================================================
+# 2. SESSION BUILDING BLOCKS (shared with code02_download_s3_scheduler.py)
+# =============================================================================
+
+def build_transfer_opts(transfer_mode="auto", part_size_mb=DEFAULT_PART_SIZE_MB, part_threads=DEFAULT_PART_THREADS,
+                        retries=DEFAULT_RETRIES, backoff_sec=DEFAULT_BACKOFF_SEC):
+    """Options of _execute_transfer_v108, one source for run-download-s3, the scheduler and follow."""
+    return {"mode": transfer_mode, "part_size_mb": part_size_mb, "part_threads": part_threads,
+            "retries": retries, "backoff_sec": backoff_sec}
+
+def build_client_pool(threads, transfer_mode="auto", part_threads=DEFAULT_PART_THREADS):
+    # Cada worker puede abrir hasta part_threads rangos en paralelo; los clientes son compartidos,
+    # así que cada uno dimensiona su pool de sockets para todas las conexiones.
+    connections = threads * (part_threads if transfer_mode != "single" else 1)
+    return S3ClientPool(connections, max_clients=min(threads, 4))
+
+def open_product_job(sat_position, product, year, day, client_pool, compact_every=500,
+                     use_manifest=True, manifest_ttl=DEFAULT_TTL_SEC, match_tolerance=None):
+    """
+    Loads plan + journal (+ local S3 manifest) for one product. Returns None if there is no plan.
+    The listing index starts empty: fn04.run_session fills it hour by hour and assigns each
+    hour's slots by nearest start time within 'match_tolerance' (None = product default).
+    """
+    sat_id = get_goes_id_by_julian_date(str(year), str(day), sat_position=sat_position)
+    path_plan = get_plan_download_file_path(str(year), str(day), sat_id, sat_position, product)
+
+    if not path_plan.exists():
+        print(f"⚠️  [NO PLAN] {product}: {path_plan.name} not found. Run 'planning gen-plan-download' first.")
+        return None
+
+    journal = PlanJournal(path_plan, compact_every=compact_every).recover()
+    plan_data = load_plan_model(path_plan)
+    window = plan_data.sat_prod_info.time_window
+    if window:
+        # Un plan parcial ocupa la ruta del plan del día: se avisa en vez de tomarlo como el día completo.
+        print(f"🕒 [PARTIAL PLAN] {product}: plan covers only {window.get('label') or 'a sub-day window'} "
+              f"({len(plan_data)} slots). Regenerate it with --overwrite True for the full day.")
+
+    return {
+        "product": product,
+        "path_plan": path_plan,
+        "journal": journal,
+        "inventory": plan_data.slots,
+        "bucket": plan_data.sat_prod_info.bucket_name,
+        "client_pool": client_pool,
+        "listing_index": S3ListingIndex(),
+        "manifest": S3ManifestCache.from_plan(plan_data, ttl_sec=manifest_ttl) if use_manifest else None,
+        "match_tolerance": resolve_match_tolerance(product, match_tolerance),
+        "slot_match": {"assigned": 0, "shifted": 0, "missing": 0, "unmatched": 0, "duplicates": 0},
+    }
+
+def summarize_results(results):
+    ok = [r for r in results if r and r["status"] == "SUCCESS"]
+    return {
+        "mb_total": round(sum(r["size_mb"] - r.get("resumed_mb", 0) for r in ok), 2),
+        "mb_resumed": round(sum(r.get("resumed_mb", 0) for r in ok), 2),
+        "files_ok": sum(1 for r in results if r and r["status"] in ["SUCCESS", "SKIPPED"]),
+        "files_failed": sum(1 for r in results if r and str(r["status"]).startswith("ERROR")),
+        "retries": sum(r.get("retries", 0) for r in results if r),
+    }
+
+def build_concurrency(threads, adaptive=False, min_threads=1, max_threads=16):
+    """
+    Returns (pool_size, controller). Fixed mode keeps `threads`; adaptive mode sizes the
+    executor/client pool for the ceiling and starts the AIMD controller at `threads`.
+    """
+    if not adaptive:
+        return threads, None
+    controller = AimdController(threads, floor=min_threads, ceiling=max_threads)
+    return controller.ceiling, controller
+
+def print_concurrency_stats(controller):
+    if controller is None:
+        return
+    changes = sum(1 for h in controller.history if h["from"] != h["to"])
+    print(f"🎚️  Adaptive Workers: final {controller.limit} | peak {controller.report()['max_limit']} "
+          f"| range [{controller.floor}, {controller.ceiling}] | {changes} changes")
+
+def print_match_stats(jobs):
+    """One line with the batch slot matching of every job (nothing if tolerance matching was off)."""
+    active = [job for job in jobs if job.get("match_tolerance")]
+    if not active:
+        return
+    agg = {k: sum(job["slot_match"][k] for job in active) for k in ("assigned", "shifted", "unmatched", "duplicates")}
+    tol = ", ".join(f"{job['product']} {job['match_tolerance']:g}s" for job in active)
+    print(f"🎯 Slot Matching:    {agg['assigned']} assigned ({agg['shifted']} off-prefix) | "
+          f"{agg['duplicates']} duplicates | {agg['unmatched']} unmatched files | tol {tol}")
+
+def print_pool_stats(pool_stats):
+    print(f"🔌 S3 Clients:       {pool_stats['clients_created']} created | {pool_stats['leases']} leases "
+          f"({pool_stats['reuse_ratio']:.0%} reused) | {pool_stats['requests_sent']} requests "
+          f"| pool {pool_stats['max_pool_connections']} conn/client | peak {pool_stats['peak_in_flight']} in flight")
 
 # =============================================================================
 # 3. ORCHESTRATOR
 # =============================================================================
 
-def execute_s3_download(sat_position, product, year, day, threads, overwrite):
+def execute_s3_download(sat_position, product, year, day, threads, overwrite, match_tolerance=None, compact_every=500,
+                        transfer_mode="auto", part_size_mb=DEFAULT_PART_SIZE_MB, part_threads=DEFAULT_PART_THREADS,
+                        hours=None, use_manifest=True, manifest_ttl=DEFAULT_TTL_SEC, metrics_format="json",
+                        adaptive=False, min_threads=1, max_threads=16, retries=DEFAULT_RETRIES,
+                        backoff_sec=DEFAULT_BACKOFF_SEC, requeue=1, time_window=None):
     try:
-        sat_id = get_goes_id_by_julian_date(str(year), str(day), sat_position=sat_position)
-        path_plan = get_plan_download_file_path(str(year), str(day), sat_id, sat_position, product)
-        
-        if not path_plan.exists(): return
-
-        with open(path_plan, 'r') as f: plan_data = json.load(f)
-        inventory, bucket, day_prefix = plan_data["download_inventory"], plan_data["sat_prod_info"]["bucket_name"], plan_data["sat_prod_info"]["prefix_day"]
+        pool_size, controller = build_concurrency(threads, adaptive, min_threads, max_threads)
+        workers_txt = f"{controller.limit} (adaptive {controller.floor}-{controller.ceiling})" if controller else threads
 
         print("\n" + "🚀" * 30)
-        print(f"🛰️  GOES-PROCESSOR DOWNLOADER | v.1.0.8")
-        print(f"📦 PRODUCT: {product} | WORKERS: {threads}")
+        print(f"🛰️  GOES-PROCESSOR DOWNLOADER | v.1.2.11")
+        print(f"📦 PRODUCT: {product} | WORKERS: {workers_txt} | TRANSFER: {transfer_mode} ({part_size_mb} MB x {part_threads})")
+        if time_window is not None: print(f"🕒 WINDOW: {time_window.describe()}")
         print("🚀" * 30 + "\n")
-        
-        s3_main = boto3.client('s3', config=Config(signature_version=UNSIGNED))
-        all_objects = []
-        paginator = s3_main.get_paginator('list_objects_v2')
-        for page in paginator.paginate(Bucket=bucket, Prefix=day_prefix):
-            if 'Contents' in page: all_objects.extend(page['Contents'])
-
-        results = []
-        total = len(inventory)
-        
-        with ThreadPoolExecutor(max_workers=threads) as executor:
+
+        transfer_opts = build_transfer_opts(transfer_mode, part_size_mb, part_threads, retries, backoff_sec)
+        client_pool = build_client_pool(pool_size, transfer_mode, part_threads)
+        job = open_product_job(sat_position, product, year, day, client_pool, compact_every, use_manifest, manifest_ttl,
+                               match_tolerance)
+        if job is None: return
+
+        journal, listing_index = job["journal"], job["listing_index"]
+        metrics = SessionMetrics(product, pool_size)
+
+        with ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="dl-worker") as executor:
             try:
-                futures = [executor.submit(download_task, i, total, f_key, info, all_objects, bucket, path_plan, overwrite)
-                           for i, (f_key, info) in enumerate(inventory.items(), 1)]
-                
-                for future in as_completed(futures):
-                    res = future.result()
-                    if res: results.append(res)
+                results, total = run_session({product: job}, executor, threads, download_task,
+                                             (client_pool, job["match_tolerance"], transfer_opts),
+                                             hours=hours, overwrite=overwrite, metrics=metrics,
+                                             concurrency=controller, requeue=requeue, time_window=time_window)
+                results = results[product]
             except KeyboardInterrupt:
                 print("\n⚠️  [INTERRUPTED] Stopping workers...")
                 executor.shutdown(wait=False, cancel_futures=True)
                 sys.exit(0)
+            except Exception:
+                # Lo pendiente se cancela y lo que está en vuelo termina antes de compactar el journal.
+                executor.shutdown(wait=True, cancel_futures=True)
+                raise
+            finally:
+                journal.close()
 
-        mb_total = sum(r["size_mb"] for r in results if r and r["status"] == "SUCCESS")
-        files_ok = sum(1 for r in results if r and r["status"] in ["SUCCESS", "SKIPPED"])
+        metrics.stop()
+        if controller is not None: metrics.add_section("adaptive_concurrency", controller.report())
+        pool_stats = client_pool.stats()
+        client_pool.close()
+        totals = summarize_results(results)
+        report_path = metrics.write_report(job["path_plan"].parent, year, day, metrics_format)
         
         print(f"\n" + "═"*60)
         print(f"🏁 FINAL AUDIT SUMMARY | Julian Day {day}")
         print(f"═"*60)
-        print(f"📊 Online found:     {len(all_objects)}")
-        print(f"💾 Files on Disk:    {files_ok} / {total}")
-        print(f"🛰️  Session Traffic:  {round(mb_total, 2)} MB")
+        print(f"📊 Online found:     {len(listing_index)} (hours listed {job['hours_listed']}, from manifest {job['hours_cached']}, skipped as local {job['hours_skipped']}, failed {job['hours_failed']})")
+        print(f"💾 Files on Disk:    {totals['files_ok']} / {total}")
+        print(f"🔁 Recovery:         {totals['retries']} retries | {job['requeued']} re-queued | {totals['files_failed']} failed")
+        print(f"🛰️  Session Traffic:  {totals['mb_total']} MB (+{totals['mb_resumed']} MB resumed from .part)")
+        print_match_stats([job])
+        print_pool_stats(pool_stats)
+        print_concurrency_stats(controller)
+        metrics.print_summary()
+        print(f"📝 Plan Journal:     {journal.stats['appended']} receipts | {journal.stats['compactions']} compactions")
+        if report_path: print(f"📈 Metrics Report:   {report_path.name}")
         print(f"🏁 Process finished at: {datetime.now().strftime('%H:%M:%S')}")
         print("═"*60 + "\n")
 
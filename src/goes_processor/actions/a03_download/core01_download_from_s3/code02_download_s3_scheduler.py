@@ -0,0 +1,121 @@
+"""
+Path: src/goes_processor/actions/a03_download/core01_download_from_s3/code02_download_s3_scheduler.py
+Version: 0.1.8 (Global cross-product scheduler + Hour-sharded listing + S3 manifest + Session metrics
+              + Adaptive concurrency + Retries / re-queue)
+Description: Feeds ONE shared worker pool with download tasks from every requested product
+             (e.g. --product ALL), interleaved by weighted fair share, so a 24-file LSTF day
+             no longer leaves workers idle while GLM waits its turn.
+"""
+
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from goes_processor.actions.a03_download.core01_download_from_s3.code01_download_s3_engine import (
+    download_task, build_client_pool, build_transfer_opts, build_concurrency, open_product_job, summarize_results,
+    print_pool_stats, print_concurrency_stats, print_match_stats
+)
+from goes_processor.actions.a03_download.core01_download_from_s3.fn03_ranged_transfer import (
+    DEFAULT_PART_SIZE_MB, DEFAULT_PART_THREADS
+)
+from goes_processor.actions.a03_download.core01_download_from_s3.fn04_session_dispatcher import (
+    parse_product_weights, run_session
+)
+from goes_processor.actions.a03_download.core01_download_from_s3.fn05_s3_manifest_cache import DEFAULT_TTL_SEC
+from goes_processor.actions.a03_download.core01_download_from_s3.fn06_session_metrics import SessionMetrics
+from goes_processor.actions.a03_download.core01_download_from_s3.fn08_transfer_integrity import (
+    DEFAULT_RETRIES, DEFAULT_BACKOFF_SEC
+)
+
+# =============================================================================
+# 1. ORCHESTRATOR
+# =============================================================================
+
+def execute_s3_download_scheduled(sat_position, products, year, day, threads, overwrite, match_tolerance=None,
+                                  compact_every=500, transfer_mode="auto", part_size_mb=DEFAULT_PART_SIZE_MB,
+                                  part_threads=DEFAULT_PART_THREADS, weights=None, hours=None,
+                                  use_manifest=True, manifest_ttl=DEFAULT_TTL_SEC, metrics_format="json",
+                                  adaptive=False, min_threads=1, max_threads=16, retries=DEFAULT_RETRIES,
+                                  backoff_sec=DEFAULT_BACKOFF_SEC, requeue=1, time_window=None):
+    """Downloads several products of one day through a single shared worker pool."""
+    try:
+        weights = parse_product_weights(weights, products)
+        pool_size, controller = build_concurrency(threads, adaptive, min_threads, max_threads)
+        workers_txt = f"{controller.limit} (adaptive {controller.floor}-{controller.ceiling})" if controller else threads
+
+        print("\n" + "🚀" * 30)
+        print(f"🛰️  GOES-PROCESSOR DOWNLOADER | v.0.1.8 | GLOBAL SCHEDULER")
+        print(f"📦 PRODUCTS: {len(products)} | WORKERS: {workers_txt} | TRANSFER: {transfer_mode} ({part_size_mb} MB x {part_threads})")
+        print(f"⚖️  WEIGHTS: " + ", ".join(f"{p}={w}" for p, w in weights.items()))
+        if time_window is not None: print(f"🕒 WINDOW: {time_window.describe()}")
+        print("🚀" * 30 + "\n")
+
+        transfer_opts = build_transfer_opts(transfer_mode, part_size_mb, part_threads, retries, backoff_sec)
+        client_pool = build_client_pool(pool_size, transfer_mode, part_threads)
+
+        # --- A. Plans + journals (one job per product) ---
+        jobs = {}
+        for product in products:
+            job = open_product_job(sat_position, product, year, day, client_pool, compact_every,
+                                   use_manifest, manifest_ttl, match_tolerance)
+            if job is not None:
+                jobs[product] = job
+
+        if not jobs:
+            print("⚠️  No plans available for the requested products.")
+            client_pool.close()
+            return
+
+        # --- B. Hour-sharded listing + weighted fair-share dispatch on ONE pool ---
+        metrics = SessionMetrics("ALL" if len(jobs) > 1 else next(iter(jobs)), pool_size)
+        with ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="dl-worker") as executor:
+            try:
+                # Cada producto usa su propia tolerancia (resuelta en open_product_job).
+                task_args = {p: (client_pool, job["match_tolerance"], transfer_opts) for p, job in jobs.items()}
+                results, total = run_session(jobs, executor, threads, download_task, task_args,
+                                             weights={p: weights[p] for p in jobs}, hours=hours,
+                                             overwrite=overwrite, metrics=metrics, concurrency=controller,
+                                             requeue=requeue, time_window=time_window)
+            except KeyboardInterrupt:
+                print("\n⚠️  [INTERRUPTED] Stopping workers...")
+                executor.shutdown(wait=False, cancel_futures=True)
+                sys.exit(0)
+            except Exception:
+                # Lo pendiente se cancela y lo que está en vuelo termina antes de compactar los journals.
+                executor.shutdown(wait=True, cancel_futures=True)
+                raise
+            finally:
+                for job in jobs.values(): job["journal"].close()
+
+        metrics.stop()
+        if controller is not None: metrics.add_section("adaptive_concurrency", controller.report())
+        pool_stats = client_pool.stats()
+        client_pool.close()
+        report_path = metrics.write_report(next(iter(jobs.values()))["path_plan"].parent, year, day, metrics_format)
+
+        # --- C. Single audit summary ---
+        print(f"\n" + "═"*60)
+        print(f"🏁 FINAL AUDIT SUMMARY | Julian Day {day} | {len(jobs)} products")
+        print(f"═"*60)
+        grand = {"mb_total": 0.0, "mb_resumed": 0.0, "files_ok": 0, "files_failed": 0, "retries": 0}
+        for product, job in jobs.items():
+            totals = summarize_results(results[product])
+            for k in grand: grand[k] += totals[k]
+            print(f"📦 {product:<15} online {len(job['listing_index']):>5} | disk {totals['files_ok']:>5} / {job['slots_requested']:<5}"
+                  f"| {totals['mb_total']} MB" + (f" | {job['hours_failed']} hours not listed" if job['hours_failed'] else ""))
+        print(f"─"*60)
+        print(f"💾 Files on Disk:    {grand['files_ok']} / {total}")
+        print(f"🔁 Recovery:         {grand['retries']} retries | {sum(j['requeued'] for j in jobs.values())} re-queued "
+              f"| {grand['files_failed']} failed")
+        print(f"🛰️  Session Traffic:  {round(grand['mb_total'], 2)} MB (+{round(grand['mb_resumed'], 2)} MB resumed from .part)")
+        print_match_stats(jobs.values())
+        print_pool_stats(pool_stats)
+        print_concurrency_stats(controller)
+        metrics.print_summary()
+        if report_path: print(f"📈 Metrics Report:   {report_path.name}")
+        print(f"🏁 Process finished at: {datetime.now().strftime('%H:%M:%S')}")
+        print("═"*60 + "\n")
+
+    except Exception as e:
+        print(f"🔥 FATAL ERROR: {e}")
+        sys.exit(1)
@@ -0,0 +1,127 @@
+"""
+Path: src/goes_processor/actions/a03_download/core01_download_from_s3/fn01_s3_client_pool.py
+Version: 0.2.0 (Shared UNSIGNED client pool)
+Description: Shared provider of anonymous S3 clients for the download engine.
+             Workers lease a client instead of building a boto3 session per file,
+             so TLS handshakes and HTTP connections are reused across the whole day.
+             Clients are shared between threads: the pool never limits concurrency.
+"""
+
+# 1. SYSTEM LAYER
+try:
+    import threading
+    from contextlib import contextmanager
+except ImportError as e:
+    print(f"\n[SYSTEM LIB ERROR] - Critical libraries missing: {e}\n")
+    raise SystemExit(1)
+
+try:
+    import boto3
+    from botocore import UNSIGNED
+    from botocore.config import Config
+except ImportError as e:
+    print(f"\n[SYSTEM LIB ERROR] - boto3/botocore missing (pip install boto3): {e}\n")
+    raise SystemExit(1)
+
+# =============================================================================
+# CLIENT POOL
+# =============================================================================
+
+class S3ClientPool:
+    """
+    Thread-safe pool of shared UNSIGNED S3 clients.
+
+    boto3 clients are thread-safe, so a lease does not take a client for itself: leases are
+    spread round-robin over at most `max_clients` clients (created lazily) and any number of
+    workers may use the same client at once. Every client keeps its own urllib3 pool of
+    `max_pool_connections` sockets, sized to the total concurrency (`threads`), so the
+    pool never caps the number of transfers in flight.
+    """
+
+    def __init__(self, threads: int, max_clients: int | None = None):
+        ctx = "[S3ClientPool - __init__()]"
+        if int(threads) < 1:
+            raise ValueError(f"{ctx} 'threads' must be >= 1 (got {threads}).")
+
+        self.threads = int(threads)
+        # Un cliente boto3 es thread-safe: con pocos alcanza para muchos workers.
+        self.max_clients = int(max_clients) if max_clients else max(1, min(self.threads, 4))
+        # Cualquier cliente puede llevar todas las conexiones a la vez (reparto round-robin).
+        self.max_pool_connections = max(10, self.threads)
+
+        self._config = Config(
+            signature_version=UNSIGNED,
+            max_pool_connections=self.max_pool_connections,
+            retries={"max_attempts": 3, "mode": "standard"},
+        )
+        self._lock = threading.Lock()
+        self._session = boto3.session.Session()
+        self._clients = []
+        self._next = 0
+        self._in_flight = 0
+        self._stats = {"clients_created": 0, "leases": 0, "leases_reused": 0, "requests_sent": 0,
+                       "peak_in_flight": 0}
+
+    # --- internal -----------------------------------------------------------
+
+    def _count_request(self, **kwargs):
+        with self._lock:
+            self._stats["requests_sent"] += 1
+
+    def _take(self):
+        """(client, reused). Check and creation under one lock: never more than max_clients."""
+        with self._lock:
+            self._stats["leases"] += 1
+            self._in_flight += 1
+            self._stats["peak_in_flight"] = max(self._stats["peak_in_flight"], self._in_flight)
+            if len(self._clients) < self.max_clients:
+                # boto3.Session no es thread-safe: la creación queda bajo el mismo lock.
+                client = self._session.client("s3", config=self._config)
+                client.meta.events.register("before-send.s3", self._count_request)
+                self._clients.append(client)
+                self._stats["clients_created"] += 1
+                return client, False
+            client = self._clients[self._next % len(self._clients)]
+            self._next += 1
+            self._stats["leases_reused"] += 1
+            return client, True
+
+    # --- public -------------------------------------------------------------
+
+    @contextmanager
+    def lease(self):
+        """Context manager that yields a shared client; it never blocks on other leases."""
+        client, _ = self._take()
+        try:
+            yield client
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def stats(self) -> dict:
+        """Returns a snapshot of the connection-reuse counters."""
+        with self._lock:
+            snap = dict(self._stats)
+        leases = snap["leases"] or 1
+        snap["max_clients"] = self.max_clients
+        snap["max_pool_connections"] = self.max_pool_connections
+        snap["reuse_ratio"] = round(snap["leases_reused"] / leases, 4)
+        snap["requests_per_client"] = round(snap["requests_sent"] / (snap["clients_created"] or 1), 2)
+        return snap
+
+    def close(self):
+        """Closes every HTTP connection held by the pooled clients."""
+        with self._lock:
+            clients, self._clients = self._clients, []
+        for client in clients:
+            try:
+                client.close()
+            except Exception:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
@@ -0,0 +1,173 @@
+"""
+Path: src/goes_processor/actions/a03_download/core01_download_from_s3/fn02_s3_listing_index.py
+Version: 0.1.2 (Indexed S3 listing, incremental per-hour pages, batch slot assignment)
+Description: Turns a day listing (list_objects_v2 'Contents') into an index keyed by
+             scan start time (s<YYYYJJJHHMMSSt>) and by hour prefix, so every plan slot
+             is resolved with a bisect instead of a scan over the whole day.
+"""
+
+# 1. SYSTEM LAYER
+try:
+    import re
+    from bisect import bisect_left
+    from datetime import datetime
+    from pathlib import PurePosixPath
+except ImportError as e:
+    print(f"\n[SYSTEM LIB ERROR] - Critical libraries missing: {e}\n")
+    raise SystemExit(1)
+
+# GOES file name: <init_name>_s<YYYYJJJHHMMSSt>_e<...>_c<...>.nc
+_START_TOKEN_RE = re.compile(r"^(?P<head>.+?)_s(?P<start>\d{7,14})(?:_|\.|$)")
+
+# =============================================================================
+# TIME HELPERS
+# =============================================================================
+
+def parse_start_token(file_name: str):
+    """Splits a GOES file name into (init_prefix, start_token). Returns None if no match."""
+    m = _START_TOKEN_RE.match(PurePosixPath(file_name).name)
+    if not m:
+        return None
+    return m.group("head"), m.group("start")
+
+
+def start_token_to_seconds(token: str) -> float:
+    """
+    Converts YYYYJJJ[HH[MM[SS[t]]]] to seconds since 1970-01-01.
+    Missing trailing fields are taken as the nominal (zero) value.
+    """
+    ctx = "[fn02_s3_listing_index.py - start_token_to_seconds()]"
+    if not token.isdigit() or len(token) < 7:
+        raise ValueError(f"{ctx} Invalid start token '{token}'.")
+
+    base = datetime.strptime(token[:7], "%Y%j")
+    hh = int(token[7:9] or 0)
+    mm = int(token[9:11] or 0)
+    ss = int(token[11:13] or 0)
+    tenth = int(token[13:14] or 0)
+    day_sec = (base - datetime(1970, 1, 1)).total_seconds()
+    return day_sec + hh * 3600 + mm * 60 + ss + tenth / 10.0
+
+# =============================================================================
+# LISTING INDEX
+# =============================================================================
+
+class S3ListingIndex:
+    """
+    Read-only index over S3 objects of one bucket/product/day.
+
+    - by start time: {init_prefix: sorted [(start_token, obj)]} -> prefix lookup via bisect.
+    - by hour prefix: {"<product>/<year>/<day>/<HH>": [obj, ...]}.
+    """
+
+    def __init__(self, objects=()):
+        self._by_init = {}
+        self._by_hour = {}
+        self._seconds = {}  # {head: (entries_snapshot, [seconds])}
+        self._assigned = {}  # {init_name: obj} fijado por el matcher por lotes (fn09)
+        self._size = 0
+        self.add_objects(objects)
+
+    def add_objects(self, objects):
+        """
+        Adds listing entries (dicts with at least 'Key'). Safe to call per listing page
+        while workers are resolving slots: sorted lists are rebuilt and swapped, never
+        mutated in place.
+        """
+        fresh, fresh_hours = {}, {}
+        for obj in objects:
+            key = obj.get("Key", "")
+            parsed = parse_start_token(key)
+            if parsed is None:
+                continue
+            head, token = parsed
+            fresh.setdefault(head, []).append((token, obj))
+            fresh_hours.setdefault(str(PurePosixPath(key).parent), []).append(obj)
+            self._size += 1
+
+        for head, pairs in fresh.items():
+            self._by_init[head] = sorted(self._by_init.get(head, []) + pairs, key=lambda pair: pair[0])
+        for hour, objs in fresh_hours.items():
+            self._by_hour[hour] = self._by_hour.get(hour, []) + objs
+        return self
+
+    def __len__(self):
+        return self._size
+
+    # --- lookups ------------------------------------------------------------
+
+    def find(self, init_name: str, tolerance_sec: float = 0):
+        """
+        Resolves a plan slot ('<init_prefix>_s<YYYYJJJ...>') to its S3 object.
+
+        0. Slot pinned by pin_assignments() (batch nearest-time match, fn09).
+        1. Exact match: first object whose start token begins with the slot token.
+        2. If none and tolerance_sec > 0: nearest start time within the tolerance.
+        """
+        assigned = self._assigned.get(init_name)
+        if assigned is not None:
+            return assigned
+        parsed = parse_start_token(init_name)
+        if parsed is None:
+            return None
+        head, slot = parsed
+        entries = self._by_init.get(head)
+        if not entries:
+            return None
+
+        pos = bisect_left(entries, (slot,))
+        if pos < len(entries) and entries[pos][0].startswith(slot):
+            return entries[pos][1]
+
+        if tolerance_sec and tolerance_sec > 0:
+            return self._nearest(head, slot, tolerance_sec)
+        return None
+
+    def _nearest(self, head, slot, tolerance_sec):
+        entries = self._by_init[head]
+        seconds = self._entry_seconds(head)
+
+        target = start_token_to_seconds(slot)
+        pos = bisect_left(seconds, target)
+        best = None
+        for cand in (pos - 1, pos):
+            if 0 <= cand < len(seconds):
+                delta = abs(seconds[cand] - target)
+                if delta <= tolerance_sec and (best is None or delta < best[0]):
+                    best = (delta, cand)
+        return entries[best[1]][1] if best else None
+
+    def candidates_near(self, init_names, margin_sec: float) -> list:
+        """Objects sharing the slots' init prefix whose start lies in the slots' span +- margin."""
+        init_names = list(init_names)
+        out = []
+        for head in {p[0] for p in map(parse_start_token, init_names) if p is not None}:
+            entries = self._by_init.get(head)
+            if not entries:
+                continue
+            seconds = self._entry_seconds(head)
+            slot_secs = [start_token_to_seconds(parse_start_token(n)[1]) for n in init_names
+                         if n.startswith(head + "_s")]
+            lo = bisect_left(seconds, min(slot_secs) - margin_sec)
+            hi = bisect_left(seconds, max(slot_secs) + margin_sec + 0.1)
+            out.extend(obj for _, obj in entries[lo:hi])
+        return out
+
+    def pin_assignments(self, assigned: dict):
+        """{init_name: obj} decided by a batch matcher (fn09); find() returns these first."""
+        self._assigned.update(assigned)
+
+    def _entry_seconds(self, head):
+        entries = self._by_init[head]
+        cached = self._seconds.get(head)
+        if cached is None or cached[0] is not entries:
+            cached = (entries, [start_token_to_seconds(tok) for tok, _ in entries])
+            self._seconds[head] = cached
+        return cached[1]
+
+    def objects_in_hour(self, prefix_hour: str) -> list:
+        """Returns the objects listed under one hour prefix (e.g. 'ABI-L2-LSTF/2026/003/00')."""
+        return list(self._by_hour.get(prefix_hour.rstrip("/"), []))
+
+    def hour_prefixes(self) -> list:
+        return sorted(self._by_hour)
@@ -0,0 +1,174 @@
+"""
+Path: src/goes_processor/actions/a03_download/core01_download_from_s3/fn03_ranged_transfer.py
+Version: 0.1.1 (Parallel ranged GET + resume + per-range MD5)
+Description: Splits one S3 object into byte ranges fetched in parallel and written in place
+             into a stable '<file>.part'. Completed ranges (and the MD5 of each, computed while
+             streaming) are recorded in '<file>.part.json' so an interrupted transfer resumes
+             from the missing ranges only and can still be verified against the ETag.
+"""
+
+# 1. SYSTEM LAYER
+try:
+    import hashlib
+    import json
+    import os
+    import threading
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from pathlib import Path
+except ImportError as e:
+    print(f"\n[SYSTEM LIB ERROR] - Critical libraries missing: {e}\n")
+    raise SystemExit(1)
+
+# 2. PROJECT LAYER
+try:
+    from goes_processor.actions.a03_download.core01_download_from_s3.fn08_transfer_integrity import verify_transfer
+except ImportError as e:
+    print(f"\n[PROJECT LIB ERROR] - Internal modules missing: {e}\n")
+    raise SystemExit(1)
+
+MB = 1024 * 1024
+DEFAULT_PART_SIZE_MB = 8
+DEFAULT_PART_THREADS = 4
+_STREAM_CHUNK = 1 * MB
+
+TRANSFER_MODES = ("auto", "single", "ranged")
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+def get_part_paths(final_path):
+    """Returns (data_part_path, state_json_path) for a final local file."""
+    final_path = Path(final_path)
+    return (final_path.with_name(final_path.name + ".part"),
+            final_path.with_name(final_path.name + ".part.json"))
+
+
+def split_ranges(size: int, part_size: int) -> list:
+    """[(start, end_inclusive), ...] covering [0, size)."""
+    part_size = max(1, int(part_size))
+    return [(start, min(start + part_size, size) - 1) for start in range(0, size, part_size)]
+
+
+def use_ranged_transfer(mode: str, size: int, part_size: int) -> bool:
+    """'auto' only splits objects larger than two parts; small GLM files stay single GET."""
+    if mode == "ranged":
+        return True
+    if mode == "single":
+        return False
+    return size > 2 * part_size
+
+# =============================================================================
+# RANGED TRANSFER
+# =============================================================================
+
+class RangedTransfer:
+    """
+    One object -> N parallel 'Range: bytes=a-b' GETs written with pwrite into '<file>.part'.
+    """
+
+    def __init__(self, client_pool, bucket, remote_key, final_path, size, etag=None,
+                 part_size_mb=DEFAULT_PART_SIZE_MB, part_threads=DEFAULT_PART_THREADS):
+        self.client_pool = client_pool
+        self.bucket = bucket
+        self.remote_key = remote_key
+        self.final_path = Path(final_path)
+        self.size = int(size)
+        self.etag = (etag or "").strip('"') or None
+        self.part_size = max(1, int(part_size_mb * MB))
+        self.part_threads = max(1, int(part_threads))
+        self.part_path, self.state_path = get_part_paths(self.final_path)
+        self._lock = threading.Lock()
+        self._done = {}                  # {(start, end): md5 hex | None (state from an older version)}
+        self.resumed_bytes = 0
+        self.verified = None
+
+    # --- state --------------------------------------------------------------
+
+    def _load_state(self):
+        """Reuses completed ranges only if the object (size/ETag/part size) is unchanged."""
+        if not (self.state_path.exists() and self.part_path.exists()):
+            return
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return
+        same_object = (state.get("size") == self.size and state.get("etag") == self.etag
+                       and state.get("part_size") == self.part_size
+                       and self.part_path.stat().st_size == self.size)
+        if same_object:
+            self._done = {(r[0], r[1]): (r[2] if len(r) > 2 else None) for r in state.get("done", [])}
+            self.resumed_bytes = sum(end - start + 1 for start, end in self._done)
+
+    def _save_state_locked(self):
+        tmp = self.state_path.with_name(self.state_path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"key": self.remote_key, "size": self.size, "etag": self.etag,
+                       "part_size": self.part_size,
+                       "done": [[s, e, d] for (s, e), d in sorted(self._done.items())]}, f)
+        os.replace(tmp, self.state_path)
+
+    # --- transfer -----------------------------------------------------------
+
+    def _fetch_range(self, fd, start, end):
+        with self.client_pool.lease() as s3_client:
+            resp = s3_client.get_object(Bucket=self.bucket, Key=self.remote_key, Range=f"bytes={start}-{end}")
+            body = resp["Body"]
+            offset = start
+            md5 = hashlib.md5()
+            try:
+                while True:
+                    chunk = body.read(_STREAM_CHUNK)
+                    if not chunk:
+                        break
+                    md5.update(chunk)
+                    os.pwrite(fd, chunk, offset)
+                    offset += len(chunk)
+            finally:
+                body.close()
+
+        if offset != end + 1:
+            raise IOError(f"Short range {start}-{end}: got {offset - start} bytes")
+
+        with self._lock:
+            self._done[(start, end)] = md5.hexdigest()
+            self._save_state_locked()
+
+    def run(self) -> int:
+        """
+        Downloads every missing range, verifies size/ETag from the per-range MD5s and renames
+        '<file>.part' to the final path. Returns the bytes actually transferred in this call.
+        On a network error the .part and its state are kept so the next attempt resumes; on an
+        integrity mismatch both are discarded (the bytes on disk cannot be trusted).
+        """
+        self.final_path.parent.mkdir(parents=True, exist_ok=True)
+        self._load_state()
+        if not self._done:
+            self.state_path.unlink(missing_ok=True)
+
+        pending = [r for r in split_ranges(self.size, self.part_size) if r not in self._done]
+
+        fd = os.open(self.part_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            os.ftruncate(fd, self.size)
+            with ThreadPoolExecutor(max_workers=min(self.part_threads, max(1, len(pending)))) as pool:
+                futures = [pool.submit(self._fetch_range, fd, start, end) for start, end in pending]
+                for future in as_completed(futures):
+                    future.result()
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+        ranges = split_ranges(self.size, self.part_size)
+        try:
+            self.verified = verify_transfer(self.size, sum(e - s + 1 for s, e in self._done), etag=self.etag,
+                                            part_md5s=[self._done.get(r) for r in ranges], part_size=self.part_size)
+        except IOError:
+            self.part_path.unlink(missing_ok=True)
+            self.state_path.unlink(missing_ok=True)
+            raise
+
+        os.replace(self.part_path, self.final_path)
+        self.state_path.unlink(missing_ok=True)
+        return sum(end - start + 1 for start, end in pending)
@@ -0,0 +1,360 @@
+"""
+Path: src/goes_processor/actions/a03_download/core01_download_from_s3/fn04_session_dispatcher.py
+Version: 0.1.10 (Hour-sharded listing + S3 manifest cache + shared dispatch loop + session metrics
+              + adaptive concurrency + re-queue of failed transfers + sub-day time windows
+              + per-hour tolerance slot matching + typed plan model + listing retries)
+Description: Dispatch loop shared by the single-product engine (code01) and the global
+             scheduler (code02). Listing is split by the plan's 'file_s3.prefix_hour':
+             every hour is listed concurrently and its slots are released to the download
+             workers as soon as that hour's listing arrives. Hours already complete on disk
+             are not listed at all. A listing is retried with backoff (fn08); an hour that still
+             cannot be listed falls back to its manifest listing or fails only its own slots.
+"""
+
+# 1. SYSTEM LAYER
+try:
+    import os
+    import threading
+    import time
+    from bisect import bisect_left
+    from collections import deque
+    from concurrent.futures import wait, FIRST_COMPLETED
+    from pathlib import Path
+except ImportError as e:
+    print(f"\n[SYSTEM LIB ERROR] - Critical libraries missing: {e}\n")
+    raise SystemExit(1)
+
+# 2. PROJECT LAYER
+try:
+    from goes_processor.actions.a03_download.core01_download_from_s3.fn08_transfer_integrity import (
+        DEFAULT_RETRIES, DEFAULT_BACKOFF_SEC, backoff_delay, is_retryable
+    )
+    from goes_processor.actions.a03_download.core01_download_from_s3.fn09_slot_matcher import assign_slots, summarize_match
+except ImportError as e:
+    print(f"\n[PROJECT LIB ERROR] - Internal modules missing: {e}\n")
+    raise SystemExit(1)
+
+GREEN = "\033[92m"
+RESET = "\033[0m"
+
+# =============================================================================
+# 1. WEIGHTS + FAIR-SHARE QUEUE
+# =============================================================================
+
+def parse_product_weights(raw, products):
+    """
+    'GLM-L2-LCFA=3,ABI-L2-FDCF=2' -> {product: weight}. Products not listed get weight 1.
+    """
+    ctx = "[fn04_session_dispatcher.py - parse_product_weights()]"
+    weights = {p: 1 for p in products}
+    if not raw:
+        return weights
+
+    for chunk in str(raw).split(","):
+        chunk = chunk.strip()
+        if not chunk:
+            continue
+        name, _, value = chunk.partition("=")
+        name = name.strip().upper()
+        if name not in weights:
+            raise ValueError(f"{ctx} Unknown product in weights: '{name}'. Requested: {list(products)}")
+        try:
+            weights[name] = int(value)
+        except ValueError:
+            raise ValueError(f"{ctx} Weight for '{name}' must be an integer (got '{value}').") from None
+        if weights[name] < 1:
+            raise ValueError(f"{ctx} Weight for '{name}' must be >= 1.")
+    return weights
+
+
+class WeightedFairQueue:
+    """
+    Smooth weighted round-robin over per-product queues. Each product receives dispatch
+    slots in proportion to its weight; when one runs dry the others absorb its share.
+    """
+
+    def __init__(self, weights):
+        self._queues = {p: deque() for p in weights}
+        self._weights = dict(weights)
+        self._current = {p: 0 for p in weights}
+
+    def put(self, product, task):
+        self._queues[product].append(task)
+
+    def __len__(self):
+        return sum(len(q) for q in self._queues.values())
+
+    def pop(self):
+        active = [p for p, q in self._queues.items() if q]
+        if not active:
+            return None
+        total = sum(self._weights[p] for p in active)
+        for p in active:
+            self._current[p] += self._weights[p]
+        chosen = max(active, key=lambda p: self._current[p])
+        self._current[chosen] -= total
+        return chosen, self._queues[chosen].popleft()
+
+# =============================================================================
+# 2. HOUR SHARDS
+# =============================================================================
+
+def parse_hours_filter(raw):
+    """'00,05,12-14' -> {'00','05','12','13','14'}. None/'' -> None (all hours)."""
+    ctx = "[fn04_session_dispatcher.py - parse_hours_filter()]"
+    if raw is None or str(raw).strip() == "" or str(raw).strip().upper() == "ALL":
+        return None
+
+    hours = set()
+    for chunk in str(raw).split(","):
+        chunk = chunk.strip()
+        if not chunk:
+            continue
+        lo, _, hi = chunk.partition("-")
+        try:
+            lo_i, hi_i = int(lo), int(hi or lo)
+        except ValueError:
+            raise ValueError(f"{ctx} Invalid hour token '{chunk}'. Use HH, HH-HH or a comma list.") from None
+        if not (0 <= lo_i <= hi_i <= 23):
+            raise ValueError(f"{ctx} Hour range '{chunk}' must be within 00-23.")
+        hours.update(f"{h:02d}" for h in range(lo_i, hi_i + 1))
+    return hours
+
+
+def group_slots_by_hour(inventory, hours=None, time_window=None):
+    """
+    {prefix_hour: [(file_key, slot), ...]} preserving plan order, optionally filtered by HH
+    and/or a fn03_time_window.TimeWindow. Hours left without slots are never listed.
+    inventory: DownloadPlan.slots ({file_key: fn06 PlanSlot}).
+    """
+    allowed = None
+    if time_window is not None:
+        allowed = set(time_window.filter_time_stamps([info.time_stamp for info in inventory.values()]))
+    shards = {}
+    for f_key, info in inventory.items():
+        prefix_hour = info.file_s3.prefix_hour
+        if hours is not None and prefix_hour.rsplit("/", 1)[-1] not in hours:
+            continue
+        if allowed is not None and info.time_stamp not in allowed:
+            continue
+        shards.setdefault(prefix_hour, []).append((f_key, info))
+    return shards
+
+
+def hour_complete_locally(slots):
+    """One scandir of the hour folder: True if every slot already has a finished .nc on disk."""
+    folder = Path(slots[0][1].folder_local.path_absolute)
+    try:
+        with os.scandir(folder) as it:
+            names = sorted(e.name for e in it if e.is_file() and e.name.endswith(".nc"))
+    except (FileNotFoundError, NotADirectoryError):
+        return False
+    if not names:
+        return False
+
+    for _, info in slots:
+        init_name = info.file_local.init_name
+        pos = bisect_left(names, init_name)
+        if pos >= len(names) or not names[pos].startswith(init_name):
+            return False
+    return True
+
+
+def list_prefix(client_pool, bucket, prefix, start_after=None, retries=DEFAULT_RETRIES, backoff_sec=DEFAULT_BACKOFF_SEC):
+    """
+    Paginated listing of one prefix through a pooled client (only keys > start_after if given).
+    Transient errors are retried with full-jitter backoff; the last error is raised.
+    """
+    kwargs = {"Bucket": bucket, "Prefix": prefix.rstrip("/") + "/"}
+    if start_after:
+        kwargs["StartAfter"] = start_after
+    for attempt in range(retries + 1):
+        objects = []
+        try:
+            with client_pool.lease() as s3_client:
+                paginator = s3_client.get_paginator('list_objects_v2')
+                for page in paginator.paginate(**kwargs):
+                    if 'Contents' in page: objects.extend(page['Contents'])
+            return objects
+        except Exception as e:
+            if attempt == retries or not is_retryable(e):
+                raise
+            delay = backoff_delay(attempt, backoff_sec)
+            print(f"🔁 [LIST RETRY {attempt + 1}/{retries}] {prefix} in {delay:.1f}s | {e}")
+            time.sleep(delay)
+
+# =============================================================================
+# 3. DISPATCH LOOP
+# =============================================================================
+
+def _timed_task(t_ready, task_fn, *args):
+    """Worker-side wrapper: stamps queue wait (slot released -> worker start) and worker name."""
+    queue_wait = time.monotonic() - t_ready
+    receipt = task_fn(*args)
+    if receipt is not None:
+        receipt["queue_wait"] = round(queue_wait, 3)
+        receipt["worker"] = threading.current_thread().name
+    return receipt
+
+
+def match_hour_slots(job, slots):
+    """
+    After an hour lands in the listing index: assigns its slots by nearest start time
+    (job['match_tolerance']) and adds the counters to job['slot_match'].
+    """
+    report = assign_slots(job["listing_index"], [info.file_local.init_name for _, info in slots],
+                          job.get("match_tolerance", 0))
+    if report is None:
+        return
+    for key, value in summarize_match(report).items():
+        job["slot_match"][key] = job["slot_match"].get(key, 0) + value
+
+
+def run_session(jobs, executor, threads, task_fn, task_args, weights=None, hours=None, overwrite=False,
+                metrics=None, concurrency=None, requeue=0, time_window=None):
+    """
+    Runs every slot of every job through `executor`.
+
+    jobs      : {product: job} as returned by code01.open_product_job(). If the job has a
+                'manifest' (fn05.S3ManifestCache), fresh hours are served from it and
+                stale ones are refreshed with StartAfter.
+    task_fn   : download_task; called as task_fn(seq, total, f_key, info, listing_index,
+                bucket, journal, overwrite, *task_args).
+    task_args : tuple shared by every job, or {product: tuple} when the arguments differ per
+                product (e.g. each job's match tolerance under --product ALL).
+    metrics   : optional fn06.SessionMetrics; receives every receipt, re-queued attempts included.
+    concurrency: optional fn07.AimdController; when given, its `limit` replaces the fixed
+                in-flight window (threads * 2) and it is fed with every receipt (failed
+                attempts that are re-queued too).
+    time_window: optional fn03_time_window.TimeWindow (sub-day window / explicit slots).
+    requeue   : times a slot whose transfer ended in ERROR (after its own retries) goes
+                back to the end of its product queue within the same session.
+    Returns   : ({product: [receipt, ...]}, total_slots).
+    An hour whose listing fails (after list_prefix retries) is served from the manifest if it
+    has that hour; otherwise its slots get an ERROR receipt (journal untouched, so the next run
+    retries them) and the other hours and products go on.
+    """
+    fair_queue = WeightedFairQueue(weights or {p: 1 for p in jobs})
+    args_by_product = task_args if isinstance(task_args, dict) else {p: task_args for p in jobs}
+    results = {p: [] for p in jobs}
+    listing_futures = {}
+    total = 0
+
+    def _observe(product, receipt):
+        # Métricas y AIMD ven todos los intentos (también los que se re-encolan).
+        if metrics is not None:
+            metrics.record(product, receipt)
+        if concurrency is not None:
+            concurrency.on_result(receipt)
+
+    def _collect(product, receipt):
+        results[product].append(receipt)
+        _observe(product, receipt)
+
+    # --- A. Shards: skip complete hours, list the rest concurrently ---
+    for product, job in jobs.items():
+        shards = group_slots_by_hour(job["inventory"], hours, time_window)
+        job["hours_listed"], job["hours_skipped"], job["hours_cached"], job["hours_failed"] = 0, 0, 0, 0
+        manifest = job.get("manifest")
+        job["slots_requested"] = sum(len(slots) for slots in shards.values())
+        for prefix_hour, slots in shards.items():
+            total += len(slots)
+            if not overwrite and hour_complete_locally(slots):
+                job["hours_skipped"] += 1
+                print(f"✅ {GREEN}[HOUR LOCAL]{RESET} {prefix_hour} ({len(slots)} files) - listing skipped")
+                for f_key, info in slots:
+                    job["journal"].append(f_key, exists_online=True)
+                    _collect(product, {"status": "SKIPPED", "size_mb": 0, "file_name": info.file_local.init_name})
+                continue
+            if manifest is not None and manifest.hour_status(prefix_hour) == "fresh":
+                job["hours_cached"] += 1
+                job["listing_index"].add_objects(manifest.objects_in_hour(prefix_hour))
+                match_hour_slots(job, slots)
+                t_ready = time.monotonic()
+                for slot in slots:
+                    fair_queue.put(product, (slot, t_ready))
+                continue
+            start_after = manifest.start_after(prefix_hour) if manifest is not None else None
+            future = executor.submit(list_prefix, job["client_pool"], job["bucket"], prefix_hour, start_after)
+            listing_futures[future] = (product, prefix_hour, slots)
+
+    # --- B. Release slots as each hour listing lands; keep a bounded download window ---
+    window = threads * 2
+    downloads = {}
+    requeued = {}
+    # Un slot re-encolado conserva su número i/total original.
+    retry_seq = {}
+    for job in jobs.values():
+        job["requeued"] = 0
+    seq = sum(len(r) for r in results.values())
+
+    while fair_queue or downloads or listing_futures:
+        if concurrency is not None:
+            window = concurrency.limit
+        while fair_queue and len(downloads) < window:
+            product, ((f_key, info), t_ready) = fair_queue.pop()
+            job = jobs[product]
+            n = retry_seq.pop((product, f_key), None)
+            if n is None:
+                seq += 1
+                n = seq
+            future = executor.submit(_timed_task, t_ready, task_fn, n, total, f_key, info, job["listing_index"],
+                                     job["bucket"], job["journal"], overwrite, *args_by_product[product])
+            downloads[future] = (product, (f_key, info), n)
+
+        done, _ = wait(list(downloads) + list(listing_futures), return_when=FIRST_COMPLETED)
+        for future in done:
+            if future in listing_futures:
+                product, prefix_hour, slots = listing_futures.pop(future)
+                job = jobs[product]
+                manifest = job.get("manifest")
+                try:
+                    listed = future.result()
+                except Exception as e:
+                    if manifest is None or manifest.hour_status(prefix_hour) == "missing":
+                        # Sin listado no hay nada que bajar en esa hora; el resto de la sesión sigue.
+                        job["hours_failed"] += 1
+                        print(f"❌ [LISTING FAILED] {prefix_hour} ({len(slots)} files) | {e}")
+                        for f_key, info in slots:
+                            receipt = {"status": f"ERROR: listing failed: {e}", "size_mb": 0,
+                                       "file_name": info.file_local.init_name}
+                            results[product].append(receipt)
+                            if metrics is not None:
+                                metrics.record(product, receipt)
+                        continue
+                    print(f"⚠️  [LISTING FAILED] {prefix_hour} | {e} - using the manifest listing")
+                    job["hours_cached"] += 1
+                    listed = manifest.objects_in_hour(prefix_hour)
+                else:
+                    if manifest is not None:
+                        # Listado incremental: el índice recibe la hora completa desde el manifest.
+                        listed = manifest.merge_hour(prefix_hour, listed).objects_in_hour(prefix_hour)
+                    job["hours_listed"] += 1
+                job["listing_index"].add_objects(listed)
+                match_hour_slots(job, slots)
+                t_ready = time.monotonic()
+                for slot in slots:
+                    fair_queue.put(product, (slot, t_ready))
+            else:
+                product, slot, n = downloads.pop(future)
+                res = future.result()
+                if not res:
+                    continue
+                retry_key = (product, slot[0])
+                if str(res.get("status", "")).startswith("ERROR") and requeued.get(retry_key, 0) < requeue:
+                    # Fallido o corrupto: vuelve al final de la cola en vez de esperar otra corrida del día.
+                    # El fallo llega igual al AIMD y a las métricas: es la señal para bajar concurrencia.
+                    res["requeued"] = True
+                    _observe(product, res)
+                    requeued[retry_key] = requeued.get(retry_key, 0) + 1
+                    retry_seq[retry_key] = n
+                    jobs[product]["requeued"] += 1
+                    print(f"🔁 [REQUEUE {requeued[retry_key]}/{requeue}] {res.get('file_name')}")
+                    fair_queue.put(product, (slot, time.monotonic()))
+                    continue
+                _collect(product, res)
+
+    for job in jobs.values():
+        if job.get("manifest") is not None:
+            job["manifest"].save()
+    return results, total
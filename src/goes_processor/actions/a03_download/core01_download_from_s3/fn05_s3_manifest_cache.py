@@ -0,0 +1,172 @@
+"""
+Path: src/goes_processor/actions/a03_download/core01_download_from_s3/fn05_s3_manifest_cache.py
+Version: 0.1.1 (On-disk S3 manifest cache + typed plan model)
+Description: Local manifest of S3 listings keyed by bucket / product / year / Julian day,
+             stored per hour prefix (key, size, ETag).
+             - An hour listed after it was closed (hour end + grace) never expires.
+             - Recent hours expire after a TTL and are refreshed incrementally with
+               StartAfter=<last cached key>, so only new keys travel over the network.
+             Readers (downloader, plan checker) can query it without any S3 call.
+"""
+
+# 1. SYSTEM LAYER
+try:
+    import json
+    import os
+    import time
+    from datetime import datetime, timezone, timedelta
+    from pathlib import Path
+except ImportError as e:
+    print(f"\n[SYSTEM LIB ERROR] - Critical libraries missing: {e}\n")
+    raise SystemExit(1)
+
+# 2. PROJECT LAYER
+try:
+    from goes_processor.SoT.goes_hardcoded_folders import get_my_path
+    from goes_processor.actions.a02_planning.core02_plan_catalog.fn01_plan_catalog import sync_s3_objects_safe
+except ImportError as e:
+    print(f"\n[PROJECT LIB ERROR] - Internal modules missing: {e}\n")
+    raise SystemExit(1)
+
+MANIFEST_VERSION = 1
+DEFAULT_TTL_SEC = 600
+# Un archivo GOES aparece en S3 a los pocos minutos; pasado este margen la hora se considera cerrada.
+FINAL_GRACE_SEC = 2 * 3600
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+def get_manifest_path(bucket: str, product: str, year: str, day: str) -> Path:
+    """data_manifest/<bucket>/<product>/<year>/<day>/manifest_s3_<year>_<day>_<product>.json"""
+    day_str = str(day).zfill(3)
+    return (get_my_path("data_manifest") / bucket / product / str(year) / day_str
+            / f"manifest_s3_{year}_{day_str}_{product}.json")
+
+
+def hour_end_utc(prefix_hour: str) -> datetime:
+    """'<product>/<YYYY>/<DDD>/<HH>' -> UTC datetime at the end of that hour."""
+    _, year, day, hour = prefix_hour.rstrip("/").rsplit("/", 3)
+    start = datetime.strptime(f"{year}{day}{hour}", "%Y%j%H").replace(tzinfo=timezone.utc)
+    return start + timedelta(hours=1)
+
+# =============================================================================
+# MANIFEST
+# =============================================================================
+
+class S3ManifestCache:
+    """
+    {"hours": {"<prefix_hour>": {"listed_at": epoch, "final": bool, "last_key": str,
+                                 "objects": {key: [size, etag]}}}}
+    """
+
+    def __init__(self, bucket, product, year, day, ttl_sec=DEFAULT_TTL_SEC):
+        self.bucket = bucket
+        self.product = product
+        self.year = str(year)
+        self.day = str(day).zfill(3)
+        self.ttl_sec = float(ttl_sec)
+        self.path = get_manifest_path(bucket, product, self.year, self.day)
+        self._hours = {}
+        self._dirty = False
+        self._new_objects = []                  # pendientes de volcar al catálogo SQLite
+        self.load()
+
+    @classmethod
+    def from_plan(cls, plan, ttl_sec=DEFAULT_TTL_SEC):
+        """Builds the manifest handle from a plan's sat_prod_info (fn06 DownloadPlan, no network)."""
+        info = plan.sat_prod_info
+        product, year, day = info.prefix_day.split("/")
+        return cls(info.bucket_name, product, year, day, ttl_sec=ttl_sec)
+
+    # --- persistence ----------------------------------------------------------
+
+    def load(self):
+        if not self.path.exists():
+            return self
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            # Un manifest roto sólo cuesta un re-listado: no es fatal.
+            print(f"⚠️  [MANIFEST] Ignoring unreadable cache {self.path.name}: {e}")
+            return self
+        if data.get("version") == MANIFEST_VERSION:
+            self._hours = data.get("hours", {})
+        return self
+
+    def save(self):
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "bucket": self.bucket, "product": self.product,
+                       "year": self.year, "day": self.day, "hours": self._hours},
+                      f, separators=(",", ":"))
+        os.replace(tmp, self.path)
+        self._dirty = False
+        sync_s3_objects_safe(self.bucket, self.product, self._new_objects)
+        self._new_objects = []
+
+    # --- queries (no network) -------------------------------------------------
+
+    def hour_status(self, prefix_hour: str, now: float | None = None) -> str:
+        """'fresh' (usable as is), 'stale' (refresh with StartAfter) or 'missing'."""
+        entry = self._hours.get(prefix_hour.rstrip("/"))
+        if entry is None:
+            return "missing"
+        if entry.get("final"):
+            return "fresh"
+        now = time.time() if now is None else now
+        return "fresh" if (now - entry.get("listed_at", 0)) < self.ttl_sec else "stale"
+
+    def start_after(self, prefix_hour: str, now: float | None = None):
+        """
+        Cursor for an incremental refresh. Once the hour is closed we return None so the
+        last listing is a full one (catches late files that sort before the cursor).
+        """
+        entry = self._hours.get(prefix_hour.rstrip("/"))
+        if not entry:
+            return None
+        now = time.time() if now is None else now
+        if now >= hour_end_utc(prefix_hour).timestamp() + FINAL_GRACE_SEC:
+            return None
+        return entry.get("last_key")
+
+    def objects_in_hour(self, prefix_hour: str) -> list:
+        """Listing-compatible dicts: [{'Key', 'Size', 'ETag'}, ...]."""
+        entry = self._hours.get(prefix_hour.rstrip("/"))
+        if not entry:
+            return []
+        return [{"Key": k, "Size": size, "ETag": etag} for k, (size, etag) in entry["objects"].items()]
+
+    def all_objects(self) -> list:
+        out = []
+        for prefix_hour in sorted(self._hours):
+            out.extend(self.objects_in_hour(prefix_hour))
+        return out
+
+    def cached_hours(self) -> list:
+        return sorted(self._hours)
+
+    # --- updates --------------------------------------------------------------
+
+    def merge_hour(self, prefix_hour: str, objects, listed_at: float | None = None):
+        """Adds the result of a (possibly incremental) listing of one hour prefix."""
+        prefix_hour = prefix_hour.rstrip("/")
+        listed_at = time.time() if listed_at is None else listed_at
+        entry = self._hours.setdefault(prefix_hour, {"listed_at": 0, "final": False, "last_key": None, "objects": {}})
+
+        objects = list(objects)
+        self._new_objects.extend(objects)
+        for obj in objects:
+            entry["objects"][obj["Key"]] = [obj.get("Size"), str(obj.get("ETag", "")).strip('"') or None]
+        if entry["objects"]:
+            entry["last_key"] = max(entry["objects"])
+
+        entry["listed_at"] = listed_at
+        closed_at = hour_end_utc(prefix_hour).timestamp() + FINAL_GRACE_SEC
+        entry["final"] = listed_at >= closed_at
+        self._dirty = True
+        return self
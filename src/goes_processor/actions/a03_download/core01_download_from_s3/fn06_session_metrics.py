@@ -0,0 +1,187 @@
+"""
+Path: src/goes_processor/actions/a03_download/core01_download_from_s3/fn06_session_metrics.py
+Version: 0.1.1 (Session throughput / latency metrics)
+Description: Collects one row per file handled by a download session (bytes, duration,
+             throughput, retries, queue wait, worker) plus one REQUEUED row per failed attempt
+             that fn04 sent back to the queue, and aggregates p50/p95/p99 latency and
+             MB/s per product and per worker. The report is written next to the day's plan
+             as JSON (summary + rows) or CSV (rows only) to size --threads and spot slow prefixes.
+"""
+
+# 1. SYSTEM LAYER
+try:
+    import csv
+    import json
+    import os
+    import threading
+    import time
+    from datetime import datetime
+    from pathlib import Path
+except ImportError as e:
+    print(f"\n[SYSTEM LIB ERROR] - Critical libraries missing: {e}\n")
+    raise SystemExit(1)
+
+MB = 1024 * 1024
+METRICS_FORMATS = ("json", "csv", "none")
+PERCENTILES = (50, 95, 99)
+
+_ROW_FIELDS = ("product", "file_name", "status", "worker", "bytes", "duration_sec", "mb_s",
+               "retries", "queue_wait_sec", "mode", "resumed_mb", "t_start", "t_end")
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+def percentile(values, q):
+    """Linear-interpolated percentile (same rule as numpy's default). None for an empty list."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * (q / 100.0)
+    lo = int(pos)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+
+def get_metrics_report_path(plan_folder, year, day, label, started_at: datetime, fmt="json") -> Path:
+    """<plan folder>/metrics_01_download_{year}_{day}_{label}_{YYYYmmdd_HHMMSS}.{json|csv}"""
+    stamp = started_at.strftime("%Y%m%d_%H%M%S")
+    return Path(plan_folder) / f"metrics_01_download_{year}_{str(day).zfill(3)}_{label}_{stamp}.{fmt}"
+
+
+def _aggregate(rows, wall_sec):
+    # Los intentos re-encolados no son archivos: el mismo slot vuelve a aparecer con su resultado final.
+    attempts = rows
+    rows = [r for r in rows if r["status"] != "REQUEUED"]
+    done = [r for r in rows if r["status"] == "SUCCESS"]
+    durations = [r["duration_sec"] for r in done if r["duration_sec"] is not None]
+    total_bytes = sum(r["bytes"] for r in done)
+    busy_sec = sum(durations)
+    out = {
+        "files": len(rows),
+        "files_ok": len(done),
+        "files_skipped": sum(1 for r in rows if r["status"] == "SKIPPED"),
+        "files_failed": sum(1 for r in rows if r["status"].startswith("ERROR")),
+        "files_not_found": sum(1 for r in rows if r["status"] == "NOT_FOUND"),
+        "attempts_requeued": len(attempts) - len(rows),
+        "retries": sum(r["retries"] for r in attempts),
+        "mb": round(total_bytes / MB, 3),
+        # Throughput mientras el worker transfiere vs. throughput de reloj de pared de la sesión.
+        "mb_s_transfer": round(total_bytes / MB / busy_sec, 3) if busy_sec > 0 else None,
+        "mb_s_wall": round(total_bytes / MB / wall_sec, 3) if wall_sec > 0 else None,
+    }
+    for q in PERCENTILES:
+        value = percentile(durations, q)
+        out[f"p{q}_sec"] = round(value, 3) if value is not None else None
+    waits = [r["queue_wait_sec"] for r in attempts if r["queue_wait_sec"] is not None]
+    out["queue_wait_p95_sec"] = round(percentile(waits, 95), 3) if waits else None
+    return out
+
+# =============================================================================
+# COLLECTOR
+# =============================================================================
+
+class SessionMetrics:
+    """Thread-safe collector fed by fn04.run_session with every finished receipt."""
+
+    def __init__(self, label, threads):
+        self.label = label
+        self.threads = threads
+        self.started_at = datetime.now()
+        self._t0 = time.monotonic()
+        self._t1 = None
+        self._rows = []
+        self._sections = {}
+        self._lock = threading.Lock()
+
+    def record(self, product, receipt):
+        size_bytes = receipt.get("bytes", 0) or 0
+        duration = receipt.get("t_diff")
+        status = str(receipt.get("status", "UNKNOWN"))
+        row = {
+            "product": product,
+            "file_name": receipt.get("file_name"),
+            "status": "REQUEUED" if receipt.get("requeued") else ("ERROR" if status.startswith("ERROR") else status),
+            "worker": receipt.get("worker"),
+            "bytes": size_bytes,
+            "duration_sec": duration,
+            "mb_s": round(size_bytes / MB / duration, 3) if duration else None,
+            "retries": receipt.get("retries", 0),
+            "queue_wait_sec": receipt.get("queue_wait"),
+            "mode": receipt.get("mode"),
+            "resumed_mb": receipt.get("resumed_mb", 0),
+            "t_start": receipt.get("t_start"),
+            "t_end": receipt.get("t_end"),
+        }
+        with self._lock:
+            self._rows.append(row)
+
+    def add_section(self, name, data):
+        """Extra JSON block for the report (e.g. fn07 concurrency decisions)."""
+        self._sections[name] = data
+        return self
+
+    def stop(self):
+        if self._t1 is None:
+            self._t1 = time.monotonic()
+        return self
+
+    @property
+    def wall_sec(self):
+        return (self._t1 or time.monotonic()) - self._t0
+
+    def summary(self) -> dict:
+        with self._lock:
+            rows = list(self._rows)
+        by_product, by_worker = {}, {}
+        for r in rows:
+            by_product.setdefault(r["product"], []).append(r)
+            if r["worker"]:
+                by_worker.setdefault(r["worker"], []).append(r)
+        wall = self.wall_sec
+        return {
+            "session": {"label": self.label, "threads": self.threads,
+                        "started_at": self.started_at.strftime("%Y-%m-%d %H:%M:%S"),
+                        "wall_sec": round(wall, 3)},
+            "total": _aggregate(rows, wall),
+            "by_product": {p: _aggregate(rs, wall) for p, rs in sorted(by_product.items())},
+            "by_worker": {w: _aggregate(rs, wall) for w, rs in sorted(by_worker.items())},
+            **self._sections,
+        }
+
+    # --- output ---------------------------------------------------------------
+
+    def write_report(self, plan_folder, year, day, fmt="json"):
+        """Writes the report next to the plan. Returns its path (None for fmt='none')."""
+        if fmt == "none":
+            return None
+        path = get_metrics_report_path(plan_folder, year, day, self.label, self.started_at, fmt)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            rows = list(self._rows)
+
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8", newline="") as f:
+            if fmt == "csv":
+                writer = csv.DictWriter(f, fieldnames=_ROW_FIELDS)
+                writer.writeheader()
+                writer.writerows(rows)
+            else:
+                report = self.summary()
+                report["files"] = rows
+                json.dump(report, f, indent=2)
+        os.replace(tmp, path)
+        return path
+
+    def print_summary(self):
+        summary = self.summary()
+        for product, agg in summary["by_product"].items():
+            if not agg["files_ok"]:
+                continue
+            print(f"⏱️  {product:<15} p50 {agg['p50_sec']}s | p95 {agg['p95_sec']}s | p99 {agg['p99_sec']}s "
+                  f"| {agg['mb_s_wall']} MB/s wall ({agg['mb_s_transfer']} MB/s per transfer)")
+        workers = summary["by_worker"]
+        if workers:
+            rates = [agg["mb_s_transfer"] for agg in workers.values() if agg["mb_s_transfer"]]
+            if rates:
+                print(f"👷 Workers:          {len(workers)} active | per-worker MB/s min {min(rates)} / max {max(rates)}")
@@ -0,0 +1,129 @@
+"""
+Path: src/goes_processor/actions/a03_download/core01_download_from_s3/fn07_adaptive_concurrency.py
+Version: 0.1.0 (AIMD concurrency control)
+Description: Decides how many downloads fn04.run_session keeps in flight. After each
+             evaluation window it compares the aggregate throughput with the previous one:
+             - improving            -> +1 worker (additive increase)
+             - throttling, or error ratio above max_error_ratio -> x0.5 (multiplicative decrease)
+             - latency spike        -> x0.75
+             - worse after a raise  -> -1 (undo the last probe)
+             Always clamped to [floor, ceiling]. Every decision is logged and kept for the report.
+"""
+
+# 1. SYSTEM LAYER
+try:
+    import time
+    from statistics import median
+except ImportError as e:
+    print(f"\n[SYSTEM LIB ERROR] - Critical libraries missing: {e}\n")
+    raise SystemExit(1)
+
+YELLOW = "\033[93m"
+RESET = "\033[0m"
+
+MB = 1024 * 1024
+# Fragmentos que S3/botocore usan para indicar que nos están frenando.
+_THROTTLE_MARKERS = ("SlowDown", "503", "Throttl", "RequestLimitExceeded", "TooManyRequests")
+
+# =============================================================================
+# CONTROLLER
+# =============================================================================
+
+class AimdController:
+    """
+    limit    : current number of downloads allowed in flight (read by the dispatcher).
+    on_result: called with every finished receipt; may change `limit`.
+    """
+
+    def __init__(self, start, floor=1, ceiling=16, min_window=8, min_interval_sec=2.0,
+                 improve_ratio=1.05, spike_factor=2.0, max_error_ratio=0.1, verbose=True):
+        ctx = "[fn07_adaptive_concurrency.py - AimdController()]"
+        if not (1 <= floor <= ceiling):
+            raise ValueError(f"{ctx} Need 1 <= floor <= ceiling (got floor={floor}, ceiling={ceiling}).")
+        self.floor = int(floor)
+        self.ceiling = int(ceiling)
+        self.limit = min(max(int(start), self.floor), self.ceiling)
+        self.min_window = int(min_window)
+        self.min_interval_sec = float(min_interval_sec)
+        self.improve_ratio = float(improve_ratio)
+        self.spike_factor = float(spike_factor)
+        self.max_error_ratio = float(max_error_ratio)
+        self.verbose = verbose
+
+        self.history = []                # [{'t_sec', 'from', 'to', 'reason', 'mb_s', 'p50_sec'}]
+        self._t0 = time.monotonic()
+        self._last_mb_s = None
+        self._baseline_p50 = None        # EWMA de la latencia mediana en ventanas sanas
+        self._last_action = None
+        self._reset_window()
+
+    def _reset_window(self):
+        self._w_start = time.monotonic()
+        self._w_bytes = 0
+        self._w_durations = []
+        self._w_errors = 0
+        self._w_throttled = 0
+
+    # --- feed -----------------------------------------------------------------
+
+    def on_result(self, receipt):
+        status = str(receipt.get("status", ""))
+        if status == "SUCCESS":
+            self._w_bytes += receipt.get("bytes", 0) or 0
+            if receipt.get("t_diff") is not None:
+                self._w_durations.append(receipt["t_diff"])
+        elif status.startswith("ERROR"):
+            self._w_errors += 1
+            if any(m in status for m in _THROTTLE_MARKERS):
+                self._w_throttled += 1
+        else:
+            return                       # SKIPPED / NOT_FOUND no dicen nada del enlace
+
+        if self._w_throttled:
+            # S3 pidiendo que bajemos el ritmo: no esperamos al fin de la ventana.
+            self._evaluate()
+            return
+        finished = len(self._w_durations) + self._w_errors
+        if finished >= max(self.min_window, self.limit) and time.monotonic() - self._w_start >= self.min_interval_sec:
+            self._evaluate()
+
+    # --- decision -------------------------------------------------------------
+
+    def _evaluate(self):
+        elapsed = max(1e-6, time.monotonic() - self._w_start)
+        mb_s = self._w_bytes / MB / elapsed
+        p50 = median(self._w_durations) if self._w_durations else None
+        old = self.limit
+        finished = len(self._w_durations) + self._w_errors
+        error_ratio = self._w_errors / finished if finished else 0.0
+        unhealthy = self._w_throttled or error_ratio > self.max_error_ratio
+
+        if unhealthy:
+            new, reason = max(self.floor, int(old * 0.5)), (
+                f"{self._w_throttled} throttled" if self._w_throttled else f"error ratio {error_ratio:.0%}")
+        elif p50 is not None and self._baseline_p50 and p50 > self.spike_factor * self._baseline_p50:
+            new, reason = max(self.floor, int(old * 0.75)), (
+                f"latency spike p50 {p50:.2f}s vs {self._baseline_p50:.2f}s")
+        elif self._last_mb_s is None or mb_s >= self._last_mb_s * self.improve_ratio:
+            new, reason = min(self.ceiling, old + 1), "throughput improving"
+        elif self._last_action == "increase" and mb_s < self._last_mb_s / self.improve_ratio:
+            new, reason = max(self.floor, old - 1), "throughput fell after raise"
+        else:
+            new, reason = old, "throughput flat"
+
+        if p50 is not None and not unhealthy:
+            self._baseline_p50 = p50 if self._baseline_p50 is None else 0.8 * self._baseline_p50 + 0.2 * p50
+
+        self._last_action = "increase" if new > old else ("decrease" if new < old else "hold")
+        self._last_mb_s = mb_s
+        self.limit = new
+        self.history.append({"t_sec": round(time.monotonic() - self._t0, 3), "from": old, "to": new, "reason": reason,
+                             "mb_s": round(mb_s, 3), "p50_sec": round(p50, 3) if p50 is not None else None})
+        if self.verbose and new != old:
+            print(f"🎚️  {YELLOW}[ADAPTIVE]{RESET} workers {old} -> {new} | {reason} | {mb_s:.2f} MB/s")
+        self._reset_window()
+
+    def report(self) -> dict:
+        return {"floor": self.floor, "ceiling": self.ceiling, "final_limit": self.limit,
+                "max_limit": max([self.limit] + [h["to"] for h in self.history]),
+                "decisions": self.history}
@@ -0,0 +1,101 @@
+"""
+Path: src/goes_processor/actions/a03_download/core01_download_from_s3/fn08_transfer_integrity.py
+Version: 0.1.0 (Retry policy + streaming integrity checks)
+Description: Helpers shared by the single-GET and ranged transfer paths.
+             - Exponential backoff with full jitter, and which errors are worth retrying.
+             - ETag verification from MD5 digests computed while the bytes stream to disk
+               (no second read pass). Single-part ETags are the object MD5; multipart ETags
+               are MD5(concat(part MD5s))-N and can be checked when our ranges match the
+               upload parts. Anything else falls back to a size check.
+"""
+
+# 1. SYSTEM LAYER
+try:
+    import hashlib
+    import random
+except ImportError as e:
+    print(f"\n[SYSTEM LIB ERROR] - Critical libraries missing: {e}\n")
+    raise SystemExit(1)
+
+MB = 1024 * 1024
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF_SEC = 1.0
+MAX_BACKOFF_SEC = 30.0
+
+# Errores de S3 que no se arreglan reintentando.
+_FATAL_CODES = {"NoSuchKey", "NoSuchBucket", "AccessDenied", "403", "404", "InvalidRange"}
+
+# =============================================================================
+# RETRY POLICY
+# =============================================================================
+
+def backoff_delay(attempt: int, base_sec: float = DEFAULT_BACKOFF_SEC, cap_sec: float = MAX_BACKOFF_SEC) -> float:
+    """Full jitter: uniform(0, min(cap, base * 2**attempt)). attempt starts at 0."""
+    return random.uniform(0.0, min(cap_sec, base_sec * (2 ** attempt)))
+
+
+def is_retryable(exc: Exception) -> bool:
+    """Network resets, throttling, 5xx and integrity mismatches are retried; missing/forbidden keys are not."""
+    response = getattr(exc, "response", None)
+    if isinstance(response, dict):
+        code = str(response.get("Error", {}).get("Code", ""))
+        if code in _FATAL_CODES:
+            return False
+    return True
+
+# =============================================================================
+# INTEGRITY
+# =============================================================================
+
+def parse_etag(etag):
+    """'"<md5>"' -> (md5_hex, None) | '"<md5>-N"' -> (md5_hex, N) | None/odd -> (None, None)."""
+    etag = str(etag or "").strip('"').lower()
+    head, _, parts = etag.partition("-")
+    if len(head) != 32:
+        return None, None
+    return head, (int(parts) if parts.isdigit() else None)
+
+
+def _part_size_is_unambiguous(size, parts, part_size):
+    """
+    True if `part_size` is the only whole-MiB part size that splits `size` into `parts`
+    pieces, i.e. our ranges are guaranteed to be the uploader's parts.
+    """
+    if not part_size or part_size % MB:
+        return False
+    lo = -(-size // (parts * MB))                                  # P >= size / N
+    hi = (-(-size // ((parts - 1) * MB)) - 1) if parts > 1 else lo  # P <  size / (N - 1)
+    return lo == hi == part_size // MB
+
+
+def verify_transfer(expected_size, written, etag=None, whole_md5=None, part_md5s=None, part_size=None) -> str:
+    """
+    Compares what was streamed to disk with the S3 listing. Returns the method used
+    ('md5', 'multipart-md5' or 'size'); raises IOError on any mismatch.
+    """
+    if written != expected_size:
+        raise IOError(f"Integrity mismatch: wrote {written} bytes, S3 reports {expected_size}")
+
+    etag_md5, etag_parts = parse_etag(etag)
+    if etag_md5 is None:
+        return "size"
+
+    if etag_parts is None:
+        digest = whole_md5
+        if digest is None and part_md5s and len(part_md5s) == 1:
+            digest = part_md5s[0]
+        if digest is None:
+            return "size"
+        if digest != etag_md5:
+            raise IOError(f"Integrity mismatch: MD5 {digest} != ETag {etag_md5}")
+        return "md5"
+
+    # Multipart: sólo verificable si nuestros rangos coinciden con las partes del upload.
+    if not part_md5s or len(part_md5s) != etag_parts or any(d is None for d in part_md5s):
+        return "size"
+    if not _part_size_is_unambiguous(expected_size, etag_parts, part_size):
+        return "size"
+    combined = hashlib.md5(b"".join(bytes.fromhex(d) for d in part_md5s)).hexdigest()
+    if combined != etag_md5:
+        raise IOError(f"Integrity mismatch: multipart MD5 {combined}-{etag_parts} != ETag {etag_md5}-{etag_parts}")
+    return "multipart-md5"
@@ -0,0 +1,206 @@
+"""
+Path: src/goes_processor/actions/a03_download/core01_download_from_s3/fn09_slot_matcher.py
+Version: 0.1.0 (Tolerance-based slot matching)
+Description: Assigns real GOES files to the nominal slots of a plan by time, not by name prefix.
+             Start/end times are parsed from the keys (s/e tokens, tenths included) into
+             float64 arrays of seconds; every file goes to its nearest nominal slot with one
+             vectorized searchsorted, within a per-product tolerance. When several files land
+             on the same slot the nearest wins and the rest are reported as duplicates;
+             files too far from every slot are reported as unmatched.
+"""
+
+# 1. SYSTEM LAYER
+try:
+    import re
+    from pathlib import PurePosixPath
+except ImportError as e:
+    print(f"\n[SYSTEM LIB ERROR] - Critical libraries missing: {e}\n")
+    raise SystemExit(1)
+
+# Dependencia opcional: sin numpy los callers vuelven a la búsqueda slot a slot (S3ListingIndex.find).
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# 2. PROJECT LAYER
+try:
+    from goes_processor.SoT.goes_prod import get_product_info
+    from goes_processor.actions.a03_download.core01_download_from_s3.fn02_s3_listing_index import parse_start_token
+except ImportError as e:
+    print(f"\n[PROJECT LIB ERROR] - Internal modules missing: {e}\n")
+    raise SystemExit(1)
+
+_TIMES_RE = re.compile(r"_s(?P<start>\d{7,14})(?:_e(?P<end>\d{7,14}))?")
+
+# =============================================================================
+# 1. TOLERANCE
+# =============================================================================
+
+def is_available() -> bool:
+    return np is not None
+
+
+def resolve_match_tolerance(product_id: str, match_tolerance=None) -> float:
+    """Explicit value wins (0 = exact prefix only); None -> product default from the SoT."""
+    if match_tolerance is not None:
+        return float(match_tolerance)
+    return float(get_product_info(product_id).get("match_tolerance_sec", 0))
+
+# =============================================================================
+# 2. TIME PARSING (vectorized)
+# =============================================================================
+
+def tokens_to_seconds(tokens):
+    """
+    ['YYYYJJJ[HH[MM[SS[t]]]]', ...] -> float64 seconds since 1970-01-01 (NaN if invalid).
+    Missing trailing fields count as zero, like the nominal slot prefixes.
+    """
+    ctx = "[fn09_slot_matcher.py - tokens_to_seconds()]"
+    if np is None:
+        raise ValueError(f"{ctx} numpy is required for tolerance matching.")
+    padded = [tok.ljust(14, "0") if tok and tok.isdigit() and 7 <= len(tok) <= 14 else "-1" for tok in tokens]
+    v = np.array(padded, dtype=np.int64)
+    bad = v < 0
+    year = v // 10**10
+    jday = (v // 10**7) % 1000
+    hh, mm = (v // 10**5) % 100, (v // 10**3) % 100
+    ss, tenth = (v // 10) % 100, v % 10
+    days = (np.where(bad, 0, year) - 1970).astype("datetime64[Y]").astype("datetime64[D]").astype(np.int64) + jday - 1
+    seconds = days * 86400.0 + hh * 3600 + mm * 60 + ss + tenth / 10.0
+    seconds[bad] = np.nan
+    return seconds
+
+
+def key_times(keys):
+    """Object keys / file names -> (start_sec, end_sec) arrays. end is NaN when the key has no e-token."""
+    starts, ends = [], []
+    for key in keys:
+        m = _TIMES_RE.search(PurePosixPath(key).name)
+        starts.append(m.group("start") if m else "")
+        ends.append((m.group("end") or "") if m else "")
+    return tokens_to_seconds(starts), tokens_to_seconds(ends)
+
+# =============================================================================
+# 3. MATCHING
+# =============================================================================
+
+def match_times(slot_sec, file_sec, tolerance_sec, file_end=None):
+    """
+    Core assignment on plain arrays.
+    Returns (slot_of_file, delta, winner):
+      slot_of_file : index into slot_sec of the nearest slot, -1 if none within tolerance.
+      delta        : |file - slot| seconds (inf when unmatched).
+      winner       : True for the file kept by its slot: nearest start; on a tie the one that
+                     ends last (file_end), then the first one given.
+    """
+    slot_sec = np.asarray(slot_sec, dtype=np.float64)
+    file_sec = np.asarray(file_sec, dtype=np.float64)
+    n_files = len(file_sec)
+    slot_of_file = np.full(n_files, -1, dtype=np.int64)
+    delta = np.full(n_files, np.inf)
+    winner = np.zeros(n_files, dtype=bool)
+    if n_files == 0 or len(slot_sec) == 0:
+        return slot_of_file, delta, winner
+
+    order = np.argsort(slot_sec, kind="stable")
+    sorted_slots = slot_sec[order]
+    pos = np.searchsorted(sorted_slots, file_sec)
+    left = np.clip(pos - 1, 0, len(sorted_slots) - 1)
+    right = np.clip(pos, 0, len(sorted_slots) - 1)
+    d_left = np.abs(file_sec - sorted_slots[left])
+    d_right = np.abs(file_sec - sorted_slots[right])
+    nearest = np.where(d_right < d_left, right, left)
+    best = np.minimum(d_left, d_right)
+
+    ok = np.isfinite(best) & (best <= tolerance_sec)
+    slot_of_file[ok] = order[nearest[ok]]
+    delta[ok] = best[ok]
+
+    # Un ganador por slot: orden por (slot, delta, -fin, posición) y primer elemento de cada grupo.
+    matched = np.flatnonzero(ok)
+    if len(matched):
+        end = np.zeros(n_files) if file_end is None else np.nan_to_num(np.asarray(file_end, dtype=np.float64), nan=-np.inf)
+        ranked = matched[np.lexsort((matched, -end[matched], delta[matched], slot_of_file[matched]))]
+        first = np.ones(len(ranked), dtype=bool)
+        first[1:] = slot_of_file[ranked][1:] != slot_of_file[ranked][:-1]
+        winner[ranked[first]] = True
+    return slot_of_file, delta, winner
+
+
+def match_slots(init_names, objects, tolerance_sec: float) -> dict:
+    """
+    Plan slots ('<init_prefix>_s<YYYYJJJ...>') vs listed objects ({'Key', ...}).
+    Only objects with the same init prefix as the slot compete for it; objects outside the
+    slots' time span (+- tolerance) are ignored.
+
+    Returns:
+      assigned   : {init_name: obj}
+      delta_sec  : {init_name: seconds between nominal slot and file start}
+      missing    : [init_name] without any file in tolerance
+      unmatched  : [obj] too far from every slot
+      duplicates : {init_name: [obj, ...]} extra files that also fell on that slot (not assigned)
+    """
+    report = {"assigned": {}, "delta_sec": {}, "missing": [], "unmatched": [], "duplicates": {}}
+    slots_by_head, objs_by_head = {}, {}
+    for name in init_names:
+        parsed = parse_start_token(name)
+        if parsed is None:
+            report["missing"].append(name)
+            continue
+        slots_by_head.setdefault(parsed[0], []).append((name, parsed[1]))
+    for obj in objects:
+        parsed = parse_start_token(obj["Key"])
+        if parsed is None:
+            report["unmatched"].append(obj)
+            continue
+        objs_by_head.setdefault(parsed[0], []).append(obj)
+
+    for head in set(objs_by_head) - set(slots_by_head):
+        report["unmatched"].extend(objs_by_head[head])
+
+    for head, slots in slots_by_head.items():
+        objs = objs_by_head.get(head, [])
+        names = [name for name, _ in slots]
+        slot_sec = tokens_to_seconds([tok for _, tok in slots])
+        file_sec, file_end = key_times([obj["Key"] for obj in objs])
+        slot_of_file, delta, winner = match_times(slot_sec, file_sec, tolerance_sec, file_end)
+        # Fuera del rango de los slots (+- tolerancia) no es "sin slot": pertenece a otra ventana.
+        in_span = (file_sec >= np.nanmin(slot_sec) - tolerance_sec) & (file_sec <= np.nanmax(slot_sec) + tolerance_sec)
+
+        for i, obj in enumerate(objs):
+            s = slot_of_file[i]
+            if s < 0 and not in_span[i]:
+                continue
+            if s < 0:
+                report["unmatched"].append(obj)
+            elif winner[i]:
+                report["assigned"][names[s]] = obj
+                report["delta_sec"][names[s]] = round(float(delta[i]), 1)
+            else:
+                report["duplicates"].setdefault(names[s], []).append(obj)
+        report["missing"].extend(name for name in names if name not in report["assigned"])
+    return report
+
+
+def assign_slots(listing_index, init_names, tolerance_sec: float):
+    """
+    Matches a group of slots (typically one hour) against what an S3ListingIndex holds so far
+    and pins the winners, so the per-slot find() of the workers returns them directly.
+    Returns the match report, or None when tolerance matching is off or numpy is missing.
+    """
+    if np is None or not tolerance_sec or tolerance_sec <= 0:
+        return None
+    init_names = list(init_names)
+    report = match_slots(init_names, listing_index.candidates_near(init_names, tolerance_sec), tolerance_sec)
+    listing_index.pin_assignments(report["assigned"])
+    return report
+
+
+def summarize_match(report: dict) -> dict:
+    """Counters for console / metrics: how many slots needed the tolerance, duplicates, strays."""
+    shifted = sum(1 for name, obj in report["assigned"].items()
+                  if not parse_start_token(obj["Key"])[1].startswith(parse_start_token(name)[1]))
+    return {"assigned": len(report["assigned"]), "shifted": shifted, "missing": len(report["missing"]),
+            "unmatched": len(report["unmatched"]),
+            "duplicates": sum(len(objs) for objs in report["duplicates"].values())}
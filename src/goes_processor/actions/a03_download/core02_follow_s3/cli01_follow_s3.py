@@ -0,0 +1,62 @@
+"""
+Path: src/goes_processor/actions/a03_download/core02_follow_s3/cli01_follow_s3.py
+Version: 0.1.2 (Near-real-time follow mode + metrics / adaptive concurrency / re-queue)
+"""
+import click
+
+GREEN = "\033[92m"
+RED = "\033[91m"
+RESET = "\033[0m"
+
+try:
+    from goes_processor.actions.a03_download.core02_follow_s3.code01_follow_s3_engine import execute_s3_follow
+    from goes_processor.SoT.goes_prod import AVAILABLE_GOES_PRODUCTS
+except ImportError as e:
+    print(f"{RED}❌ Critical Import Error:{RESET} {e}")
+    execute_s3_follow = None
+    AVAILABLE_GOES_PRODUCTS = None
+
+@click.command(name="follow")
+@click.option('--sat-position', required=True, type=click.Choice(['east', 'west']))
+@click.option('--product', required=True, help="Product name or 'ALL'")
+@click.option('--threads', default=4, type=int, help='Download workers shared by every followed product.')
+@click.option('--duration', default=0, type=float, help='Stop after N seconds (0 = run until Ctrl+C).')
+@click.option('--min-poll', default=5.0, type=float,
+              help="Lower bound for the poll interval (s). The interval itself derives from the product's cadence.")
+@click.option('--transfer-mode', default='auto', type=click.Choice(['auto', 'single', 'ranged']),
+              help="Same transfer path as run-download-s3.")
+@click.option('--part-size-mb', default=8.0, type=float, help='Byte-range size for ranged transfers (MB).')
+@click.option('--part-threads', default=4, type=int, help='Parallel ranges per file in ranged transfers.')
+@click.option('--retries', default=3, type=int, help='Retries per transfer (exponential backoff with jitter).')
+@click.option('--retry-backoff', default=1.0, type=float, help='Base backoff in seconds (doubles per retry, capped at 30 s).')
+@click.option('--requeue', default=1, type=int,
+              help='Polls on which a file that still fails is tried again before follow mode gives it up.')
+@click.option('--metrics', 'metrics_format', default='json', type=click.Choice(['json', 'csv', 'none']),
+              help='Per-session throughput/latency report written next to the day plan (JSON summary+rows or CSV rows).')
+@click.option('--adaptive', is_flag=True, default=False,
+              help='AIMD concurrency: start at --threads, grow while throughput improves, back off on errors/latency spikes.')
+@click.option('--min-threads', default=1, type=int, help='Adaptive floor (workers).')
+@click.option('--max-threads', default=16, type=int, help='Adaptive ceiling (workers).')
+def follow_command(sat_position, product, threads, duration, min_poll, transfer_mode, part_size_mb, part_threads,
+                   retries, retry_backoff, requeue, metrics_format, adaptive, min_threads, max_threads):
+    """
+    Sigue S3 en tiempo casi real: descarga cada archivo nuevo apenas se publica y actualiza el plan del día.
+    """
+    if execute_s3_follow is None:
+        click.echo(f"{RED}🚫 Logic engine (core02) is unavailable.{RESET}", err=True)
+        return
+
+    if product.upper() == "ALL":
+        if not AVAILABLE_GOES_PRODUCTS:
+            click.echo(f"{RED}❌ No products found in SoT/goes_prod.py{RESET}", err=True)
+            return
+        products = list(AVAILABLE_GOES_PRODUCTS)
+        click.echo(f"📦 {GREEN}EXPANDING 'ALL':{RESET} Found {len(products)} products in SoT.")
+    else:
+        products = [product]
+
+    execute_s3_follow(sat_position, products, threads=threads, duration=duration,
+                      min_poll=min_poll, transfer_mode=transfer_mode, part_size_mb=part_size_mb,
+                      part_threads=part_threads, retries=retries, backoff_sec=retry_backoff, requeue=requeue,
+                      metrics_format=metrics_format, adaptive=adaptive, min_threads=min_threads,
+                      max_threads=max_threads)
@@ -0,0 +1,383 @@
+"""
+Path: src/goes_processor/actions/a03_download/core02_follow_s3/code01_follow_s3_engine.py
+Version: 0.1.4 (Near-real-time follow mode + nearest-time slot matching + typed plan model
+         + shared transfer options + session metrics + adaptive concurrency + re-queue)
+Description: Long-running poller for new GOES files. Every product polls its current hour
+             prefix with a StartAfter cursor on its own asyncio task; new keys go straight
+             to the core01 transfer path and the day plan is updated through its journal.
+             Poll intervals derive from 'time_lapse' / 'default_time' in SoT/goes_prod.py.
+             Every receipt feeds the session metrics (fn06) and, with --adaptive, the AIMD
+             controller (fn07) that sets how many transfers run at once. An object whose
+             transfer still fails after its retries is tried again on the next polls
+             (--requeue times) and only then given up.
+"""
+
+# 1. SYSTEM LAYER
+try:
+    import asyncio
+    import re
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from datetime import datetime, timezone, timedelta
+    from pathlib import Path
+except ImportError as e:
+    print(f"\n[SYSTEM LIB ERROR] - Critical libraries missing: {e}\n")
+    raise SystemExit(1)
+
+# 2. PROJECT LAYER
+try:
+    from goes_processor.SoT.goes_hardcoded_folders import get_my_path
+    from goes_processor.SoT.goes_sat import get_goes_id_by_julian_date, get_goes_bucket
+    from goes_processor.SoT.goes_prod import SAVED_INFO_PROD_GOES
+    from goes_processor.actions.a02_planning.core01_planner_download.code01_gen_plan_download import execute_gen_plan
+    from goes_processor.actions.a02_planning.core01_planner_download.fn01_file_name_plan_download import get_plan_download_file_path
+    from goes_processor.actions.a02_planning.core01_planner_download.fn02_plan_journal import PlanJournal
+    from goes_processor.actions.a02_planning.core01_planner_download.fn04_plan_codec import load_plan_model
+    from goes_processor.actions.a03_download.core01_download_from_s3.code01_download_s3_engine import (
+        _execute_transfer_v108, build_client_pool, build_concurrency, build_transfer_opts, print_concurrency_stats
+    )
+    from goes_processor.actions.a03_download.core01_download_from_s3.fn03_ranged_transfer import (
+        DEFAULT_PART_SIZE_MB, DEFAULT_PART_THREADS
+    )
+    from goes_processor.actions.a03_download.core01_download_from_s3.fn08_transfer_integrity import (
+        DEFAULT_RETRIES, DEFAULT_BACKOFF_SEC
+    )
+    from goes_processor.actions.a03_download.core01_download_from_s3.fn02_s3_listing_index import parse_start_token
+    from goes_processor.actions.a03_download.core01_download_from_s3.fn04_session_dispatcher import list_prefix
+    from goes_processor.actions.a03_download.core01_download_from_s3.fn05_s3_manifest_cache import S3ManifestCache
+    from goes_processor.actions.a03_download.core01_download_from_s3.fn06_session_metrics import SessionMetrics
+    from goes_processor.actions.a03_download.core01_download_from_s3.fn09_slot_matcher import (
+        is_available, match_times, resolve_match_tolerance, tokens_to_seconds
+    )
+except ImportError as e:
+    print(f"\n[PROJECT LIB ERROR] - Internal modules missing: {e}\n")
+    raise SystemExit(1)
+
+GREEN = "\033[92m"
+YELLOW = "\033[93m"
+RESET = "\033[0m"
+
+# Al cambiar de hora seguimos mirando la hora anterior un rato (archivos tardíos).
+PREVIOUS_HOUR_GRACE_SEC = 10 * 60
+
+# =============================================================================
+# 1. POLL INTERVALS FROM SoT
+# =============================================================================
+
+_TIME_LAPSE_RE = re.compile(r"^(\d+)(sec|min|hour)$")
+_UNIT_SEC = {"sec": 1, "min": 60, "hour": 3600}
+
+def get_product_cadence_sec(product_id: str) -> float:
+    """
+    Smallest of 'time_lapse' and the step of 'default_time' (seconds > minutes > hours).
+    GLM -> 20 s, MCMIPF/FDCF -> 600 s, LSTF -> 3600 s.
+    """
+    ctx = "[code01_follow_s3_engine.py - get_product_cadence_sec()]"
+    info = SAVED_INFO_PROD_GOES[product_id]
+
+    m = _TIME_LAPSE_RE.match(str(info["time_lapse"]))
+    if not m:
+        raise ValueError(f"{ctx} Unsupported time_lapse '{info['time_lapse']}' for {product_id}.")
+    lapse = int(m.group(1)) * _UNIT_SEC[m.group(2)]
+
+    d_time = info["default_time"]
+    for field, unit in (("seconds", 1), ("minutes", 60), ("hours", 3600)):
+        values = d_time.get(field)
+        if values and len(values) > 1:
+            return float(min(lapse, (int(values[1]) - int(values[0])) * unit))
+    return float(lapse)
+
+
+def get_poll_bounds(product_id: str, min_poll: float = 5.0) -> tuple:
+    """(base, max) poll interval: base = cadence/4, idle back-off up to cadence/2."""
+    cadence = get_product_cadence_sec(product_id)
+    base = max(min_poll, cadence / 4.0)
+    return base, max(base, cadence / 2.0)
+
+# =============================================================================
+# 2. PER-PRODUCT FOLLOWER
+# =============================================================================
+
+def _utc_now():
+    return datetime.now(timezone.utc)
+
+
+class _TransferGate:
+    """
+    In-flight transfer limit shared by every follower (they run on the same event loop).
+    With an AIMD controller the limit follows controller.limit, like fn04's dispatch window.
+    """
+
+    def __init__(self, threads, controller=None):
+        self.threads = threads
+        self.controller = controller
+        self._in_flight = 0
+        self._cond = None
+
+    @property
+    def limit(self):
+        return self.controller.limit if self.controller is not None else self.threads
+
+    async def __aenter__(self):
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+
+    async def __aexit__(self, *exc):
+        async with self._cond:
+            self._in_flight -= 1
+            # El límite pudo cambiar (AIMD): todos los que esperan vuelven a mirar.
+            self._cond.notify_all()
+        return False
+
+
+class _DayContext:
+    """Bucket, plan journal, slot map and S3 manifest of one (year, day) for one product."""
+
+    def __init__(self, sat_position, product, year, day):
+        sat_id = get_goes_id_by_julian_date(year, day, sat_position=sat_position)
+        self.bucket = get_goes_bucket(sat_id)
+        path_plan = get_plan_download_file_path(year, day, sat_id, sat_position, product)
+        if not path_plan.exists():
+            execute_gen_plan(sat_position, product, year, day, False, False)
+
+        self.journal = PlanJournal(path_plan, compact_every=20).recover()
+        inventory = load_plan_model(path_plan).slots
+        self.slot_map = {slot.time_stamp: key for key, slot in inventory.items()}
+        self.slot_len = len(next(iter(self.slot_map), ""))
+        self.manifest = S3ManifestCache(self.bucket, product, year, day)
+        # Slots nominales en segundos: un archivo corrido unos segundos va al slot más cercano.
+        self.tolerance = resolve_match_tolerance(product)
+        self.slot_stamps = list(self.slot_map)
+        self.slot_sec = tokens_to_seconds(self.slot_stamps) if is_available() and self.tolerance > 0 else None
+
+    def file_key_for(self, s3_key):
+        parsed = parse_start_token(s3_key)
+        if not parsed:
+            return None
+        exact = self.slot_map.get(parsed[1][:self.slot_len])
+        if exact is not None or self.slot_sec is None:
+            return exact
+        slot_of_file, _, _ = match_times(self.slot_sec, tokens_to_seconds([parsed[1]]), self.tolerance)
+        return self.slot_map[self.slot_stamps[slot_of_file[0]]] if slot_of_file[0] >= 0 else None
+
+    def close(self):
+        self.journal.close()
+        self.manifest.save()
+
+
+class ProductFollower:
+    """StartAfter cursors + adaptive poll interval for one product (rolls over by day)."""
+
+    def __init__(self, sat_position, product, client_pool, executor, transfer_opts, min_poll=5.0,
+                 gate=None, metrics=None, concurrency=None, requeue=0):
+        self.sat_position = sat_position
+        self.product = product
+        self.client_pool = client_pool
+        self.executor = executor
+        self.transfer_opts = transfer_opts
+        self.gate = gate or _TransferGate(1)
+        self.metrics = metrics
+        self.concurrency = concurrency
+        self.requeue = max(0, int(requeue))
+        self.base_poll, self.max_poll = get_poll_bounds(product, min_poll)
+        self.poll = self.base_poll
+        self.cursors = {}          # {prefix_hour: last key seen}
+        self.days = {}             # {(year, day): _DayContext}
+        self.pending = {}          # {s3 key: ((year, day), obj, failed attempts)} a reintentar
+        self.stats = {"polls": 0, "new_keys": 0, "downloaded": 0, "failed": 0, "skipped": 0,
+                      "requeued": 0, "latency_sum": 0.0}
+
+    def _prefixes_to_poll(self, now):
+        """[(year, day, prefix_hour)] for the current hour (+ previous hour during the grace window)."""
+        hours = [now]
+        if (now - now.replace(minute=0, second=0, microsecond=0)).total_seconds() < PREVIOUS_HOUR_GRACE_SEC:
+            hours.insert(0, now - timedelta(hours=1))
+        return [(t.strftime("%Y"), t.strftime("%j"), f"{self.product}/{t.strftime('%Y/%j/%H')}") for t in hours]
+
+    def _sync_days(self, targets):
+        """Opens day contexts that became active and closes the ones left behind (runs in a worker)."""
+        wanted = {(year, day) for year, day, _ in targets}
+        for day_key in [k for k in self.days if k not in wanted]:
+            self.days.pop(day_key).close()
+            # Los reintentos de un día que ya no se sigue quedan para run-download-s3.
+            for key in [k for k, (d, _, _) in self.pending.items() if d == day_key]:
+                self.pending.pop(key)
+                self.stats["failed"] += 1
+        for day_key in wanted - set(self.days):
+            self.days[day_key] = _DayContext(self.sat_position, self.product, *day_key)
+
+    # --- transfer -----------------------------------------------------------
+
+    def _handle_new_object(self, day_ctx, obj):
+        """Runs in a worker thread: existing transfer path + plan journal receipt."""
+        key = obj["Key"]
+        _, year, day, hh = key.rsplit("/", 1)[0].split("/")
+        local_folder = get_my_path("data_raw") / day_ctx.bucket / self.product / year / day / hh
+        local_folder.mkdir(parents=True, exist_ok=True)
+        final_path = local_folder / Path(key).name
+        file_key = day_ctx.file_key_for(key)
+
+        if final_path.exists() and final_path.stat().st_size == obj["Size"]:
+            if file_key: day_ctx.journal.append(file_key, exists_online=True)
+            return {"status": "SKIPPED", "size_mb": 0, "file_name": final_path.name}
+
+        receipt = _execute_transfer_v108(self.client_pool, day_ctx.bucket, obj, local_folder, self.transfer_opts)
+        if file_key:
+            day_ctx.journal.append(file_key, exists_online=True, receipt=receipt)
+        receipt["worker"] = threading.current_thread().name
+        return receipt
+
+    async def _transfer(self, day_ctx, obj):
+        """One object through the shared gate; the receipt feeds metrics and AIMD (re-queued attempts too)."""
+        loop = asyncio.get_running_loop()
+        async with self.gate:
+            receipt = await loop.run_in_executor(self.executor, self._handle_new_object, day_ctx, obj)
+        failed = str(receipt.get("status", "")).startswith("ERROR")
+        attempts = self.pending.pop(obj["Key"], (None, None, 0))[2] + (1 if failed else 0)
+        if failed and attempts <= self.requeue:
+            receipt["requeued"] = True
+            _, year, day, _ = obj["Key"].rsplit("/", 1)[0].split("/")
+            self.pending[obj["Key"]] = ((year, day), obj, attempts)
+        if self.metrics is not None:
+            self.metrics.record(self.product, receipt)
+        if self.concurrency is not None:
+            self.concurrency.on_result(receipt)
+        return receipt
+
+    # --- async loop ---------------------------------------------------------
+
+    async def poll_once(self):
+        loop = asyncio.get_running_loop()
+        targets = self._prefixes_to_poll(_utc_now())
+        await loop.run_in_executor(self.executor, self._sync_days, targets)
+
+        new_objects = []
+        for year, day, prefix_hour in targets:
+            day_ctx = self.days[(year, day)]
+            listed = await loop.run_in_executor(self.executor, list_prefix, self.client_pool,
+                                                day_ctx.bucket, prefix_hour, self.cursors.get(prefix_hour))
+            if listed:
+                self.cursors[prefix_hour] = max(o["Key"] for o in listed)
+                day_ctx.manifest.merge_hour(prefix_hour, listed)
+                new_objects.extend((day_ctx, obj) for obj in listed)
+
+        # Olvidamos cursores de horas que ya no se consultan.
+        active = {p for _, _, p in targets}
+        self.cursors = {p: c for p, c in self.cursors.items() if p in active}
+        self.stats["polls"] += 1
+        self.stats["new_keys"] += len(new_objects)
+
+        # Fallidos de polls anteriores: el cursor ya los pasó, vuelven desde la cola propia.
+        listed_keys = {obj["Key"] for _, obj in new_objects}
+        new_objects.extend((self.days[day_key], obj) for key, (day_key, obj, _) in self.pending.items()
+                           if key not in listed_keys and day_key in self.days)
+
+        if not new_objects:
+            self.poll = min(self.max_poll, self.poll * 1.5)
+            return
+
+        self.poll = self.base_poll
+        receipts = await asyncio.gather(*[self._transfer(ctx, obj) for ctx, obj in new_objects])
+        for (_, obj), receipt in zip(new_objects, receipts):
+            name = Path(obj["Key"]).name
+            if receipt.get("requeued"):
+                self.stats["requeued"] += 1
+                attempts = self.pending[obj["Key"]][2]
+                print(f"🔁 [REQUEUE {attempts}/{self.requeue}] {self.product} {name} | {receipt['status']} - next poll")
+            elif receipt["status"] == "SUCCESS":
+                self.stats["downloaded"] += 1
+                published = obj.get("LastModified")
+                lag = (_utc_now() - published).total_seconds() if published else None
+                if lag is not None: self.stats["latency_sum"] += lag
+                lag_txt = f" | publish→disk {lag:.1f}s" if lag is not None else ""
+                print(f"📥 {GREEN}[FOLLOW]{RESET} {self.product} {name}{lag_txt}")
+            elif receipt["status"] == "SKIPPED":
+                self.stats["skipped"] += 1
+            else:
+                self.stats["failed"] += 1
+                print(f"❌ [FOLLOW] {self.product} {name} | {receipt['status']} - given up")
+        for day_ctx in self.days.values():
+            day_ctx.manifest.save()
+
+    async def run(self, stop_at):
+        print(f"👀 {self.product}: poll every {self.base_poll:.0f}s (idle back-off up to {self.max_poll:.0f}s)")
+        while stop_at is None or time.monotonic() < stop_at:
+            try:
+                await self.poll_once()
+            except Exception as e:
+                # Un fallo de red no mata el seguimiento: reintentamos en el próximo ciclo.
+                print(f"⚠️  {YELLOW}[FOLLOW]{RESET} {self.product} poll failed: {e}")
+                self.poll = min(self.max_poll, self.poll * 2)
+            sleep = self.poll if stop_at is None else min(self.poll, max(0.0, stop_at - time.monotonic()))
+            await asyncio.sleep(sleep)
+
+    def close(self):
+        for day_ctx in self.days.values():
+            day_ctx.close()
+        self.days = {}
+
+# =============================================================================
+# 3. ORCHESTRATOR
+# =============================================================================
+
+def execute_s3_follow(sat_position, products, threads=4, duration=0, min_poll=5.0, transfer_mode="auto",
+                      part_size_mb=DEFAULT_PART_SIZE_MB, part_threads=DEFAULT_PART_THREADS, retries=DEFAULT_RETRIES,
+                      backoff_sec=DEFAULT_BACKOFF_SEC, requeue=1, metrics_format="json", adaptive=False,
+                      min_threads=1, max_threads=16):
+    """
+    Follows every product until Ctrl+C (or `duration` seconds if > 0).
+    Transfers use the same options as run-download-s3 (ranged parts, retries, verification).
+    """
+    pool_size, controller = build_concurrency(threads, adaptive, min_threads, max_threads)
+    workers_txt = f"{controller.limit} (adaptive {controller.floor}-{controller.ceiling})" if controller else threads
+
+    print("\n" + "👀" * 30)
+    print(f"🛰️  GOES-PROCESSOR FOLLOW MODE | v.0.1.4")
+    print(f"📦 PRODUCTS: {', '.join(products)} | WORKERS: {workers_txt} | POSITION: {sat_position}")
+    print(f"🔧 TRANSFER: {transfer_mode} ({part_size_mb} MB x {part_threads}) | RETRIES: {retries} | REQUEUE: {requeue}")
+    print("👀" * 30 + "\n")
+
+    client_pool = build_client_pool(pool_size, transfer_mode, part_threads)
+    transfer_opts = build_transfer_opts(transfer_mode, part_size_mb, part_threads, retries, backoff_sec)
+    executor = ThreadPoolExecutor(max_workers=pool_size + len(products), thread_name_prefix="follow-worker")
+    gate = _TransferGate(threads, controller)
+    metrics = SessionMetrics("FOLLOW", pool_size)
+    followers = [ProductFollower(sat_position, p, client_pool, executor, transfer_opts, min_poll, gate, metrics,
+                                 controller, requeue) for p in products]
+
+    async def _main():
+        stop_at = time.monotonic() + duration if duration and duration > 0 else None
+        await asyncio.gather(*[f.run(stop_at) for f in followers])
+
+    try:
+        asyncio.run(_main())
+    except KeyboardInterrupt:
+        print("\n⚠️  [INTERRUPTED] Stopping follow mode...")
+    finally:
+        for f in followers:
+            f.close()
+        executor.shutdown(wait=True, cancel_futures=True)
+        client_pool.close()
+
+    metrics.stop()
+    if controller is not None: metrics.add_section("adaptive_concurrency", controller.report())
+    today = _utc_now()
+    report_path = metrics.write_report(get_my_path("data_plan") / today.strftime("%Y") / today.strftime("%j"),
+                                       today.strftime("%Y"), today.strftime("%j"), metrics_format)
+
+    print(f"\n" + "═"*60)
+    print(f"🏁 FOLLOW SESSION SUMMARY | {_utc_now().strftime('%Y-%m-%d %H:%M:%S')} UTC")
+    print(f"═"*60)
+    for f in followers:
+        s = f.stats
+        avg = f" | avg publish→disk {s['latency_sum'] / s['downloaded']:.1f}s" if s["downloaded"] else ""
+        print(f"📦 {f.product:<15} polls {s['polls']:>5} | new {s['new_keys']:>5} | ok {s['downloaded']:>5} "
+              f"| skipped {s['skipped']:>4} | re-queued {s['requeued']:>3} | failed {s['failed']:>3}{avg}")
+    print_concurrency_stats(controller)
+    metrics.print_summary()
+    if report_path: print(f"📈 Metrics Report:   {report_path.name}")
+    print("═"*60 + "\n")
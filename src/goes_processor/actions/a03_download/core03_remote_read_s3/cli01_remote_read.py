@@ -0,0 +1,48 @@
+"""
+Path: src/goes_processor/actions/a03_download/core03_remote_read_s3/cli01_remote_read.py
+Version: 0.1.0 (Remote read of selected NetCDF variables)
+"""
+import click
+
+RED = "\033[91m"
+RESET = "\033[0m"
+
+try:
+    from goes_processor.actions.a03_download.core03_remote_read_s3.code01_remote_read_engine import execute_s3_remote_read
+    from goes_processor.actions.a03_download.core03_remote_read_s3.fn01_remote_variables import parse_window
+    from goes_processor.actions.a03_download.core01_download_from_s3.fn04_session_dispatcher import parse_hours_filter
+    from goes_processor.actions.a02_planning.core01_planner_download.fn03_time_window import parse_time_window
+except ImportError as e:
+    print(f"{RED}❌ Critical Import Error:{RESET} {e}")
+    execute_s3_remote_read = None
+
+@click.command(name="run-remote-read")
+@click.option('--sat-position', required=True, type=click.Choice(['east', 'west']))
+@click.option('--product', required=True, type=str)
+@click.option('--year', required=True, type=int)
+@click.option('--day', required=True, type=str)
+@click.option('--variables', default=None, type=str,
+              help="Comma list (e.g. 'Mask,Power'). Default: FDCF Mask/Power/Temp/Area, GLM flash_lat/lon/energy, LSTF LST.")
+@click.option('--window', default=None, type=str, help="Pixel window 'y0:y1,x0:x1' for raster products (default: full disk).")
+@click.option('--hours', default=None, type=str, help="Only these hours (e.g. '00,05,12-14').")
+@click.option('--start-time', default=None, type=str, help="Window start (inclusive), e.g. '11:00'.")
+@click.option('--end-time', default=None, type=str, help="Window end (exclusive), e.g. '13:00'.")
+@click.option('--slots', default=None, type=str, help="Explicit slot list, e.g. '11:00,11:10'.")
+@click.option('--threads', default=8, type=int, help='Files read in parallel.')
+@click.option('--block-size-mb', default=2.0, type=float, help='Byte-range block size for the remote file reader (MB).')
+@click.option('--overwrite', default=False, type=bool, help='Re-read files already in the compact cache.')
+def remote_read_command(sat_position, product, year, day, variables, window, hours, start_time, end_time, slots,
+                        threads, block_size_mb, overwrite):
+    """
+    Lee sólo las variables necesarias directo de S3 (byte ranges) y las guarda en data_remote/.
+    """
+    if execute_s3_remote_read is None:
+        click.echo(f"{RED}🚫 Logic engine (core03) is unavailable.{RESET}", err=True)
+        return
+    try:
+        execute_s3_remote_read(sat_position, product, year, day, variables=variables, window=parse_window(window),
+                               hours=parse_hours_filter(hours), threads=threads, overwrite=overwrite,
+                               block_size_mb=block_size_mb,
+                               time_window=parse_time_window(start_time, end_time, slots))
+    except ValueError as e:
+        click.echo(f"{RED}❌ {e}{RESET}", err=True)
@@ -0,0 +1,240 @@
+"""
+Path: src/goes_processor/actions/a03_download/core03_remote_read_s3/code01_remote_read_engine.py
+Version: 0.1.4 (Remote read of selected NetCDF variables + deferred HDF5 stack + typed plan model)
+Description: Instead of downloading whole files, opens every planned object over HTTP byte
+             ranges (s3fs + h5netcdf) and reads only the requested variables / window.
+             HDF5 fetches just the chunks it touches, so a fire or lightning day moves a
+             fraction of the bytes. Results land in a compact .npz cache (raw packed
+             values + attributes as JSON) under data_remote/.
+             numpy / fsspec / h5netcdf are imported on first use, not when the CLI loads.
+"""
+
+# 1. SYSTEM LAYER
+try:
+    import json
+    import os
+    import time
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from datetime import datetime
+    from pathlib import Path
+except ImportError as e:
+    print(f"\n[SYSTEM LIB ERROR] - Critical libraries missing: {e}\n")
+    raise SystemExit(1)
+
+# Dependencias opcionales: sólo este modo las necesita, el resto del CLI no debe caerse sin ellas.
+# Se importan recién en _load_remote_stack() (h5netcdf arrastra h5py: no lo paga el arranque del CLI).
+np = fsspec = h5netcdf = None
+
+# 2. PROJECT LAYER
+try:
+    from goes_processor.SoT.goes_sat import get_goes_id_by_julian_date
+    from goes_processor.actions.a02_planning.core01_planner_download.fn01_file_name_plan_download import get_plan_download_file_path
+    from goes_processor.actions.a02_planning.core01_planner_download.fn04_plan_codec import load_plan_model
+    from goes_processor.actions.a03_download.core01_download_from_s3.fn01_s3_client_pool import S3ClientPool
+    from goes_processor.actions.a03_download.core01_download_from_s3.fn02_s3_listing_index import S3ListingIndex
+    from goes_processor.actions.a03_download.core01_download_from_s3.fn04_session_dispatcher import (
+        group_slots_by_hour, list_prefix
+    )
+    from goes_processor.actions.a03_download.core01_download_from_s3.fn05_s3_manifest_cache import S3ManifestCache
+    from goes_processor.actions.a03_download.core01_download_from_s3.fn09_slot_matcher import (
+        assign_slots, resolve_match_tolerance
+    )
+    from goes_processor.actions.a03_download.core03_remote_read_s3.fn01_remote_variables import (
+        GLOBAL_ATTRS, get_remote_variables, get_window_tag, get_remote_cache_path
+    )
+except ImportError as e:
+    print(f"\n[PROJECT LIB ERROR] - Internal modules missing: {e}\n")
+    raise SystemExit(1)
+
+GREEN = "\033[92m"
+RESET = "\033[0m"
+MB = 1024 * 1024
+DEFAULT_BLOCK_SIZE_MB = 2
+
+# =============================================================================
+# 1. REMOTE READ OF ONE OBJECT
+# =============================================================================
+
+def _jsonable(value):
+    """HDF5 attributes come as numpy scalars/arrays/bytes; the cache stores them as JSON."""
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return value
+
+
+def _window_index(dimensions, window):
+    if window is None:
+        return ()
+    return tuple(window.get(dim, slice(None)) for dim in dimensions)
+
+
+def read_remote_variables(fs, bucket, s3_key, variables, window=None, block_size_mb=DEFAULT_BLOCK_SIZE_MB):
+    """
+    Returns ({name: (array, attrs, dims)}, global_attrs, bytes_requested).
+    Variables missing in the file raise KeyError (wrong --variables for the product).
+    """
+    with fs.open(f"{bucket}/{s3_key}", "rb", block_size=int(block_size_mb * MB), cache_type="blockcache") as fobj:
+        with h5netcdf.File(fobj, "r") as ds:
+            out = {}
+            for name in variables:
+                if name not in ds.variables:
+                    raise KeyError(f"variable '{name}' not in {Path(s3_key).name}")
+                var = ds.variables[name]
+                data = var[_window_index(var.dimensions, window)] if var.ndim else var[()]
+                attrs = {k: _jsonable(v) for k, v in var.attrs.items()}
+                out[name] = (np.asarray(data), attrs, list(var.dimensions))
+            global_attrs = {k: _jsonable(ds.attrs[k]) for k in GLOBAL_ATTRS if k in ds.attrs}
+        requested = getattr(getattr(fobj, "cache", None), "total_requested_bytes", None)
+    return out, global_attrs, requested
+
+
+def write_compact_cache(cache_path: Path, variables: dict, global_attrs: dict, source: dict):
+    """Raw (still packed) arrays + one '__meta__' JSON entry; atomic via temp + os.replace."""
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    meta = {"source": source, "global_attrs": global_attrs,
+            "variables": {name: {"attrs": attrs, "dims": dims} for name, (_, attrs, dims) in variables.items()}}
+    arrays = {name: data for name, (data, _, _) in variables.items()}
+    arrays["__meta__"] = np.array(json.dumps(meta))
+
+    tmp = cache_path.with_name(cache_path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        np.savez_compressed(f, **arrays)
+    os.replace(tmp, cache_path)
+
+
+def _load_remote_stack():
+    """Imports numpy, fsspec and h5netcdf once. Returns the ImportError, or None when available."""
+    global np, fsspec, h5netcdf
+    if h5netcdf is not None:
+        return None
+    try:
+        import numpy as _np
+        import fsspec as _fsspec
+        import h5netcdf as _h5netcdf
+    except ImportError as e:
+        return e
+    np, fsspec, h5netcdf = _np, _fsspec, _h5netcdf
+    return None
+
+
+def load_compact_cache(cache_path):
+    """({name: array}, meta) from a cache file written by write_compact_cache."""
+    ctx = "[code01_remote_read_engine.py - load_compact_cache()]"
+    error = _load_remote_stack()
+    if error is not None:
+        raise ValueError(f"{ctx} Reading the cache needs numpy: {error}")
+    with np.load(cache_path, allow_pickle=False) as z:
+        meta = json.loads(str(z["__meta__"]))
+        return {k: z[k] for k in z.files if k != "__meta__"}, meta
+
+
+def remote_read_task(fs, bucket, s3_obj, variables, window, tag, block_size_mb, overwrite):
+    s3_key = s3_obj["Key"]
+    cache_path = get_remote_cache_path(bucket, s3_key, tag)
+    receipt = {"status": "PENDING", "file_name": Path(s3_key).name, "mb_object": round(s3_obj["Size"] / MB, 2),
+               "mb_requested": 0.0, "t_diff": None, "cache_path": str(cache_path)}
+    if cache_path.exists() and not overwrite:
+        receipt["status"] = "SKIPPED"
+        return receipt
+
+    t0 = time.time()
+    try:
+        data, global_attrs, requested = read_remote_variables(fs, bucket, s3_key, variables, window, block_size_mb)
+        source = {"bucket": bucket, "key": s3_key, "size": s3_obj["Size"], "etag": str(s3_obj.get("ETag", "")).strip('"'),
+                  "window": None if window is None else {d: [s.start, s.stop] for d, s in window.items()}}
+        write_compact_cache(cache_path, data, global_attrs, source)
+        receipt.update({"status": "SUCCESS", "t_diff": round(time.time() - t0, 3),
+                        "mb_requested": round(requested / MB, 3) if requested is not None else None,
+                        "mb_cache": round(cache_path.stat().st_size / MB, 3)})
+    except Exception as e:
+        receipt["status"] = f"ERROR: {e}"
+    return receipt
+
+# =============================================================================
+# 2. ORCHESTRATOR
+# =============================================================================
+
+def execute_s3_remote_read(sat_position, product, year, day, variables=None, window=None, hours=None,
+                           threads=8, overwrite=False, block_size_mb=DEFAULT_BLOCK_SIZE_MB, match_tolerance=None,
+                           time_window=None):
+    ctx = "[code01_remote_read_engine.py - execute_s3_remote_read()]"
+    error = _load_remote_stack()
+    if error is not None:
+        raise ValueError(f"{ctx} Remote read needs numpy, fsspec/s3fs and h5netcdf "
+                         f"(pip install 'goes-processor[remote]'): {error}")
+
+    variables = get_remote_variables(product, variables)
+    tag = get_window_tag(variables, window)
+
+    print("\n" + "🛰️ " * 30)
+    print(f"🛰️  GOES-PROCESSOR REMOTE READ | v.0.1.4")
+    print(f"📦 PRODUCT: {product} | VARIABLES: {', '.join(variables)} | WORKERS: {threads}")
+    if window is not None:
+        print(f"🔲 WINDOW: y {window['y'].start}:{window['y'].stop} | x {window['x'].start}:{window['x'].stop}")
+    print("🛰️ " * 30 + "\n")
+
+    sat_id = get_goes_id_by_julian_date(str(year), str(day), sat_position=sat_position)
+    path_plan = get_plan_download_file_path(str(year), str(day), sat_id, sat_position, product)
+    if not path_plan.exists():
+        print(f"⚠️  [NO PLAN] {product}: {path_plan.name} not found. Run 'planning gen-plan-download' first.")
+        return
+    plan_data = load_plan_model(path_plan)
+    bucket = plan_data.sat_prod_info.bucket_name
+    shards = group_slots_by_hour(plan_data.slots, hours, time_window)
+
+    # --- A. Resolve keys per hour (manifest first, S3 listing for the rest) ---
+    manifest = S3ManifestCache.from_plan(plan_data)
+    client_pool = S3ClientPool(threads, max_clients=min(threads, 4))
+    index = S3ListingIndex()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        to_list = [h for h in shards if manifest.hour_status(h) != "fresh"]
+        listed = executor.map(lambda h: (h, list_prefix(client_pool, bucket, h, manifest.start_after(h))), to_list)
+        for prefix_hour, objects in listed:
+            manifest.merge_hour(prefix_hour, objects)
+    manifest.save()
+    client_pool.close()
+    for prefix_hour in shards:
+        index.add_objects(manifest.objects_in_hour(prefix_hour))
+
+    tolerance = resolve_match_tolerance(product, match_tolerance)
+    targets, not_found = [], 0
+    for slots in shards.values():
+        assign_slots(index, [info.file_s3.init_name for _, info in slots], tolerance)
+        for _, info in slots:
+            obj = index.find(info.file_s3.init_name, tolerance_sec=tolerance)
+            if obj is None: not_found += 1
+            else: targets.append(obj)
+
+    # --- B. Byte-range reads ---
+    fs = fsspec.filesystem("s3", anon=True)
+    results = []
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        futures = [executor.submit(remote_read_task, fs, bucket, obj, variables, window, tag, block_size_mb, overwrite)
+                   for obj in targets]
+        width = len(str(len(futures)))
+        for n, future in enumerate(as_completed(futures), 1):
+            r = future.result()
+            results.append(r)
+            progress = f"[{n:0{width}d}/{len(futures):0{width}d}]"
+            if r["status"] == "SUCCESS":
+                print(f"{progress} ✅ {GREEN}[REMOTE]{RESET} {r['file_name']} | {r['mb_requested']} of {r['mb_object']} MB read")
+            elif r["status"] == "SKIPPED":
+                print(f"{progress} ✅ {GREEN}[CACHED]{RESET} {r['file_name']}")
+            else:
+                print(f"{progress} ❌ [FAILED] {r['file_name']} | {r['status']}")
+
+    ok = [r for r in results if r["status"] == "SUCCESS"]
+    mb_object = sum(r["mb_object"] for r in ok)
+    mb_read = sum(r["mb_requested"] or 0 for r in ok)
+    print(f"\n" + "═"*60)
+    print(f"🏁 REMOTE READ SUMMARY | Julian Day {day}")
+    print(f"═"*60)
+    print(f"📊 Slots:            {sum(len(s) for s in shards.values())} | online {len(targets)} | not found {not_found}")
+    print(f"💾 Cached:           {len(ok)} new | {sum(1 for r in results if r['status'] == 'SKIPPED')} already cached "
+          f"| {sum(1 for r in results if r['status'].startswith('ERROR'))} failed")
+    ratio = f" ({mb_object / mb_read:.1f}x less than full files)" if mb_read else ""
+    print(f"🛰️  Ingress:          {round(mb_read, 2)} MB read of {round(mb_object, 2)} MB{ratio}")
+    print(f"🏁 Process finished at: {datetime.now().strftime('%H:%M:%S')}")
+    print("═"*60 + "\n")
@@ -0,0 +1,87 @@
+"""
+Path: src/goes_processor/actions/a03_download/core03_remote_read_s3/fn01_remote_variables.py
+Version: 0.1.0 (Remote-read variable sets + compact cache layout)
+Description: Which NetCDF variables each product needs when it is read straight from S3,
+             how a spatial window is expressed, and where the compact local copy lives:
+             data_remote/<bucket>/<product>/<year>/<day>/<HH>/<file stem>__<tag>.npz
+"""
+
+# 1. SYSTEM LAYER
+try:
+    import hashlib
+    from pathlib import Path
+except ImportError as e:
+    print(f"\n[SYSTEM LIB ERROR] - Critical libraries missing: {e}\n")
+    raise SystemExit(1)
+
+# 2. PROJECT LAYER
+try:
+    from goes_processor.SoT.goes_hardcoded_folders import get_my_path
+    from goes_processor.SoT.goes_prod import SAVED_INFO_PROD_GOES
+except ImportError as e:
+    print(f"\n[PROJECT LIB ERROR] - Internal modules missing: {e}\n")
+    raise SystemExit(1)
+
+# Variables que usan los notebooks por producto.
+DEFAULT_REMOTE_VARIABLES = {
+    "ABI-L2-FDCF": ("Mask", "Power", "Temp", "Area"),
+    "GLM-L2-LCFA": ("flash_lat", "flash_lon", "flash_energy"),
+    "ABI-L2-LSTF": ("LST",),
+}
+
+# Coordenadas que acompañan a todo producto raster (recortadas con la misma ventana).
+RASTER_COORD_VARIABLES = ("x", "y", "goes_imager_projection")
+
+# Atributos globales que se guardan junto a las variables.
+GLOBAL_ATTRS = ("time_coverage_start", "time_coverage_end", "platform_ID", "dataset_name")
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+def get_remote_variables(product_id: str, raw=None) -> tuple:
+    """
+    'Mask,Power' -> ('Mask', 'Power'). None -> the product default (+ raster coordinates).
+    """
+    ctx = "[fn01_remote_variables.py - get_remote_variables()]"
+    if raw:
+        names = tuple(v.strip() for v in str(raw).split(",") if v.strip())
+    elif product_id in DEFAULT_REMOTE_VARIABLES:
+        names = DEFAULT_REMOTE_VARIABLES[product_id]
+    else:
+        raise ValueError(f"{ctx} No default variables for '{product_id}'. Pass --variables explicitly.")
+
+    if SAVED_INFO_PROD_GOES[product_id]["type"] == "raster":
+        names = names + tuple(c for c in RASTER_COORD_VARIABLES if c not in names)
+    return names
+
+
+def parse_window(raw):
+    """
+    'y0:y1,x0:x1' (pixel indices, end exclusive) -> {'y': slice, 'x': slice}. None -> full disk.
+    Only dimensions named 'y'/'x' are cut; 1-D vectorial variables (GLM) are read whole.
+    """
+    ctx = "[fn01_remote_variables.py - parse_window()]"
+    if raw is None or str(raw).strip() == "":
+        return None
+    try:
+        y_part, x_part = str(raw).split(",")
+        y0, y1 = (int(v) for v in y_part.split(":"))
+        x0, x1 = (int(v) for v in x_part.split(":"))
+    except ValueError:
+        raise ValueError(f"{ctx} Invalid window '{raw}'. Use 'y0:y1,x0:x1'.") from None
+    if not (0 <= y0 < y1 and 0 <= x0 < x1):
+        raise ValueError(f"{ctx} Empty or negative window '{raw}'.")
+    return {"y": slice(y0, y1), "x": slice(x0, x1)}
+
+
+def get_window_tag(variables, window) -> str:
+    """Short stable tag so different variable sets / windows of one file do not collide."""
+    win = "full" if window is None else f"{window['y'].start}-{window['y'].stop}_{window['x'].start}-{window['x'].stop}"
+    return hashlib.sha1(("|".join(sorted(variables)) + "|" + win).encode()).hexdigest()[:10]
+
+
+def get_remote_cache_path(bucket: str, s3_key: str, tag: str) -> Path:
+    """data_remote/<bucket>/<product>/<year>/<day>/<HH>/<stem>__<tag>.npz"""
+    key_path = Path(s3_key)
+    return get_my_path("data_remote") / bucket / key_path.parent / f"{key_path.stem}__{tag}.npz"
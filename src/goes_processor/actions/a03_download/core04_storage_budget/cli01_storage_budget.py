@@ -0,0 +1,42 @@
+"""
+Path: src/goes_processor/actions/a03_download/core04_storage_budget/cli01_storage_budget.py
+Version: 0.1.0 (Disk budget for data_raw with LRU eviction)
+"""
+import click
+
+RED = "\033[91m"
+RESET = "\033[0m"
+
+try:
+    from goes_processor.actions.a03_download.core04_storage_budget.code01_storage_budget_engine import (
+        execute_storage_budget, parse_product_budgets
+    )
+except ImportError as e:
+    print(f"{RED}❌ Critical Import Error:{RESET} {e}")
+    execute_storage_budget = None
+
+@click.command(name="storage-budget")
+@click.option('--max-gb', default=None, type=float, help='Budget for the whole data_raw tree (GB).')
+@click.option('--product-max-gb', default=None, type=str,
+              help="Budget per product (GB), e.g. 'ABI-L2-MCMIPF=200,GLM-L2-LCFA=50'.")
+@click.option('--pin', 'pins', multiple=True, type=str,
+              help="Day that must never be evicted: 'YYYY-DDD' (every product) or 'PRODUCT:YYYY-DDD'. Repeatable.")
+@click.option('--unpin', 'unpins', multiple=True, type=str, help='Removes a pin (same forms as --pin). Repeatable.')
+@click.option('--prefer-processed', default=True, type=bool,
+              help='Evict files already marked as processed before any other (then least recently used).')
+@click.option('--rescan', is_flag=True, default=False,
+              help='Rebuild the usage ledger with one full walk of data_raw (after manual deletes/copies).')
+@click.option('--dry-run', is_flag=True, default=False, help='Show what would be evicted, delete nothing.')
+def storage_budget_command(max_gb, product_max_gb, pins, unpins, prefer_processed, rescan, dry_run):
+    """
+    Mantiene data_raw dentro de un presupuesto de disco (LRU, respeta días fijados) y actualiza los planes.
+    """
+    if execute_storage_budget is None:
+        click.echo(f"{RED}🚫 Logic engine (core04) is unavailable.{RESET}", err=True)
+        return
+    try:
+        execute_storage_budget(max_gb=max_gb, product_budgets=parse_product_budgets(product_max_gb),
+                               pins=pins, unpins=unpins, dry_run=dry_run, rescan=rescan,
+                               prefer_processed=prefer_processed)
+    except ValueError as e:
+        click.echo(f"{RED}❌ {e}{RESET}", err=True)
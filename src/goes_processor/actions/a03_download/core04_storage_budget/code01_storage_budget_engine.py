@@ -0,0 +1,280 @@
+"""
+Path: src/goes_processor/actions/a03_download/core04_storage_budget/code01_storage_budget_engine.py
+Version: 0.1.2 (Disk budget for data_raw with LRU eviction + typed plan model)
+Description: Enforces a byte budget on data_raw, for the whole tree and/or per product.
+             Victims: already-processed files first, then least recently used; pinned days
+             are never touched. Every evicted file is reported to its day plan through the
+             plan journal (receipt 'EVICTED'), so 'exists_local' stays true to the disk and
+             the next run-download-s3 fetches the slot again if it is needed. An evicted file is
+             mapped to its slot by the real file name the plan recorded on download, otherwise
+             by nearest start time within the product tolerance (same matcher as the downloader).
+"""
+
+# 1. SYSTEM LAYER
+try:
+    from datetime import datetime
+    from pathlib import Path
+except ImportError as e:
+    print(f"\n[SYSTEM LIB ERROR] - Critical libraries missing: {e}\n")
+    raise SystemExit(1)
+
+# 2. PROJECT LAYER
+try:
+    from goes_processor.SoT.goes_hardcoded_folders import get_my_path
+    from goes_processor.actions.a02_planning.core01_planner_download.fn02_plan_journal import PlanJournal
+    from goes_processor.actions.a02_planning.core01_planner_download.fn04_plan_codec import load_plan_model
+    from goes_processor.actions.a03_download.core04_storage_budget.fn01_storage_ledger import (
+        StorageLedger, get_day_key, record_usage, record_pin
+    )
+    from goes_processor.actions.a03_download.core01_download_from_s3.fn09_slot_matcher import (
+        is_available, match_slots, resolve_match_tolerance
+    )
+except ImportError as e:
+    print(f"\n[PROJECT LIB ERROR] - Internal modules missing: {e}\n")
+    raise SystemExit(1)
+
+YELLOW = "\033[93m"
+RESET = "\033[0m"
+GB = 1024 ** 3
+
+# =============================================================================
+# 1. INPUT PARSING
+# =============================================================================
+
+def parse_product_budgets(raw) -> dict:
+    """'ABI-L2-FDCF=200,GLM-L2-LCFA=50' (GB) -> {product: bytes}."""
+    ctx = "[code01_storage_budget_engine.py - parse_product_budgets()]"
+    budgets = {}
+    if not raw:
+        return budgets
+    for part in str(raw).split(","):
+        if not part.strip():
+            continue
+        try:
+            product, gb = part.split("=")
+            budgets[product.strip()] = int(float(gb) * GB)
+        except ValueError:
+            raise ValueError(f"{ctx} Invalid budget '{part}'. Use 'PRODUCT=GB,...'.") from None
+    return budgets
+
+
+def parse_pin(raw: str) -> str:
+    """'2024-150' -> '*/2024/150' | 'ABI-L2-FDCF:2024-150' -> 'ABI-L2-FDCF/2024/150'."""
+    ctx = "[code01_storage_budget_engine.py - parse_pin()]"
+    product, _, date = str(raw).strip().rpartition(":")
+    try:
+        year, day = date.split("-")
+        if len(year) != 4 or not (1 <= int(day) <= 366):
+            raise ValueError
+    except ValueError:
+        raise ValueError(f"{ctx} Invalid pin '{raw}'. Use 'YYYY-DDD' or 'PRODUCT:YYYY-DDD'.") from None
+    return f"{product or '*'}/{year}/{day.zfill(3)}"
+
+# =============================================================================
+# 2. EVICTION PLAN
+# =============================================================================
+
+def select_victims(ledger: StorageLedger, max_bytes=None, product_budgets=None, prefer_processed=True):
+    """
+    Returns [(rel_path, size)] to delete so every budget holds. Per-product budgets are applied
+    first; whatever they free also counts toward the tree budget.
+    """
+    victims, chosen = [], set()
+    freed_by_product = {}
+
+    for product, budget in (product_budgets or {}).items():
+        excess = ledger.by_product.get(product, 0) - budget
+        for _, _, rel, size in ledger.candidates(product, prefer_processed):
+            if excess <= 0:
+                break
+            victims.append((rel, size))
+            chosen.add(rel)
+            excess -= size
+            freed_by_product[product] = freed_by_product.get(product, 0) + size
+
+    if max_bytes is not None:
+        excess = ledger.total_bytes - sum(freed_by_product.values()) - max_bytes
+        for _, _, rel, size in ledger.candidates(None, prefer_processed):
+            if excess <= 0:
+                break
+            if rel in chosen:
+                continue
+            victims.append((rel, size))
+            chosen.add(rel)
+            excess -= size
+    return victims
+
+# =============================================================================
+# 3. PLAN CONSISTENCY
+# =============================================================================
+
+def _find_plan_paths(bucket: str, product: str, year: str, day: str):
+    """Plans of that day/product whose bucket matches the evicted file (east/west share products)."""
+    folder = get_my_path("data_plan") / year / day
+    out = []
+    for path in sorted(folder.glob(f"plan_01_download_{year}_{day}_*_{product}.json")):
+        try:
+            if load_plan_model(path).sat_prod_info.bucket_name == bucket:
+                out.append(path)
+        except (OSError, ValueError, KeyError):
+            continue
+    return out
+
+
+def _slot_key_candidates(file_name: str):
+    """'OR_..._s20241501200204_e...' -> init_name prefixes for second, minute and hour slots."""
+    pos = file_name.find("_s")
+    if pos < 0:
+        return []
+    start = pos + 2
+    return [file_name[:start + n] for n in (13, 11, 9)]
+
+
+def match_evicted_slots(plan, names, tolerance_sec: float) -> dict:
+    """
+    Evicted file names -> {name: (file_key, PlanSlot)}.
+    The real file name recorded in the plan (download receipt / checker) wins; the rest go to
+    the nearest slot within tolerance, like run-download-s3 assigned them (exact prefix when
+    tolerance is 0 or numpy is missing).
+    """
+    by_file = {slot.file_local.file_name: (key, slot) for key, slot in plan.slots.items() if slot.file_local.file_name}
+    matched = {name: by_file[name] for name in names if name in by_file}
+    rest = [name for name in names if name not in matched]
+    if not rest:
+        return matched
+
+    by_init = {slot.file_local.init_name: (key, slot) for key, slot in plan.slots.items()}
+    if is_available() and tolerance_sec > 0:
+        report = match_slots(list(by_init), [{"Key": name} for name in rest], tolerance_sec)
+        pairs = [(obj["Key"], by_init[init_name]) for init_name, obj in report["assigned"].items()]
+    else:
+        pairs = [(name, next((by_init[c] for c in _slot_key_candidates(name) if c in by_init), None)) for name in rest]
+
+    for name, match in pairs:
+        if match is None:
+            continue
+        # El plan conoce otro archivo para ese slot: lo borrado era un duplicado, el slot sigue local.
+        known = match[1].file_local.file_name
+        if known and known != name:
+            continue
+        matched[name] = match
+    return matched
+
+
+def mark_evicted_in_plans(evicted):
+    """Groups evicted files by day plan and appends one 'EVICTED' receipt per matching slot."""
+    by_day = {}
+    for rel, _ in evicted:
+        bucket, product, year, day, _, name = rel.split("/")
+        by_day.setdefault((bucket, product, year, day), []).append(name)
+
+    updated = 0
+    t_end = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    for (bucket, product, year, day), names in by_day.items():
+        tolerance = resolve_match_tolerance(product)
+        for path_plan in _find_plan_paths(bucket, product, year, day):
+            journal = PlanJournal(path_plan).recover()
+            matched = match_evicted_slots(load_plan_model(path_plan), names, tolerance)
+            for name, (file_key, slot) in matched.items():
+                journal.append(file_key, exists_online=slot.mini_summary.exists_online,
+                               receipt={"status": "EVICTED", "file_name": name, "t_end": t_end})
+                updated += 1
+            journal.close()
+    return updated
+
+# =============================================================================
+# 4. ORCHESTRATOR
+# =============================================================================
+
+def _remove_empty_parents(path: Path, stop: Path):
+    folder = path.parent
+    while folder != stop and stop in folder.parents:
+        try:
+            folder.rmdir()
+        except OSError:
+            break
+        folder = folder.parent
+
+
+def print_usage(ledger: StorageLedger, product_budgets=None, max_bytes=None):
+    print(f"💾 data_raw usage:   {ledger.total_bytes / GB:.2f} GB in {len(ledger.files)} files"
+          + (f" | budget {max_bytes / GB:.2f} GB" if max_bytes is not None else ""))
+    for product, used in sorted(ledger.by_product.items()):
+        if used <= 0:
+            continue
+        budget = (product_budgets or {}).get(product)
+        budget_txt = f" / {budget / GB:.2f} GB" if budget is not None else ""
+        print(f"   - {product:<16} {used / GB:.2f} GB{budget_txt}")
+    if ledger.pins:
+        print(f"📌 Pinned days:      {', '.join(sorted(ledger.pins))}")
+
+
+def execute_storage_budget(max_gb=None, product_budgets=None, pins=(), unpins=(), dry_run=False,
+                           rescan=False, prefer_processed=True):
+    ctx = "[code01_storage_budget_engine.py - execute_storage_budget()]"
+
+    print("\n" + "🧹" * 30)
+    print(f"🛰️  GOES-PROCESSOR STORAGE BUDGET | v.0.1.2{' | DRY RUN' if dry_run else ''}")
+    print("🧹" * 30 + "\n")
+
+    for raw in pins:
+        record_pin(parse_pin(raw), True)
+    for raw in unpins:
+        record_pin(parse_pin(raw), False)
+
+    ledger = StorageLedger().load()
+    if rescan:
+        print(f"🔎 Rescanning data_raw ...")
+        ledger.rescan()
+    print(f"📒 Ledger:           {ledger.stats['replayed']} events replayed | {ledger.stats['scanned']} files scanned")
+
+    max_bytes = int(max_gb * GB) if max_gb is not None else None
+    budgets = product_budgets or {}
+    unknown = [p for p in budgets if p not in ledger.by_product]
+    if unknown:
+        print(f"⚠️  No local files for: {', '.join(unknown)}")
+    print_usage(ledger, budgets, max_bytes)
+
+    victims = select_victims(ledger, max_bytes, budgets, prefer_processed)
+    freed = sum(size for _, size in victims)
+    if not victims:
+        print(f"\n✅ Within budget. Nothing to evict.")
+        ledger.compact()
+        return
+
+    print(f"\n🗑️  {YELLOW}[EVICT]{RESET} {len(victims)} files | {freed / GB:.2f} GB")
+    if dry_run:
+        for rel, size in victims[:20]:
+            print(f"   - {rel} ({size / (1024 * 1024):.1f} MB)")
+        if len(victims) > 20:
+            print(f"   ... and {len(victims) - 20} more")
+        return
+
+    root = get_my_path("data_raw")
+    evicted = []
+    for rel, size in victims:
+        path = root / rel
+        try:
+            path.unlink(missing_ok=True)
+        except OSError as e:
+            print(f"❌ [FAILED] {rel} | {e}")
+            continue
+        record_usage("evict", path)
+        evicted.append((rel, size))
+        _remove_empty_parents(path, root)
+
+    ledger.compact()
+    try:
+        updated = mark_evicted_in_plans(evicted)
+    except ValueError as e:
+        raise ValueError(f"{ctx} Files were deleted but a plan could not be updated: {e}") from None
+
+    days = sorted({get_day_key(rel) for rel, _ in evicted})
+    print(f"\n" + "═"*60)
+    print(f"🏁 STORAGE BUDGET SUMMARY")
+    print(f"═"*60)
+    print(f"🗑️  Evicted:          {len(evicted)} files | {sum(s for _, s in evicted) / GB:.2f} GB from {len(days)} days")
+    print(f"📝 Plans updated:    {updated} slots marked as not local")
+    print_usage(ledger, budgets, max_bytes)
+    print(f"🏁 Process finished at: {datetime.now().strftime('%H:%M:%S')}")
+    print("═"*60 + "\n")
@@ -0,0 +1,272 @@
+"""
+Path: src/goes_processor/actions/a03_download/core04_storage_budget/fn01_storage_ledger.py
+Version: 0.1.2 (Incremental usage ledger for data_raw)
+Description: Keeps track of what lives under data_raw/<bucket>/<product>/<year>/<day>/<hour>
+             without walking the tree. Writers (transfer path, processing) only append one
+             small event per file to a JSONL log; readers fold snapshot + log in memory.
+             Events: add (new/overwritten file), touch (file used), processed, evict, pin, unpin.
+             A full scan is only done to bootstrap the ledger (no snapshot yet) or on explicit --rescan.
+             Writers live in several processes (run-download-s3, follow, reproject): appends and
+             compaction share an exclusive fcntl.flock on the log, and compaction truncates the log
+             in place, so an append waiting on the lock lands in the log that is kept.
+"""
+
+# 1. SYSTEM LAYER
+try:
+    import json
+    import os
+    import threading
+    import time
+    from contextlib import contextmanager
+    from datetime import datetime
+    from pathlib import Path
+except ImportError as e:
+    print(f"\n[SYSTEM LIB ERROR] - Critical libraries missing: {e}\n")
+    raise SystemExit(1)
+
+# Dependencia opcional: fcntl no existe en Windows; ahí sólo se serializan los hilos del proceso.
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# 2. PROJECT LAYER
+try:
+    from goes_processor.SoT.goes_hardcoded_folders import get_my_path
+except ImportError as e:
+    print(f"\n[PROJECT LIB ERROR] - Internal modules missing: {e}\n")
+    raise SystemExit(1)
+
+LEDGER_VERSION = 1
+LEDGER_NAME = "storage_ledger_data_raw.json"
+LOG_SUFFIX = ".journal.jsonl"
+
+# Un único lock por proceso: todos los workers escriben en el mismo log.
+_LOG_LOCK = threading.Lock()
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+def get_ledger_paths() -> tuple:
+    """(snapshot, log) under data_storage/."""
+    base = get_my_path("data_storage")
+    snapshot = base / LEDGER_NAME
+    return snapshot, snapshot.with_name(snapshot.stem + LOG_SUFFIX)
+
+
+def get_raw_relative(path) -> str | None:
+    """Absolute file path -> 'bucket/product/year/day/hour/name' (None if outside data_raw)."""
+    try:
+        return Path(path).resolve().relative_to(get_my_path("data_raw").resolve()).as_posix()
+    except ValueError:
+        return None
+
+
+def get_day_key(rel_path: str) -> str:
+    """'bucket/product/year/day/hour/name' -> 'product/year/day' (unit used for pins)."""
+    parts = rel_path.split("/")
+    return "/".join(parts[1:4])
+
+
+def record_usage(event: str, path, size=None):
+    """
+    Appends one event for a file under data_raw. Never raises: losing a usage event must not
+    break a download (the next --rescan fixes the ledger).
+    """
+    rel = get_raw_relative(path)
+    if rel is None:
+        return
+    record = {"e": event, "p": rel, "t": round(time.time(), 3)}
+    if size is not None:
+        record["s"] = int(size)
+    _append_event(record, Path(path).name)
+
+
+def record_pin(day_key: str, pinned: bool = True):
+    """'product/year/day' (or '*/year/day' for every product) is kept out of eviction."""
+    _append_event({"e": "pin" if pinned else "unpin", "p": day_key, "t": round(time.time(), 3)}, day_key)
+
+
+@contextmanager
+def _locked_log(log_path):
+    """Log opened for append under an exclusive lock shared by every process (released on close)."""
+    with open(log_path, "a", encoding="utf-8") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        yield f
+
+
+def _append_event(record: dict, label: str):
+    try:
+        _, log_path = get_ledger_paths()
+        with _LOG_LOCK, _locked_log(log_path) as f:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+    except (OSError, ValueError) as e:
+        print(f"⚠️  [LEDGER] Could not record '{record['e']}' for {label}: {e}")
+
+# =============================================================================
+# LEDGER
+# =============================================================================
+
+class StorageLedger:
+    """
+    files : {rel_path: [size_bytes, last_used_epoch, processed]}
+    pins  : {'product/year/day', '*/year/day'}
+    Totals (tree and per product) are updated with every event, never recomputed from disk.
+    """
+
+    def __init__(self):
+        self.path_snapshot, self.path_log = get_ledger_paths()
+        self.files = {}
+        self.pins = set()
+        self.total_bytes = 0
+        self.by_product = {}
+        self.stats = {"replayed": 0, "corrupt_lines": 0, "scanned": 0}
+        self._log_offset = 0
+
+    # --- accounting -----------------------------------------------------------
+
+    def _account(self, rel, delta):
+        product = rel.split("/")[1] if rel.count("/") >= 5 else "unknown"
+        self.total_bytes += delta
+        self.by_product[product] = self.by_product.get(product, 0) + delta
+
+    def _set(self, rel, size, t, processed=False):
+        old = self.files.get(rel)
+        self._account(rel, int(size) - (old[0] if old else 0))
+        self.files[rel] = [int(size), t, bool(processed)]
+
+    def _drop(self, rel):
+        old = self.files.pop(rel, None)
+        if old:
+            self._account(rel, -old[0])
+
+    def apply(self, record: dict):
+        event, rel, t = record.get("e"), record.get("p"), record.get("t", 0)
+        if event == "add":
+            self._set(rel, record.get("s", 0), t)
+        elif event in ("touch", "processed"):
+            item = self.files.get(rel)
+            if item is not None:
+                item[1] = max(item[1], t)
+                if event == "processed":
+                    item[2] = True
+            elif record.get("s") is not None:
+                self._set(rel, record["s"], t, processed=(event == "processed"))
+        elif event == "evict":
+            self._drop(rel)
+        elif event == "pin":
+            self.pins.add(rel)
+        elif event == "unpin":
+            self.pins.discard(rel)
+
+    # --- persistence ----------------------------------------------------------
+
+    def load(self):
+        """
+        Snapshot + replay of the pending log. Without a snapshot the ledger is bootstrapped with
+        a full scan: the log alone only knows the files written since it started (downloads
+        append events before the first storage-budget run), not what was already in data_raw.
+        """
+        if not self.path_snapshot.exists():
+            # El log aporta pins, processed y últimos usos; el scan, la lista real de archivos.
+            self._replay_log()
+            return self.rescan()
+
+        with open(self.path_snapshot, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        for rel, item in data.get("files", {}).items():
+            self._set(rel, item[0], item[1], bool(item[2]))
+        self.pins = set(data.get("pins", []))
+
+        self._replay_log()
+        return self
+
+    def _replay_log(self):
+        """Applies log lines past the last offset read (other workers may still be appending)."""
+        if not self.path_log.exists():
+            return
+        with open(self.path_log, "r", encoding="utf-8") as f:
+            if f.seek(0, os.SEEK_END) < self._log_offset:
+                self._log_offset = 0             # otro proceso compactó el log: sólo quedan eventos nuevos
+            f.seek(self._log_offset)
+            for line in iter(f.readline, ""):
+                if not line.endswith("\n"):
+                    break                        # línea a medio escribir: se lee en la próxima pasada
+                self._log_offset = f.tell()
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    self.apply(json.loads(line))
+                    self.stats["replayed"] += 1
+                except json.JSONDecodeError:
+                    self.stats["corrupt_lines"] += 1
+                    print(f"⚠️  [LEDGER] Skipping corrupt line in {self.path_log.name}")
+
+    def compact(self):
+        """
+        Folds the log into the snapshot (temp + os.replace), then truncates the log.
+        Replay, write and truncate hold the log's flock, which every writer process takes to
+        append: no event lands in between (without fcntl only this process' threads wait).
+        """
+        ctx = "[fn01_storage_ledger.py - StorageLedger.compact()]"
+        tmp = self.path_snapshot.with_name(self.path_snapshot.name + ".tmp")
+        try:
+            with _LOG_LOCK, _locked_log(self.path_log) as log:
+                self._replay_log()
+                data = {"version": LEDGER_VERSION, "updated": datetime.now().isoformat(),
+                        "total_bytes": self.total_bytes, "by_product": self.by_product,
+                        "pins": sorted(self.pins), "files": self.files}
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(data, f, separators=(",", ":"))
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, self.path_snapshot)
+                # Truncar (no borrar): un append bloqueado en el lock escribe en este mismo archivo.
+                log.truncate(0)
+                self._log_offset = 0
+        except OSError as e:
+            raise ValueError(f"{ctx} Cannot write {self.path_snapshot}: {e}") from None
+        return self
+
+    def rescan(self):
+        """One full walk of data_raw (bootstrap / repair). Keeps pins and known last-use times."""
+        known = {rel: item for rel, item in self.files.items()}
+        self.files, self.total_bytes, self.by_product = {}, 0, {}
+        root = get_my_path("data_raw")
+
+        stack = [root]
+        while stack:
+            folder = stack.pop()
+            with os.scandir(folder) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False) and entry.name.endswith(".nc"):
+                        st = entry.stat()
+                        rel = Path(entry.path).relative_to(root).as_posix()
+                        prev = known.get(rel)
+                        last_used = max(st.st_mtime, prev[1]) if prev else st.st_mtime
+                        self._set(rel, st.st_size, last_used, prev[2] if prev else False)
+                        self.stats["scanned"] += 1
+        return self.compact()
+
+    # --- queries --------------------------------------------------------------
+
+    def is_pinned(self, rel: str) -> bool:
+        day_key = get_day_key(rel)
+        return day_key in self.pins or "*/" + day_key.split("/", 1)[-1] in self.pins
+
+    def candidates(self, product=None, prefer_processed=True):
+        """Evictable files, best victim first: processed before unprocessed, then least recently used."""
+        out = []
+        for rel, (size, last_used, processed) in self.files.items():
+            if product is not None and rel.split("/")[1] != product:
+                continue
+            if self.is_pinned(rel):
+                continue
+            out.append((not processed if prefer_processed else False, last_used, rel, size))
+        out.sort()
+        return out
@@ -0,0 +1,22 @@
+"""
+Path: src/goes_processor/actions/a04_processing/a04_processing_cli.py
+Description: Action-level orchestrator for processing (reprojection of downloaded files).
+             Subcommands are imported on demand (LazyGroup): 'processing --help' does not
+             load numpy or h5netcdf. Before any subcommand runs, satpy gets the project
+             configuration (config_path with the custom composites, cache_dir).
+"""
+import click
+
+from goes_processor.utils.cli_lazy_group import LazyGroup
+
+PROCESSING_COMMANDS = {
+    "reproject": "goes_processor.actions.a04_processing.core01_reproject.cli01_reproject:reproject_command",
+    "resample-index": "goes_processor.actions.a04_processing.core01_reproject.cli02_resample_index:resample_index_command",
+}
+
+@click.group(name="processing", cls=LazyGroup, lazy_subcommands=PROCESSING_COMMANDS)
+def processing_group():
+    """Actions for processing downloaded data (reprojection). Action ID: a04"""
+    # Import diferido: 'processing --help' no llega hasta acá y no paga satpy.
+    from goes_processor.satpy_config.my_config_satpy import configure_satpy_if_available
+    configure_satpy_if_available()
@@ -0,0 +1,48 @@
+"""
+Path: src/goes_processor/actions/a04_processing/core01_reproject/cli01_reproject.py
+Version: 0.1.0 (Reprojection of downloaded files to the f01-f04 grids)
+"""
+import click
+
+RED = "\033[91m"
+RESET = "\033[0m"
+
+try:
+    from goes_processor.actions.a04_processing.core01_reproject.code01_reproject_engine import execute_reproject
+    from goes_processor.actions.a04_processing.core01_reproject.fn02_target_grids import parse_target_grids
+    from goes_processor.actions.a03_download.core01_download_from_s3.fn04_session_dispatcher import parse_hours_filter
+    from goes_processor.actions.a02_planning.core01_planner_download.fn03_time_window import parse_time_window
+except ImportError as e:
+    print(f"{RED}❌ Critical Import Error:{RESET} {e}")
+    execute_reproject = None
+
+@click.command(name="reproject")
+@click.option('--sat-position', required=True, type=click.Choice(['east', 'west']))
+@click.option('--product', required=True, type=str)
+@click.option('--year', required=True, type=int)
+@click.option('--day', required=True, type=str)
+@click.option('--targets', default=None, type=str,
+              help="Target grids, e.g. 'f02' or 'f01,f03' or 'ALL' (f01-f04). Default: f02.")
+@click.option('--variables', default=None, type=str,
+              help="Comma list (e.g. 'Mask,Power'). Default: FDCF Mask/Power/Temp/Area, LSTF LST, MCMIPF CMI_C01/02/03/13.")
+@click.option('--hours', default=None, type=str, help="Only these hours (e.g. '00,05,12-14').")
+@click.option('--start-time', default=None, type=str, help="Window start (inclusive), e.g. '11:00'.")
+@click.option('--end-time', default=None, type=str, help="Window end (exclusive), e.g. '13:00'.")
+@click.option('--slots', default=None, type=str, help="Explicit slot list, e.g. '11:00,11:10'.")
+@click.option('--match-tolerance', default=None, type=float,
+              help="Seconds a local file start time may drift from its plan slot (default: per product).")
+@click.option('--overwrite', default=False, type=bool, help='Reproject files whose outputs already exist.')
+def reproject_command(sat_position, product, year, day, targets, variables, hours, start_time, end_time, slots,
+                      match_tolerance, overwrite):
+    """
+    Reproyecta los archivos descargados del día a las grillas f01-f04 (índice de remuestreo en satpy_cache).
+    """
+    if execute_reproject is None:
+        click.echo(f"{RED}🚫 Logic engine (a04 core01) is unavailable.{RESET}", err=True)
+        return
+    try:
+        execute_reproject(sat_position, product, year, day, parse_target_grids(targets), variables=variables,
+                          hours=parse_hours_filter(hours), time_window=parse_time_window(start_time, end_time, slots),
+                          overwrite=overwrite, match_tolerance=match_tolerance)
+    except ValueError as e:
+        click.echo(f"{RED}❌ {e}{RESET}", err=True)
@@ -0,0 +1,45 @@
+"""
+Path: src/goes_processor/actions/a04_processing/core01_reproject/cli02_resample_index.py
+Version: 0.1.0 (Target grids and cached resampling indices)
+"""
+import click
+
+RED = "\033[91m"
+GREEN = "\033[92m"
+RESET = "\033[0m"
+
+try:
+    from goes_processor.actions.a04_processing.core01_reproject.fn02_target_grids import TARGET_GRIDS
+    from goes_processor.actions.a04_processing.core01_reproject.fn03_resample_index import (
+        get_index_dir, list_cached_indexes, clear_cached_indexes,
+    )
+except ImportError as e:
+    print(f"{RED}❌ Critical Import Error:{RESET} {e}")
+    TARGET_GRIDS = None
+
+@click.command(name="resample-index")
+@click.option('--clear', is_flag=True, default=False, help='Delete every cached index (they are rebuilt on the next reproject).')
+def resample_index_command(clear):
+    """
+    Lista las grillas destino y los índices de remuestreo guardados en satpy_cache.
+    """
+    if TARGET_GRIDS is None:
+        click.echo(f"{RED}🚫 Logic engine (a04 core01) is unavailable.{RESET}", err=True)
+        return
+    if clear:
+        removed = clear_cached_indexes()
+        click.echo(f"🧹 {removed} cached index(es) removed from {get_index_dir()}")
+        return
+
+    click.echo("\n🗺️  TARGET GRIDS")
+    for grid_id, entry in TARGET_GRIDS.items():
+        grid = entry["grid"]
+        click.echo(f"   {grid_id} | {grid.kind:<5} | {grid.nx} x {grid.ny} | {entry['folder']}")
+
+    cached = list_cached_indexes()
+    click.echo(f"\n🧭 CACHED INDEXES ({get_index_dir()})")
+    if not cached:
+        click.echo("   (none yet: the first reproject of each source/target pair builds it)")
+    for path, size_mb in cached:
+        click.echo(f"   {GREEN}{path.name}{RESET} | {size_mb} MB")
+    click.echo(f"   Total: {len(cached)} | {round(sum(s for _, s in cached), 1)} MB\n")
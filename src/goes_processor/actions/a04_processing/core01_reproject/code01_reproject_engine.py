@@ -0,0 +1,180 @@
+"""
+Path: src/goes_processor/actions/a04_processing/core01_reproject/code01_reproject_engine.py
+Version: 0.1.2 (Reprojection of local ABI L2 files with cached resampling indices)
+Description: Reprojects the downloaded files of one (position, product, day) plan to the
+             target grids f01-f04. The plan gives the slots; the local files are resolved
+             with the same hour-folder index as the checker (fn05, nearest start time).
+             Each file is read once (fn04); per target grid the nearest-neighbour index of
+             its (source grid, target grid) pair comes from memory, from satpy_cache or is
+             built once (fn03), and every variable is a single gather.
+             Output: data_processed/.../core01_proc_one_file/<grid folder>/<product>/<year>/<day>/
+                     <file stem>_<grid id>.nc
+             A reprojected source file is recorded as 'processed' in the storage ledger, so the
+             storage budget evicts it before unprocessed ones (--prefer-processed).
+             numpy / h5netcdf are imported on first use, not when the CLI loads.
+"""
+
+# 1. SYSTEM LAYER
+try:
+    import time
+    from datetime import datetime
+    from pathlib import Path
+except ImportError as e:
+    print(f"\n[SYSTEM LIB ERROR] - Critical libraries missing: {e}\n")
+    raise SystemExit(1)
+
+# 2. PROJECT LAYER
+try:
+    from goes_processor.SoT.goes_hardcoded_folders import get_my_path
+    from goes_processor.SoT.goes_sat import get_goes_id_by_julian_date
+    from goes_processor.actions.a02_planning.core01_planner_download.fn01_file_name_plan_download import get_plan_download_file_path
+    from goes_processor.actions.a02_planning.core01_planner_download.fn04_plan_codec import load_plan_model
+    from goes_processor.actions.a02_planning.core01_planner_download.fn05_local_folder_index import LocalFolderIndex
+    from goes_processor.actions.a03_download.core01_download_from_s3.fn04_session_dispatcher import group_slots_by_hour
+    from goes_processor.actions.a03_download.core01_download_from_s3.fn09_slot_matcher import resolve_match_tolerance
+    from goes_processor.actions.a03_download.core04_storage_budget.fn01_storage_ledger import record_usage
+    from . import fn04_l2_netcdf as l2
+    from .fn02_target_grids import get_target_grid, get_target_folder_name
+    from .fn03_resample_index import get_resample_index
+except ImportError as e:
+    print(f"\n[PROJECT LIB ERROR] - Internal modules missing: {e}\n")
+    raise SystemExit(1)
+
+GREEN = "\033[92m"
+RESET = "\033[0m"
+
+# =============================================================================
+# 1. PATHS
+# =============================================================================
+
+def get_processed_path(grid_id: str, product: str, year, day, source_name: str) -> Path:
+    """proc_core01/<grid folder>/<product>/<year>/<day>/<file stem>_<grid id>.nc"""
+    stem = Path(source_name).name.split(".nc")[0]
+    return (get_my_path("proc_core01") / get_target_folder_name(grid_id) / product / str(year)
+            / str(day).zfill(3) / f"{stem}_{grid_id}.nc")
+
+# =============================================================================
+# 2. ONE FILE
+# =============================================================================
+
+def reproject_file(path, grid_ids, variables, product, year, day, overwrite=False) -> dict:
+    """
+    Reads the file once and writes one NetCDF per target grid.
+    Receipt: status, file_name, t_read / t_gather / t_write (s), index origin per grid.
+    """
+    path = Path(path)
+    outputs = {gid: get_processed_path(gid, product, year, day, path.name) for gid in grid_ids}
+    todo = [gid for gid in grid_ids if overwrite or not outputs[gid].exists()]
+    receipt = {"status": "PENDING", "file_name": path.name, "t_read": 0.0, "t_gather": 0.0, "t_write": 0.0,
+               "index": {}}
+    if not todo:
+        receipt["status"] = "SKIPPED"
+        return receipt
+
+    try:
+        t0 = time.perf_counter()
+        source, data, global_attrs = l2.read_l2_variables(path, variables)
+        receipt["t_read"] = time.perf_counter() - t0
+
+        for gid in todo:
+            target = get_target_grid(gid)
+            t0 = time.perf_counter()
+            rs_index, origin = get_resample_index(source, target, gid)
+            receipt["index"][gid] = origin
+            if origin == "built":
+                receipt["t_build"] = receipt.get("t_build", 0.0) + time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            gathered = {name: (rs_index.apply(arr, fill), fill, attrs) for name, (arr, fill, attrs) in data.items()}
+            receipt["t_gather"] += time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            l2.write_reprojected(outputs[gid], target, gid, gathered, global_attrs, path.name)
+            receipt["t_write"] += time.perf_counter() - t0
+        receipt["status"] = "SUCCESS"
+        record_usage("processed", path, path.stat().st_size)
+    except (OSError, KeyError, ValueError) as e:
+        receipt["status"] = f"ERROR: {e}"
+    return receipt
+
+# =============================================================================
+# 3. ORCHESTRATOR
+# =============================================================================
+
+def find_local_files(plan, hours=None, time_window=None, match_tolerance=None):
+    """Plan slots (optionally filtered) -> ([local .nc paths in plan order], n_slots)."""
+    shards = group_slots_by_hour(plan.slots, hours, time_window)
+    slots = [slot for hour_slots in shards.values() for _, slot in hour_slots]
+    tolerance = resolve_match_tolerance(plan.sat_prod_info.product_id, match_tolerance)
+    local_index = LocalFolderIndex(get_my_path("data_raw"))
+    local_index.assign_slots(slots, tolerance)
+    paths = []
+    for slot in slots:
+        entry = local_index.find(slot, tolerance)
+        if entry is not None:
+            paths.append(Path(entry["path"]))
+    return paths, len(slots)
+
+
+def execute_reproject(sat_position, product, year, day, grid_ids, variables=None, hours=None, time_window=None,
+                      overwrite=False, match_tolerance=None):
+    ctx = "[code01_reproject_engine.py - execute_reproject()]"
+    error = l2.load_netcdf_stack()
+    if error is not None:
+        raise ValueError(f"{ctx} Reprojection needs numpy and h5netcdf (pip install 'goes-processor[processing]'): {error}")
+
+    variables = l2.get_processing_variables(product, variables)
+    for gid in grid_ids:
+        get_target_grid(gid)
+
+    print("\n" + "🗺️ " * 30)
+    print(f"🗺️  GOES-PROCESSOR REPROJECT | v.0.1.2")
+    print(f"📦 PRODUCT: {product} | VARIABLES: {', '.join(variables)} | GRIDS: {', '.join(grid_ids)}")
+    print("🗺️ " * 30 + "\n")
+
+    sat_id = get_goes_id_by_julian_date(str(year), str(day), sat_position=sat_position)
+    path_plan = get_plan_download_file_path(str(year), str(day), sat_id, sat_position, product)
+    if not path_plan.exists():
+        print(f"⚠️  [NO PLAN] {product}: {path_plan.name} not found. Run 'planning gen-plan-download' first.")
+        return None
+
+    paths, n_slots = find_local_files(load_plan_model(path_plan), hours, time_window, match_tolerance)
+    if not paths:
+        print(f"⚠️  [NO FILES] None of the {n_slots} slots is on disk. Run 'download run-download-s3' first.")
+        return []
+
+    t_start = time.time()
+    results = []
+    width = len(str(len(paths)))
+    for n, path in enumerate(paths, 1):
+        r = reproject_file(path, grid_ids, variables, product, year, day, overwrite)
+        results.append(r)
+        progress = f"[{n:0{width}d}/{len(paths):0{width}d}]"
+        if r["status"] == "SUCCESS":
+            origins = " ".join(f"{gid}:{origin}" for gid, origin in r["index"].items())
+            print(f"{progress} ✅ {GREEN}[REPROJECTED]{RESET} {r['file_name']} | read {r['t_read']:.2f}s "
+                  f"| gather {r['t_gather'] * 1000:.0f} ms | write {r['t_write']:.2f}s | index {origins}")
+        elif r["status"] == "SKIPPED":
+            print(f"{progress} ✅ {GREEN}[DONE]{RESET} {r['file_name']}")
+        else:
+            print(f"{progress} ❌ [FAILED] {r['file_name']} | {r['status']}")
+
+    ok = [r for r in results if r["status"] == "SUCCESS"]
+    origins = [origin for r in ok for origin in r["index"].values()]
+    n_gathers = len(origins)
+    print(f"\n" + "═"*60)
+    print(f"🏁 REPROJECT SUMMARY | Julian Day {day}")
+    print(f"═"*60)
+    print(f"📊 Slots:            {n_slots} | on disk {len(paths)}")
+    print(f"💾 Files:            {len(ok)} reprojected | {sum(1 for r in results if r['status'] == 'SKIPPED')} already done "
+          f"| {sum(1 for r in results if r['status'].startswith('ERROR'))} failed")
+    print(f"🧭 Resample index:   {origins.count('built')} built "
+          f"({sum(r.get('t_build', 0.0) for r in ok):.1f}s) | {origins.count('disk')} from satpy_cache "
+          f"| {origins.count('memory')} from memory")
+    if n_gathers:
+        print(f"⚡ Gather:           {sum(r['t_gather'] for r in ok) * 1000 / n_gathers:.0f} ms per file and grid "
+              f"({len(variables)} variable(s))")
+    print(f"⏱️  Wall:             {time.time() - t_start:.1f}s")
+    print(f"🏁 Process finished at: {datetime.now().strftime('%H:%M:%S')}")
+    print("═"*60 + "\n")
+    return results
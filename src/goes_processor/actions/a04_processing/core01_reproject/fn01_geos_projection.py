@@ -0,0 +1,178 @@
+"""
+Path: src/goes_processor/actions/a04_processing/core01_reproject/fn01_geos_projection.py
+Version: 0.1.0 (ABI fixed grid and WGS84 grid geometry)
+Description: The two kinds of grid the processing stage works with, both as plain numpy math
+             (no pyproj / pyresample needed):
+             - GeosGrid  : ABI fixed grid (scan angles x/y in radians, GOES-R PUG vol. 3 §4.2.8).
+                           Forward (x, y) -> (lon, lat) and inverse (lon, lat) -> (x, y) + visibility.
+             - LonLatGrid: regular WGS84 (EPSG:4326) grid, pixel centers.
+             Every grid exposes pixel-center coordinates by row blocks (so a 5424 x 5424 disk is
+             never expanded at once) and a key() that identifies its geometry for the
+             resampling-index cache.
+"""
+
+# 1. SYSTEM LAYER
+try:
+    from dataclasses import dataclass
+except ImportError as e:
+    print(f"\n[SYSTEM LIB ERROR] - Critical libraries missing: {e}\n")
+    raise SystemExit(1)
+
+# Dependencia opcional: el CLI carga sin numpy; los comandos de processing la exigen (code01).
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Redondeo de los parámetros en key(): dos archivos del mismo disco dan la misma clave
+# aunque sus scale_factor/add_offset difieran en el último bit del float32.
+_KEY_DIGITS = 9
+
+# =============================================================================
+# 1. ABI FIXED GRID
+# =============================================================================
+
+@dataclass(frozen=True, slots=True)
+class GeosGrid:
+    """
+    Geostationary fixed grid. x0/y0 are the scan angles of the first column/row center and
+    dx/dy the step (dy < 0: row 0 is the north edge, as in the ABI files).
+    """
+    lon_0: float
+    h: float                  # perspective_point_height (m)
+    a: float                  # semi_major_axis (m)
+    b: float                  # semi_minor_axis (m)
+    nx: int
+    ny: int
+    x0: float
+    dx: float
+    y0: float
+    dy: float
+    sweep: str = "x"
+
+    kind = "geos"
+
+    @property
+    def shape(self) -> tuple:
+        return (self.ny, self.nx)
+
+    def key(self) -> tuple:
+        r = lambda v: round(float(v), _KEY_DIGITS)
+        return (self.kind, r(self.lon_0), r(self.h), r(self.a), r(self.b), self.nx, self.ny,
+                r(self.x0), r(self.dx), r(self.y0), r(self.dy), self.sweep)
+
+    def tag(self) -> str:
+        """Short readable id for file names: 'geos-75.0_5424x5424'."""
+        return f"geos{self.lon_0:g}_{self.nx}x{self.ny}"
+
+    @classmethod
+    def from_extent(cls, lon_0, h, a, b, nx, ny, half_extent_rad, sweep="x"):
+        """Square disk whose pixel edges span +-half_extent_rad in both scan angles."""
+        dx = 2.0 * half_extent_rad / nx
+        dy = -2.0 * half_extent_rad / ny
+        return cls(float(lon_0), float(h), float(a), float(b), int(nx), int(ny),
+                   -half_extent_rad + dx / 2.0, dx, half_extent_rad + dy / 2.0, dy, sweep)
+
+    # --- coordinates -----------------------------------------------------------
+
+    def x_centers(self):
+        return self.x0 + self.dx * np.arange(self.nx, dtype=np.float64)
+
+    def y_centers(self, row_start=0, row_stop=None):
+        row_stop = self.ny if row_stop is None else row_stop
+        return self.y0 + self.dy * np.arange(row_start, row_stop, dtype=np.float64)
+
+    def lonlat_block(self, row_start, row_stop):
+        """(lon, lat) of the pixel centers of rows [row_start, row_stop); NaN off the disk."""
+        x, y = np.meshgrid(self.x_centers(), self.y_centers(row_start, row_stop))
+        return self.xy_to_lonlat(x, y)
+
+    # --- projection --------------------------------------------------------------
+
+    def _check_sweep(self):
+        ctx = "[fn01_geos_projection.py - GeosGrid]"
+        if self.sweep != "x":
+            raise ValueError(f"{ctx} Only sweep_angle_axis='x' (GOES) is supported (got '{self.sweep}').")
+
+    def xy_to_lonlat(self, x, y):
+        """Scan angles (rad) -> geodetic lon/lat (deg). Space pixels -> NaN."""
+        self._check_sweep()
+        H = self.h + self.a
+        r2 = (self.a * self.a) / (self.b * self.b)
+        sin_x, cos_x = np.sin(x), np.cos(x)
+        sin_y, cos_y = np.sin(y), np.cos(y)
+        qa = sin_x ** 2 + cos_x ** 2 * (cos_y ** 2 + r2 * sin_y ** 2)
+        qb = -2.0 * H * cos_x * cos_y
+        qc = H * H - self.a * self.a
+        disc = qb * qb - 4.0 * qa * qc
+        with np.errstate(invalid="ignore"):
+            rs = (-qb - np.sqrt(disc)) / (2.0 * qa)
+        sx = rs * cos_x * cos_y
+        sy = -rs * sin_x
+        sz = rs * cos_x * sin_y
+        lat = np.degrees(np.arctan(r2 * sz / np.sqrt((H - sx) ** 2 + sy ** 2)))
+        lon = self.lon_0 - np.degrees(np.arctan(sy / (H - sx)))
+        off_disk = ~(disc >= 0)
+        lon[off_disk] = np.nan
+        lat[off_disk] = np.nan
+        return (lon + 180.0) % 360.0 - 180.0, lat
+
+    def lonlat_to_xy(self, lon, lat):
+        """Geodetic lon/lat (deg) -> (x, y) scan angles (rad) and a 'seen by the satellite' mask."""
+        self._check_sweep()
+        H = self.h + self.a
+        lat_r = np.radians(lat)
+        dlon = np.radians(lon - self.lon_0)
+        e2 = 1.0 - (self.b * self.b) / (self.a * self.a)
+        phi_c = np.arctan((self.b * self.b) / (self.a * self.a) * np.tan(lat_r))
+        cos_phi = np.cos(phi_c)
+        rc = self.b / np.sqrt(1.0 - e2 * cos_phi ** 2)
+        sx = H - rc * cos_phi * np.cos(dlon)
+        sy = -rc * cos_phi * np.sin(dlon)
+        sz = rc * np.sin(phi_c)
+        with np.errstate(invalid="ignore"):
+            visible = H * (H - sx) >= sy ** 2 + (self.a * self.a) / (self.b * self.b) * sz ** 2
+            x = np.arcsin(-sy / np.sqrt(sx ** 2 + sy ** 2 + sz ** 2))
+            y = np.arctan(sz / sx)
+        return x, y, visible & np.isfinite(x) & np.isfinite(y)
+
+    def xy_to_rowcol(self, x, y):
+        """Scan angles -> nearest (row, col) as float (may fall outside the grid)."""
+        return np.rint((y - self.y0) / self.dy), np.rint((x - self.x0) / self.dx)
+
+# =============================================================================
+# 2. REGULAR WGS84 GRID
+# =============================================================================
+
+@dataclass(frozen=True, slots=True)
+class LonLatGrid:
+    """EPSG:4326 grid; extent = (lon_min, lat_min, lon_max, lat_max) of the pixel edges."""
+    nx: int
+    ny: int
+    extent: tuple = (-180.0, -90.0, 180.0, 90.0)
+
+    kind = "wgs84"
+
+    @property
+    def shape(self) -> tuple:
+        return (self.ny, self.nx)
+
+    def key(self) -> tuple:
+        return (self.kind, self.nx, self.ny) + tuple(round(float(v), _KEY_DIGITS) for v in self.extent)
+
+    def tag(self) -> str:
+        return f"wgs84_{self.nx}x{self.ny}"
+
+    def lon_centers(self):
+        lon_min, _, lon_max, _ = self.extent
+        step = (lon_max - lon_min) / self.nx
+        return lon_min + step * (np.arange(self.nx, dtype=np.float64) + 0.5)
+
+    def lat_centers(self, row_start=0, row_stop=None):
+        _, lat_min, _, lat_max = self.extent
+        row_stop = self.ny if row_stop is None else row_stop
+        step = (lat_max - lat_min) / self.ny
+        return lat_max - step * (np.arange(row_start, row_stop, dtype=np.float64) + 0.5)
+
+    def lonlat_block(self, row_start, row_stop):
+        return np.meshgrid(self.lon_centers(), self.lat_centers(row_start, row_stop))
@@ -0,0 +1,90 @@
+"""
+Path: src/goes_processor/actions/a04_processing/core01_reproject/fn02_target_grids.py
+Version: 0.1.0 (Target grids f01-f04)
+Description: Output grids of the reprojection stage. Ids and folder names are the ones of
+             extra/bg_layers (one background layer per grid), so every product reprojected
+             to 'f02' lands on exactly the pixels of the f02 background:
+                 f01 -> WGS84 5400 x 2700 (0.0667 deg, Blue Marble size)
+                 f02 -> WGS84 3600 x 1800 (0.1 deg, the grid of the notebooks)
+                 f03 -> GOES-East ABI fixed grid 5424 x 5424 (2 km full disk)
+                 f04 -> GOES-East ABI fixed grid 1086 x 1086 (same disk at ~10 km)
+"""
+
+# 1. SYSTEM LAYER
+try:
+    from pathlib import Path
+    from types import MappingProxyType
+except ImportError as e:
+    print(f"\n[SYSTEM LIB ERROR] - Critical libraries missing: {e}\n")
+    raise SystemExit(1)
+
+# 2. PROJECT LAYER
+try:
+    from goes_processor.SoT.goes_hardcoded_folders import GOES_FOLDERS
+    from .fn01_geos_projection import GeosGrid, LonLatGrid
+except ImportError as e:
+    print(f"\n[PROJECT LIB ERROR] - Internal modules missing: {e}\n")
+    raise SystemExit(1)
+
+# GOES-East (75.0 W), constantes de goes_imager_projection (GRS80) de los archivos ABI.
+GOES_EAST_LON_0 = -75.0
+GOES_PERSPECTIVE_HEIGHT = 35786023.0
+GRS80_SEMI_MAJOR = 6378137.0
+GRS80_SEMI_MINOR = 6356752.31414
+# Borde del full disk en ángulo de escaneo: 5424 px de 56 urad (centros en +-0.151844 rad).
+ABI_FULL_DISK_HALF_EXTENT = 0.151872
+
+_TARGET_GRIDS = {
+    "f01": {"folder": "f01_wgs84_5400px_2700py", "grid": LonLatGrid(5400, 2700)},
+    "f02": {"folder": "f02_wgs84_3600px_1800py", "grid": LonLatGrid(3600, 1800)},
+    "f03": {"folder": "f03_goes_east_5424px_5424py",
+            "grid": GeosGrid.from_extent(GOES_EAST_LON_0, GOES_PERSPECTIVE_HEIGHT, GRS80_SEMI_MAJOR,
+                                         GRS80_SEMI_MINOR, 5424, 5424, ABI_FULL_DISK_HALF_EXTENT)},
+    "f04": {"folder": "f04_goes_east_1086px_1086py",
+            "grid": GeosGrid.from_extent(GOES_EAST_LON_0, GOES_PERSPECTIVE_HEIGHT, GRS80_SEMI_MAJOR,
+                                         GRS80_SEMI_MINOR, 1086, 1086, ABI_FULL_DISK_HALF_EXTENT)},
+}
+
+TARGET_GRIDS = MappingProxyType(_TARGET_GRIDS)
+AVAILABLE_TARGET_GRIDS = tuple(_TARGET_GRIDS)
+DEFAULT_TARGET_GRIDS = ("f02",)
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+def get_target_grid(grid_id: str):
+    """'f02' -> LonLatGrid / GeosGrid."""
+    ctx = "[fn02_target_grids.py - get_target_grid()]"
+    if grid_id not in _TARGET_GRIDS:
+        raise ValueError(f"{ctx} Unknown target grid '{grid_id}'. Available: {AVAILABLE_TARGET_GRIDS}")
+    return _TARGET_GRIDS[grid_id]["grid"]
+
+
+def get_target_folder_name(grid_id: str) -> str:
+    get_target_grid(grid_id)
+    return _TARGET_GRIDS[grid_id]["folder"]
+
+
+def get_bg_layer_dir(grid_id: str) -> Path:
+    """extra/bg_layers/<folder> of the grid (background images drawn under the product)."""
+    return GOES_FOLDERS["root"] / "extra" / "bg_layers" / get_target_folder_name(grid_id)
+
+
+def parse_target_grids(raw) -> tuple:
+    """'f01,f03' -> ('f01', 'f03'); 'ALL' -> every grid; None -> DEFAULT_TARGET_GRIDS."""
+    ctx = "[fn02_target_grids.py - parse_target_grids()]"
+    if raw is None or not str(raw).strip():
+        return DEFAULT_TARGET_GRIDS
+    if str(raw).strip().upper() == "ALL":
+        return AVAILABLE_TARGET_GRIDS
+    grids = []
+    for token in str(raw).split(","):
+        grid_id = token.strip().lower()
+        if not grid_id:
+            continue
+        if grid_id not in _TARGET_GRIDS:
+            raise ValueError(f"{ctx} Unknown target grid '{grid_id}'. Use {', '.join(AVAILABLE_TARGET_GRIDS)} or 'ALL'.")
+        if grid_id not in grids:
+            grids.append(grid_id)
+    return tuple(grids)
@@ -0,0 +1,189 @@
+"""
+Path: src/goes_processor/actions/a04_processing/core01_reproject/fn03_resample_index.py
+Version: 0.1.0 (Cached nearest-neighbour resampling index)
+Description: Precomputed reprojection from one source ABI fixed grid to one target grid.
+             For every target pixel it keeps the flat index of the nearest source pixel and
+             whether that pixel is usable (seen by the satellite and inside the source grid).
+             Built once per (source grid, target grid) pair, by row blocks, and persisted in
+             satpy_cache/resample_index/ (.npz); every later file on that pair is a single
+             numpy gather:  out = data.ravel().take(index); out[~valid] = fill
+             The nearest source pixel comes from the analytic inverse of the fixed grid
+             (fn01), the same pixel a kd_tree nearest search with a one-pixel radius picks.
+             Loaded indices stay in a small in-process LRU.
+"""
+
+# 1. SYSTEM LAYER
+try:
+    import hashlib
+    import json
+    import os
+    import threading
+    from collections import OrderedDict
+    from pathlib import Path
+except ImportError as e:
+    print(f"\n[SYSTEM LIB ERROR] - Critical libraries missing: {e}\n")
+    raise SystemExit(1)
+
+# Dependencia opcional: el CLI carga sin numpy; los comandos de processing la exigen (code01).
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# 2. PROJECT LAYER
+try:
+    from goes_processor.SoT.goes_hardcoded_folders import get_my_path
+except ImportError as e:
+    print(f"\n[PROJECT LIB ERROR] - Internal modules missing: {e}\n")
+    raise SystemExit(1)
+
+INDEX_VERSION = 1
+INDEX_SUFFIX = ".npz"
+ROWS_PER_BLOCK = 256
+# Un índice f01 ocupa ~75 MB en memoria: con cuatro alcanza para f01-f04 de una misma fuente.
+MEMORY_INDEXES = 4
+
+_memory_cache = OrderedDict()
+_memory_lock = threading.Lock()
+
+# =============================================================================
+# 1. CACHE LAYOUT
+# =============================================================================
+
+def get_index_dir() -> Path:
+    """src/goes_processor/satpy_cache/resample_index/"""
+    path = get_my_path("satpy_cache") / "resample_index"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def index_cache_key(source, target) -> str:
+    payload = json.dumps([INDEX_VERSION, list(source.key()), list(target.key())])
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def get_index_path(source, target, target_id: str) -> Path:
+    """rsidx_<target id>_<source tag>_<key>.npz"""
+    return get_index_dir() / f"rsidx_{target_id}_{source.tag()}_{index_cache_key(source, target)}{INDEX_SUFFIX}"
+
+# =============================================================================
+# 2. INDEX
+# =============================================================================
+
+class ResampleIndex:
+    """
+    index : int32 (target pixels), flat position in the source array (0 where not valid).
+    valid : bool  (target pixels), the target pixel has a source pixel.
+    """
+
+    __slots__ = ("index", "valid", "invalid", "shape", "source_shape")
+
+    def __init__(self, index, valid, shape, source_shape):
+        self.index = index
+        self.valid = valid
+        self.invalid = ~valid
+        self.shape = tuple(shape)
+        self.source_shape = tuple(source_shape)
+
+    @property
+    def n_valid(self) -> int:
+        return int(self.valid.sum())
+
+    @classmethod
+    def build(cls, source, target, rows_per_block: int = ROWS_PER_BLOCK):
+        """
+        source: fn01.GeosGrid (grid of the input files); target: GeosGrid or LonLatGrid.
+        Target rows are processed in blocks so memory stays bounded on 5424 x 5424 grids.
+        """
+        ny, nx = target.shape
+        index = np.zeros(ny * nx, dtype=np.int32)
+        valid = np.zeros(ny * nx, dtype=bool)
+        for start in range(0, ny, rows_per_block):
+            stop = min(start + rows_per_block, ny)
+            lon, lat = target.lonlat_block(start, stop)
+            x, y, seen = source.lonlat_to_xy(lon, lat)
+            row, col = source.xy_to_rowcol(x, y)
+            ok = seen & (row >= 0) & (row < source.ny) & (col >= 0) & (col < source.nx)
+            flat = np.where(ok, row * source.nx + col, 0).astype(np.int32)
+            index[start * nx:stop * nx] = flat.ravel()
+            valid[start * nx:stop * nx] = ok.ravel()
+        return cls(index, valid, target.shape, source.shape)
+
+    def apply(self, data, fill_value):
+        """Source array (source_shape) -> target array (shape). One gather + one masked fill."""
+        ctx = "[fn03_resample_index.py - ResampleIndex.apply()]"
+        data = np.asarray(data)
+        if data.shape != self.source_shape:
+            raise ValueError(f"{ctx} Data shape {data.shape} does not match the index source grid {self.source_shape}.")
+        out = data.reshape(-1).take(self.index)
+        np.copyto(out, np.asarray(fill_value, dtype=out.dtype), where=self.invalid)
+        return out.reshape(self.shape)
+
+    # --- persistence -------------------------------------------------------------
+
+    def save(self, path):
+        """Atomic (temp + os.replace); uncompressed so a later load is a plain read."""
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(f, index=self.index, valid=self.valid, shape=np.array(self.shape),
+                     source_shape=np.array(self.source_shape), version=np.array(INDEX_VERSION))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        """None when the file is unreadable or from another INDEX_VERSION (it is rebuilt)."""
+        try:
+            with np.load(path, allow_pickle=False) as z:
+                if int(z["version"]) != INDEX_VERSION:
+                    return None
+                return cls(z["index"], z["valid"], tuple(z["shape"].tolist()), tuple(z["source_shape"].tolist()))
+        except (OSError, ValueError, KeyError):
+            return None
+
+# =============================================================================
+# 3. LOOKUP (memory -> satpy_cache -> build)
+# =============================================================================
+
+def get_resample_index(source, target, target_id: str):
+    """
+    Returns (ResampleIndex, origin) with origin 'memory', 'disk' or 'built'.
+    Only the first file of a (source grid, target grid) pair pays the build.
+    """
+    path = get_index_path(source, target, target_id)
+    key = str(path)
+    with _memory_lock:
+        cached = _memory_cache.get(key)
+        if cached is not None:
+            _memory_cache.move_to_end(key)
+            return cached, "memory"
+
+    origin = "disk"
+    rs_index = ResampleIndex.load(path) if path.exists() else None
+    if rs_index is None or rs_index.shape != target.shape or rs_index.source_shape != source.shape:
+        rs_index = ResampleIndex.build(source, target)
+        rs_index.save(path)
+        origin = "built"
+
+    with _memory_lock:
+        _memory_cache[key] = rs_index
+        _memory_cache.move_to_end(key)
+        while len(_memory_cache) > MEMORY_INDEXES:
+            _memory_cache.popitem(last=False)
+    return rs_index, origin
+
+
+def list_cached_indexes() -> list:
+    """[(path, size_mb)] of the indices in satpy_cache, newest first."""
+    paths = sorted(get_index_dir().glob(f"rsidx_*{INDEX_SUFFIX}"), key=lambda p: p.stat().st_mtime, reverse=True)
+    return [(p, round(p.stat().st_size / (1024 * 1024), 1)) for p in paths]
+
+
+def clear_cached_indexes() -> int:
+    with _memory_lock:
+        _memory_cache.clear()
+    removed = 0
+    for path, _ in list_cached_indexes():
+        path.unlink(missing_ok=True)
+        removed += 1
+    return removed
@@ -0,0 +1,189 @@
+"""
+Path: src/goes_processor/actions/a04_processing/core01_reproject/fn04_l2_netcdf.py
+Version: 0.1.0 (ABI L2 NetCDF read / reprojected NetCDF write)
+Description: Reads the requested variables of a local ABI L2 full-disk file together with
+             its fixed grid (goes_imager_projection + x/y scan angles), and writes the
+             reprojected result as a CF NetCDF (lat/lon for WGS84 targets, x/y + projection
+             for fixed-grid targets). Packed variables (scale_factor / add_offset) are
+             unpacked to float32 with NaN fill; categorical ones (FDCF Mask) keep their
+             integer type and _FillValue.
+             h5netcdf is imported on first use (load_netcdf_stack), not when the CLI loads.
+"""
+
+# 1. SYSTEM LAYER
+try:
+    import os
+    from pathlib import Path
+except ImportError as e:
+    print(f"\n[SYSTEM LIB ERROR] - Critical libraries missing: {e}\n")
+    raise SystemExit(1)
+
+# Dependencias opcionales: sólo los comandos de processing las necesitan.
+np = h5netcdf = None
+
+# 2. PROJECT LAYER
+try:
+    from goes_processor.SoT.goes_prod import SAVED_INFO_PROD_GOES
+    from .fn01_geos_projection import GeosGrid
+except ImportError as e:
+    print(f"\n[PROJECT LIB ERROR] - Internal modules missing: {e}\n")
+    raise SystemExit(1)
+
+# Variables que reproyecta cada producto por defecto (las de los notebooks).
+DEFAULT_PROCESSING_VARIABLES = {
+    "ABI-L2-FDCF": ("Mask", "Power", "Temp", "Area"),
+    "ABI-L2-LSTF": ("LST",),
+    "ABI-L2-MCMIPF": ("CMI_C01", "CMI_C02", "CMI_C03", "CMI_C13"),
+}
+
+# Atributos de empaquetado: dejan de valer una vez desempaquetado el dato.
+_PACKING_ATTRS = {"scale_factor", "add_offset", "_FillValue", "_Unsigned", "valid_range", "grid_mapping",
+                  "coordinates", "ancillary_variables"}
+GLOBAL_ATTRS = ("time_coverage_start", "time_coverage_end", "platform_ID", "dataset_name", "orbital_slot")
+
+# =============================================================================
+# 1. HELPERS
+# =============================================================================
+
+def load_netcdf_stack():
+    """Imports numpy and h5netcdf once. Returns the ImportError, or None when available."""
+    global np, h5netcdf
+    if h5netcdf is not None:
+        return None
+    try:
+        import numpy as _np
+        import h5netcdf as _h5netcdf
+    except ImportError as e:
+        return e
+    np, h5netcdf = _np, _h5netcdf
+    return None
+
+
+def get_processing_variables(product_id: str, raw=None) -> tuple:
+    """'LST,DQF' -> ('LST', 'DQF'). None -> the product default. Only raster products."""
+    ctx = "[fn04_l2_netcdf.py - get_processing_variables()]"
+    info = SAVED_INFO_PROD_GOES.get(product_id)
+    if info is None or info.get("type") != "raster":
+        raise ValueError(f"{ctx} '{product_id}' is not a gridded (raster) product; it cannot be reprojected.")
+    if raw:
+        return tuple(v.strip() for v in str(raw).split(",") if v.strip())
+    if product_id not in DEFAULT_PROCESSING_VARIABLES:
+        raise ValueError(f"{ctx} No default variables for '{product_id}'. Pass --variables explicitly.")
+    return DEFAULT_PROCESSING_VARIABLES[product_id]
+
+
+def _attr(value):
+    """HDF5 attributes come as 1-element arrays, numpy scalars or bytes."""
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    if hasattr(value, "tolist"):
+        value = value.tolist()
+        if isinstance(value, list) and len(value) == 1:
+            return value[0]
+    return value
+
+
+def _scan_angles(var):
+    raw = np.asarray(var[:], dtype=np.float64)
+    return raw * float(_attr(var.attrs.get("scale_factor", 1.0))) + float(_attr(var.attrs.get("add_offset", 0.0)))
+
+
+def read_fixed_grid(ds) -> GeosGrid:
+    """Source grid of an open ABI file (goes_imager_projection + x/y)."""
+    ctx = "[fn04_l2_netcdf.py - read_fixed_grid()]"
+    if "goes_imager_projection" not in ds.variables or "x" not in ds.variables or "y" not in ds.variables:
+        raise ValueError(f"{ctx} File has no ABI fixed grid (goes_imager_projection / x / y).")
+    proj = {k: _attr(v) for k, v in ds.variables["goes_imager_projection"].attrs.items()}
+    x, y = _scan_angles(ds.variables["x"]), _scan_angles(ds.variables["y"])
+    return GeosGrid(float(proj["longitude_of_projection_origin"]), float(proj["perspective_point_height"]),
+                    float(proj["semi_major_axis"]), float(proj["semi_minor_axis"]), len(x), len(y),
+                    float(x[0]), float(x[1] - x[0]), float(y[0]), float(y[1] - y[0]),
+                    str(proj.get("sweep_angle_axis", "x")))
+
+
+def _decode(var):
+    """(array, fill_value, attrs) with packing removed."""
+    attrs = {k: _attr(v) for k, v in var.attrs.items()}
+    raw = np.asarray(var[:])
+    if str(attrs.get("_Unsigned", "")).lower() == "true" and raw.dtype.kind == "i":
+        raw = raw.view(raw.dtype.str.replace("i", "u"))
+    fill = attrs.get("_FillValue")
+    kept = {k: v for k, v in attrs.items() if k not in _PACKING_ATTRS}
+    if "scale_factor" in attrs or "add_offset" in attrs:
+        data = raw.astype(np.float32) * np.float32(attrs.get("scale_factor", 1.0)) + np.float32(attrs.get("add_offset", 0.0))
+        if fill is not None:
+            data[raw == np.asarray(fill).astype(raw.dtype)] = np.nan
+        return data, np.float32(np.nan), kept
+    if fill is None:
+        fill = np.nan if raw.dtype.kind == "f" else -1
+    return raw, np.asarray(fill).astype(raw.dtype)[()], kept
+
+# =============================================================================
+# 2. READ
+# =============================================================================
+
+def read_l2_variables(path, variables):
+    """
+    Returns (GeosGrid, {name: (array, fill_value, attrs)}, global_attrs).
+    A variable missing in the file raises KeyError (wrong --variables for the product).
+    """
+    with h5netcdf.File(str(path), "r") as ds:
+        grid = read_fixed_grid(ds)
+        out = {}
+        for name in variables:
+            if name not in ds.variables:
+                raise KeyError(f"variable '{name}' not in {Path(path).name}")
+            out[name] = _decode(ds.variables[name])
+        global_attrs = {k: _attr(ds.attrs[k]) for k in GLOBAL_ATTRS if k in ds.attrs}
+    return grid, out, global_attrs
+
+# =============================================================================
+# 3. WRITE
+# =============================================================================
+
+def _write_grid(ds, target):
+    """Coordinates + grid mapping of the target; returns (dims, grid_mapping name)."""
+    if target.kind == "wgs84":
+        ds.dimensions = {"lat": target.ny, "lon": target.nx}
+        lat = ds.create_variable("lat", ("lat",), data=target.lat_centers())
+        lat.attrs.update({"units": "degrees_north", "standard_name": "latitude"})
+        lon = ds.create_variable("lon", ("lon",), data=target.lon_centers())
+        lon.attrs.update({"units": "degrees_east", "standard_name": "longitude"})
+        crs = ds.create_variable("crs", (), dtype="i4")
+        crs.attrs.update({"grid_mapping_name": "latitude_longitude", "semi_major_axis": 6378137.0,
+                          "inverse_flattening": 298.257223563, "crs_wkt": "EPSG:4326"})
+        return ("lat", "lon"), "crs"
+
+    ds.dimensions = {"y": target.ny, "x": target.nx}
+    y = ds.create_variable("y", ("y",), data=target.y_centers())
+    y.attrs.update({"units": "rad", "standard_name": "projection_y_coordinate"})
+    x = ds.create_variable("x", ("x",), data=target.x_centers())
+    x.attrs.update({"units": "rad", "standard_name": "projection_x_coordinate"})
+    proj = ds.create_variable("goes_imager_projection", (), dtype="i4")
+    proj.attrs.update({"grid_mapping_name": "geostationary", "perspective_point_height": target.h,
+                       "semi_major_axis": target.a, "semi_minor_axis": target.b,
+                       "longitude_of_projection_origin": target.lon_0, "latitude_of_projection_origin": 0.0,
+                       "sweep_angle_axis": target.sweep})
+    return ("y", "x"), "goes_imager_projection"
+
+
+def write_reprojected(path_out, target, target_id: str, variables: dict, global_attrs: dict, source_name: str):
+    """
+    variables: {name: (array on the target grid, fill_value, attrs)}.
+    Atomic (temp + os.replace), gzip-compressed by row chunks.
+    """
+    path_out = Path(path_out)
+    path_out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path_out.with_name(path_out.name + ".tmp")
+    with h5netcdf.File(str(tmp), "w") as ds:
+        dims, grid_mapping = _write_grid(ds, target)
+        chunks = (min(256, target.ny), target.nx)
+        for name, (data, fill, attrs) in variables.items():
+            var = ds.create_variable(name, dims, data=data, fillvalue=fill, chunks=chunks,
+                                     compression="gzip", compression_opts=4)
+            var.attrs.update({k: v for k, v in attrs.items() if v is not None})
+            var.attrs["grid_mapping"] = grid_mapping
+        ds.attrs.update({k: v for k, v in global_attrs.items() if v is not None})
+        ds.attrs.update({"source_file": source_name, "target_grid": target_id,
+                         "resampling": "nearest neighbour (cached fixed-grid index)"})
+    os.replace(tmp, path_out)
@@ -1,30 +1,70 @@
-# src/goes_processor/satpy_config/my_config_satpy.py
-import satpy
-from pathlib import Path
-import os
+"""
+Path: src/goes_processor/satpy_config/my_config_satpy.py
+Version: 0.3.3 (Deferred configuration)
+Description: Satpy configuration of the project (config path, cache, resampler).
+             Importing this module has no side effects: nothing is configured, created or
+             printed until the 'processing' group (a04) calls configure_satpy_if_available()
+             before any of its commands runs. The call is cached, so satpy is imported and
+             configured once per process.
+"""
 
-# 1. Rutas basadas en tu estructura real (satpy_config)
-BASE_DIR = Path(__file__).resolve().parent  
-PROJ_DIR = BASE_DIR.parent                 
+# 1. SYSTEM LAYER
+try:
+    import os
+    from functools import lru_cache
+    from pathlib import Path
+except ImportError as e:
+    print(f"\n[SYSTEM LIB ERROR] - Critical libraries missing: {e}\n")
+    raise SystemExit(1)
 
-# Sincronizamos con el nombre de carpeta de tu tree: satpy_cache
+# Rutas basadas en la estructura real (satpy_config / satpy_cache)
+BASE_DIR = Path(__file__).resolve().parent
+PROJ_DIR = BASE_DIR.parent
 CACHE_DIR = PROJ_DIR / "satpy_cache"
-CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
-# 2. Configuración Global
-# Usamos el método recomendado para añadir rutas sin romper las existentes
-satpy.register_config_path(str(BASE_DIR))
 
-satpy.config.set(
-    cache_dir=str(CACHE_DIR),
-    log_level="WARNING",
-    default_resampler="kd_tree"
-)
+@lru_cache(maxsize=None)
+def configure_satpy(verbose: bool = False):
+    """
+    Imports satpy and applies the project configuration. Returns the satpy module.
+    Only processing commands should call this: planning / download never pay for satpy.
+    """
+    ctx = "[my_config_satpy.py - configure_satpy()]"
+    try:
+        import satpy
+    except ImportError as e:
+        raise ValueError(f"{ctx} satpy is required for processing commands: {e}") from None
 
-os.environ['PYRESAMPLE_CACHE_DIR'] = str(CACHE_DIR)
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
-# Audit log para tu tesis
-print(f"--- SatPy Configuration (v.0.3.1) ---")
-print(f"✅ Cache: {CACHE_DIR}")
-print(f"✅ Configs: {BASE_DIR}")
-print(f"---------------------------------------")
+    # Método recomendado para añadir rutas sin romper las existentes
+    current_paths = satpy.config.get("config_path", [])
+    if str(BASE_DIR) not in current_paths:
+        satpy.config.set(config_path=[str(BASE_DIR)] + list(current_paths))
+
+    satpy.config.set(
+        cache_dir=str(CACHE_DIR),
+        log_level="WARNING",
+        default_resampler="kd_tree"
+    )
+    os.environ['PYRESAMPLE_CACHE_DIR'] = str(CACHE_DIR)
+
+    if verbose:
+        # Audit log para la tesis
+        print(f"--- SatPy Configuration (v.0.3.3) ---")
+        print(f"✅ Cache: {CACHE_DIR}")
+        print(f"✅ Configs: {BASE_DIR}")
+        print(f"---------------------------------------")
+    return satpy
+
+
+def configure_satpy_if_available(verbose: bool = False):
+    """
+    configure_satpy() when satpy is installed, None otherwise. Used by the processing group:
+    the custom composites (LST / FDC) are registered for every processing command, and the
+    commands that do not need satpy (reproject) still run without it.
+    """
+    try:
+        return configure_satpy(verbose)
+    except ValueError:
+        return None
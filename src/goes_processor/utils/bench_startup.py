@@ -0,0 +1,99 @@
+"""
+Path: src/goes_processor/utils/bench_startup.py
+Version: 0.1.1 (CLI startup latency guard)
+Description: Launches the CLI in fresh interpreters (as cron / follow do) and checks that:
+             - each scenario stays under its wall-time budget (median of N runs),
+             - no forbidden heavy module (satpy, xarray, boto3...) was imported.
+             Exit code 1 when any scenario fails, so it can gate a commit or a deploy:
+                 python -m goes_processor.utils.bench_startup [--runs 7] [--scale 1.0]
+"""
+
+# 1. SYSTEM LAYER
+try:
+    import argparse
+    import json
+    import statistics
+    import subprocess
+    import sys
+    import time
+except ImportError as e:
+    print(f"\n[SYSTEM LIB ERROR] - Critical libraries missing: {e}\n")
+    raise SystemExit(1)
+
+# Stack científico: solo los comandos de processing lo pagan.
+SCIENTIFIC = ("satpy", "pyresample", "xarray", "dask", "pandas", "matplotlib", "netCDF4", "h5netcdf", "rasterio")
+# Clientes de red / numpy: solo los comandos que los usan.
+TRANSFER = ("boto3", "botocore", "s3fs", "numpy")
+
+# (label, argv, budget_ms, forbidden modules)
+SCENARIOS = (
+    ("root --help", ["--help"], 250, SCIENTIFIC + TRANSFER),
+    ("root --version", ["--version"], 250, SCIENTIFIC + TRANSFER),
+    ("planning --help", ["planning", "--help"], 600, SCIENTIFIC),
+    ("download --help", ["download", "--help"], 1500, SCIENTIFIC),
+    ("processing --help", ["processing", "--help"], 600, SCIENTIFIC),
+)
+
+# Se ejecuta en el proceso hijo: invoca el CLI sin salida y reporta los módulos cargados.
+_PROBE = """
+import contextlib, io, json, sys
+argv, watched = json.loads(sys.argv[1]), json.loads(sys.argv[2])
+from goes_processor.main import cli
+with contextlib.redirect_stdout(io.StringIO()):
+    try:
+        cli(argv, prog_name="goes-processor", standalone_mode=False)
+    except SystemExit:
+        pass
+print(json.dumps(sorted(m for m in watched if m in sys.modules)))
+"""
+
+
+def run_probe(argv, watched) -> tuple:
+    """One fresh interpreter -> (wall ms, [watched modules that got imported])."""
+    ctx = "[bench_startup.py - run_probe()]"
+    t0 = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-c", _PROBE, json.dumps(argv), json.dumps(list(watched))],
+                          capture_output=True, text=True)
+    elapsed_ms = (time.perf_counter() - t0) * 1000
+    if proc.returncode != 0:
+        raise ValueError(f"{ctx} 'goes-processor {' '.join(argv)}' failed:\n{proc.stderr.strip()}")
+    return elapsed_ms, json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def run_benchmark(runs: int = 7, scale: float = 1.0) -> list:
+    """[{label, median_ms, budget_ms, loaded, ok}] for every scenario."""
+    results = []
+    for label, argv, budget_ms, forbidden in SCENARIOS:
+        times, loaded = [], []
+        for _ in range(runs):
+            ms, loaded = run_probe(argv, forbidden)
+            times.append(ms)
+        median_ms = statistics.median(times)
+        budget = budget_ms * scale
+        results.append({"label": label, "median_ms": round(median_ms, 1), "budget_ms": budget,
+                        "loaded": loaded, "ok": median_ms <= budget and not loaded})
+    return results
+
+
+def main(args=None) -> int:
+    parser = argparse.ArgumentParser(description="GOES-Processor CLI startup benchmark.")
+    parser.add_argument("--runs", type=int, default=7, help="Fresh interpreters per scenario (median).")
+    parser.add_argument("--scale", type=float, default=1.0, help="Budget multiplier for slow machines.")
+    opts = parser.parse_args(args)
+
+    try:
+        results = run_benchmark(max(1, opts.runs), opts.scale)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    print(f"⏱️  CLI startup ({opts.runs} runs per scenario, {sys.executable})")
+    for r in results:
+        icon = "✅" if r["ok"] else "❌"
+        extra = f" | heavy imports: {', '.join(r['loaded'])}" if r["loaded"] else ""
+        print(f"   {icon} {r['label']:<18} {r['median_ms']:>8.1f} ms (budget {r['budget_ms']:.0f} ms){extra}")
+    return 0 if all(r["ok"] for r in results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,49 @@
+"""
+Path: src/goes_processor/utils/cli_lazy_group.py
+Version: 0.1.0 (Lazy click groups)
+Description: click.Group that imports its subcommands only when they are resolved.
+             Subcommands are declared as {name: "module.path:attribute"}; '--help' of the
+             root group, or running one command, imports nothing but what is needed.
+             A subcommand that fails to import is reported once and hidden, like the old
+             guarded imports of the *_cli.py orchestrators.
+"""
+
+# 1. SYSTEM LAYER
+try:
+    import click
+    import importlib
+except ImportError as e:
+    print(f"\n[SYSTEM LIB ERROR] - Critical libraries missing: {e}\n")
+    raise SystemExit(1)
+
+
+class LazyGroup(click.Group):
+    """click.Group with lazy_subcommands={name: 'module:attr'}."""
+
+    def __init__(self, *args, lazy_subcommands=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = dict(lazy_subcommands or {})
+        self._failed = set()
+
+    def list_commands(self, ctx):
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_subcommands))
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name in self.lazy_subcommands:
+            return self._lazy_load(cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def _lazy_load(self, cmd_name):
+        if cmd_name in self._failed:
+            return None
+        module_name, attr = self.lazy_subcommands[cmd_name].split(":", 1)
+        try:
+            cmd = getattr(importlib.import_module(module_name), attr)
+        except (ImportError, AttributeError) as e:
+            print(f"❌ Error importing {cmd_name}: {e}")
+            self._failed.add(cmd_name)
+            return None
+        # Queda registrado: la próxima resolución no pasa por importlib.
+        self.add_command(cmd, name=cmd_name)
+        del self.lazy_subcommands[cmd_name]
+        return cmd
@@ -0,0 +1,86 @@
+"""
+Path: tests/test_plan_codec.py
+Version: 0.1.0 (Plan codec round trips)
+Description: Plain ('legacy') and packed ('compact') layouts must give back the same plan,
+             for a full-day GLM plan (4320 slots) and for a windowed ABI plan. Plans come
+             from the SoT (code01_gen_plan_download), no network or local data needed.
+"""
+
+import pytest
+
+from goes_processor.actions.a02_planning.core01_planner_download.code01_gen_plan_download import (
+    generate_download_plan_day
+)
+from goes_processor.actions.a02_planning.core01_planner_download.fn03_time_window import parse_time_window
+from goes_processor.actions.a02_planning.core01_planner_download.fn04_plan_codec import (
+    PACKED_FORMAT, dumps_plan, get_plan_binary_path, load_plan_model, loads_plan, pack_plan, save_plan,
+    unpack_plan
+)
+from goes_processor.actions.a02_planning.core01_planner_download.fn06_plan_model import DownloadPlan
+
+
+@pytest.fixture(scope="module")
+def glm_plan():
+    return generate_download_plan_day("east", "GLM-L2-LCFA", "2026", "003")
+
+
+@pytest.fixture(scope="module")
+def windowed_plan():
+    window = parse_time_window("10:00", "11:30")
+    return generate_download_plan_day("east", "ABI-L2-MCMIPF", "2026", "003", window)
+
+
+@pytest.fixture(params=["glm_plan", "windowed_plan"])
+def plan(request):
+    return request.getfixturevalue(request.param)
+
+
+def test_fixture_plans(glm_plan, windowed_plan):
+    assert len(glm_plan) == 4320
+    assert glm_plan.sat_prod_info.time_window is None
+    # 10:00 -> 11:30 con cadencia de 10 min: 9 slots.
+    assert len(windowed_plan) == 9
+    assert windowed_plan.sat_prod_info.time_window["label"] == "[10:00:00 -> 11:30:00)"
+
+
+def test_pack_unpack_round_trip(plan):
+    data = plan.to_dict()
+    packed = pack_plan(data)
+    assert packed["plan_format"] == PACKED_FORMAT
+    assert unpack_plan(packed) == data
+
+
+@pytest.mark.parametrize("plan_format", ["legacy", "compact"])
+def test_text_round_trip(plan, plan_format):
+    text = dumps_plan(plan, plan_format)
+    data = loads_plan(text)
+    assert data == plan.to_dict()
+    assert DownloadPlan.from_dict(data).to_dict() == plan.to_dict()
+
+
+def test_compact_is_smaller(plan):
+    assert len(dumps_plan(plan, "compact")) < len(dumps_plan(plan, "legacy"))
+
+
+def test_binary_round_trip(plan):
+    stamp = (1, 2, 3, 12)
+    blob = plan.to_binary(stamp)
+    assert DownloadPlan.from_binary(blob, stamp).to_dict() == plan.to_dict()
+    # Un stamp distinto (otro texto u otra versión de Python) invalida el espejo.
+    assert DownloadPlan.from_binary(blob, (1, 2, 3, 13)) is None
+    assert DownloadPlan.from_binary(b"not marshal", stamp) is None
+
+
+@pytest.mark.parametrize("plan_format", ["legacy", "compact"])
+def test_disk_round_trip(tmp_path, windowed_plan, plan_format):
+    path_plan = tmp_path / "plan.json"
+    path_plan.write_text(dumps_plan(windowed_plan, plan_format), encoding="utf-8")
+
+    # Leer no escribe nada junto al plan.
+    assert load_plan_model(path_plan).to_dict() == windowed_plan.to_dict()
+    assert not get_plan_binary_path(path_plan).exists()
+
+    # Guardar sí deja el espejo binario, y el plan se sigue leyendo igual.
+    save_plan(path_plan, windowed_plan, plan_format)
+    assert get_plan_binary_path(path_plan).exists()
+    assert load_plan_model(path_plan).to_dict() == windowed_plan.to_dict()
@@ -0,0 +1,118 @@
+"""
+Path: tests/test_plan_journal.py
+Version: 0.1.0 (Plan journal recovery)
+Description: The journal is the durable record of download progress. A session that dies
+             without close() must leave receipts the next PlanJournal.recover() folds back into
+             the plan: torn last line skipped, periodic compaction, EVICTED receipts undone.
+"""
+
+import json
+
+import pytest
+
+from goes_processor.SoT import goes_hardcoded_folders
+from goes_processor.actions.a02_planning.core01_planner_download.code01_gen_plan_download import (
+    generate_download_plan_day
+)
+from goes_processor.actions.a02_planning.core01_planner_download.fn02_plan_journal import (
+    PlanJournal, apply_journal_record, get_plan_journal_path
+)
+from goes_processor.actions.a02_planning.core01_planner_download.fn03_time_window import parse_time_window
+from goes_processor.actions.a02_planning.core01_planner_download.fn04_plan_codec import load_plan_model, save_plan
+
+
+@pytest.fixture(autouse=True)
+def isolated_catalog(tmp_path, monkeypatch):
+    # La compactación sincroniza el catálogo SQLite de data_plan: que quede en tmp_path.
+    monkeypatch.setitem(goes_hardcoded_folders._FOLDERS, "data_plan", tmp_path / "data_plan")
+
+
+@pytest.fixture
+def path_plan(tmp_path):
+    window = parse_time_window("10:00", "11:00")
+    plan = generate_download_plan_day("east", "ABI-L2-MCMIPF", "2026", "003", window)
+    path = tmp_path / "plan.json"
+    save_plan(path, plan, "compact")
+    return path
+
+
+def _success(file_name, size_mb=1.5):
+    return {"status": "SUCCESS", "file_name": file_name, "size_mb": size_mb, "t_end": "2026-01-03 10:00:00"}
+
+
+def _keys(path_plan):
+    return list(load_plan_model(path_plan).slots)
+
+
+def test_recover_replays_leftover_journal(path_plan):
+    keys = _keys(path_plan)
+    journal = PlanJournal(path_plan)
+    for n, key in enumerate(keys[:3]):
+        journal.append(key, exists_online=True, receipt=_success(f"real_{n}.nc"))
+    journal.append(keys[3], exists_online=False)
+    # Corte: sin close(); el plan en disco todavía no sabe nada.
+    assert not any(s.mini_summary.exists_local for s in load_plan_model(path_plan).slots.values())
+
+    recovered = PlanJournal(path_plan).recover()
+    assert recovered.stats["replayed"] == 4
+    assert not get_plan_journal_path(path_plan).exists()
+
+    slots = load_plan_model(path_plan).slots
+    for n, key in enumerate(keys[:3]):
+        slot = slots[key]
+        assert slot.mini_summary.is_done and slot.mini_summary.exists_local
+        assert slot.file_local.file_name == f"real_{n}.nc"
+        assert slot.file_local.file_size_mb == 1.5
+    assert slots[keys[3]].mini_summary.exists_online is False
+    assert not slots[keys[3]].mini_summary.exists_local
+
+
+def test_recover_skips_torn_last_line(path_plan):
+    keys = _keys(path_plan)
+    lines = [json.dumps({"file_key": key, "exists_online": True, "receipt": _success(f"{key}.nc")}) for key in keys[:2]]
+    torn = json.dumps({"file_key": keys[2], "exists_online": True, "receipt": _success("torn.nc")})[:25]
+    get_plan_journal_path(path_plan).write_text("\n".join(lines + [torn]), encoding="utf-8")
+
+    recovered = PlanJournal(path_plan).recover()
+    assert recovered.stats["replayed"] == 2
+    assert recovered.stats["corrupt_lines"] == 1
+
+    slots = load_plan_model(path_plan).slots
+    assert [slots[key].mini_summary.exists_local for key in keys[:3]] == [True, True, None]
+
+
+def test_compaction_every_n_appends(path_plan):
+    keys = _keys(path_plan)
+    journal = PlanJournal(path_plan, compact_every=2)
+    for key in keys[:5]:
+        journal.append(key, exists_online=True, receipt=_success(f"{key}.nc"))
+
+    assert journal.stats["compactions"] == 2
+    pending = get_plan_journal_path(path_plan).read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["file_key"] for line in pending] == [keys[4]]
+    slots = load_plan_model(path_plan).slots
+    assert [bool(slots[key].mini_summary.exists_local) for key in keys[:5]] == [True, True, True, True, False]
+
+    journal.close()
+    assert load_plan_model(path_plan).slots[keys[4]].mini_summary.exists_local
+    assert not get_plan_journal_path(path_plan).exists()
+
+
+def test_evicted_receipt_makes_slot_pending_again(path_plan):
+    key = _keys(path_plan)[0]
+    with PlanJournal(path_plan) as journal:
+        journal.append(key, exists_online=True, receipt=_success("real.nc"))
+        journal.append(key, exists_online=True,
+                       receipt={"status": "EVICTED", "file_name": "real.nc", "t_end": "2026-01-04 00:00:00"})
+
+    slot = load_plan_model(path_plan).slots[key]
+    assert slot.mini_summary.is_done is False and slot.mini_summary.exists_local is False
+    assert slot.mini_summary.exists_online is True
+    assert slot.mini_summary.time_last_mod == "2026-01-04 00:00:00"
+    assert slot.file_local.exists_local is False
+    assert slot.file_local.file_name is None and slot.file_local.file_size_mb is None
+
+
+def test_record_for_unknown_slot_is_rejected(path_plan):
+    with pytest.raises(ValueError):
+        apply_journal_record(load_plan_model(path_plan), {"file_key": "file9999", "exists_online": True})
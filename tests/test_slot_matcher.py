@@ -0,0 +1,100 @@
+"""
+Path: tests/test_slot_matcher.py
+Version: 0.1.0 (Tolerance slot matching)
+Description: match_slots() with real-world start times that are not on the nominal slot:
+             early starts that cross the slot boundary, late starts, duplicates, stray files
+             and files of other products / other windows.
+"""
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from goes_processor.actions.a03_download.core01_download_from_s3.fn09_slot_matcher import (
+    match_slots, resolve_match_tolerance
+)
+
+ABI_HEAD = "OR_ABI-L2-MCMIPF-M6_G19"
+GLM_HEAD = "OR_GLM-L2-LCFA_G19"
+
+
+def _slot(head, hhmm_ss):
+    return f"{head}_s2026003{hhmm_ss}"
+
+
+def _obj(head, start, end=None):
+    end = end or start
+    name = f"{head}_s2026003{start}_e2026003{end}_c2026003{end}.nc"
+    return {"Key": f"ABI-L2-MCMIPF/2026/003/{start[:2]}/{name}", "Size": 1}
+
+
+def _names(objs):
+    return sorted(obj["Key"].rsplit("/", 1)[1] for obj in objs)
+
+
+def test_off_slot_starts_go_to_nearest_slot():
+    slots = [_slot(ABI_HEAD, t) for t in ("1000", "1010", "1020")]
+    early = _obj(ABI_HEAD, "1009406", "1019099")     # 10:09:40.6, antes del límite del slot 10:10
+    late = _obj(ABI_HEAD, "1000207", "1009517")      # 10:00:20.7
+    report = match_slots(slots, [early, late], tolerance_sec=120)
+
+    assert report["assigned"] == {slots[0]: late, slots[1]: early}
+    assert report["delta_sec"] == {slots[0]: 20.7, slots[1]: 19.4}
+    assert report["missing"] == [slots[2]]
+    assert report["unmatched"] == [] and report["duplicates"] == {}
+
+
+def test_nearest_file_wins_and_rest_are_duplicates():
+    slots = [_slot(ABI_HEAD, "1010")]
+    near = _obj(ABI_HEAD, "1010201")
+    far = _obj(ABI_HEAD, "1011000")
+    report = match_slots(slots, [far, near], tolerance_sec=120)
+
+    assert report["assigned"] == {slots[0]: near}
+    assert report["duplicates"] == {slots[0]: [far]}
+
+
+def test_tie_keeps_the_file_that_ends_last():
+    slots = [_slot(ABI_HEAD, "1010")]
+    short = _obj(ABI_HEAD, "1010200", "1015000")
+    longer = _obj(ABI_HEAD, "1010200", "1019000")
+    report = match_slots(slots, [short, longer], tolerance_sec=120)
+
+    assert report["assigned"] == {slots[0]: longer}
+    assert report["duplicates"] == {slots[0]: [short]}
+
+
+def test_stray_and_foreign_files():
+    slots = [_slot(ABI_HEAD, t) for t in ("1000", "1010")]
+    stray = _obj(ABI_HEAD, "1005000")                # a 5 min de ambos slots: fuera de tolerancia
+    other_window = _obj(ABI_HEAD, "1200200")         # fuera del rango de estos slots: se ignora
+    other_product = _obj(GLM_HEAD, "1000000")
+    report = match_slots(slots, [stray, other_window, other_product], tolerance_sec=120)
+
+    assert report["assigned"] == {}
+    assert _names(report["unmatched"]) == _names([stray, other_product])
+    assert sorted(report["missing"]) == slots
+
+
+def test_glm_seconds_cadence():
+    slots = [_slot(GLM_HEAD, t) for t in ("100000", "100020", "100040")]
+    files = [_obj(GLM_HEAD, "1000198"), _obj(GLM_HEAD, "1000001"), _obj(GLM_HEAD, "1000402")]
+    report = match_slots(slots, files, tolerance_sec=5)
+
+    assert report["assigned"] == {slots[0]: files[1], slots[1]: files[0], slots[2]: files[2]}
+    assert report["delta_sec"][slots[1]] == 0.2
+    assert report["missing"] == []
+
+
+def test_zero_tolerance_is_exact_match_only():
+    slots = [_slot(ABI_HEAD, "1010")]
+    report = match_slots(slots, [_obj(ABI_HEAD, "1009406")], tolerance_sec=0)
+
+    assert report["assigned"] == {}
+    assert report["missing"] == slots
+
+
+def test_resolve_match_tolerance():
+    assert resolve_match_tolerance("ABI-L2-MCMIPF", 30) == 30.0
+    assert resolve_match_tolerance("ABI-L2-MCMIPF", 0) == 0.0
+    assert resolve_match_tolerance("ABI-L2-MCMIPF") == 120.0
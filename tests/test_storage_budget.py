@@ -0,0 +1,60 @@
+"""
+Path: tests/test_storage_budget.py
+Version: 0.1.0 (Evicted file -> plan slot)
+Description: match_evicted_slots() must find the slot run-download-s3 filled, also for files
+             whose start time is not on the nominal slot (tolerance matching, fn09).
+"""
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from goes_processor.actions.a02_planning.core01_planner_download.code01_gen_plan_download import (
+    generate_download_plan_day
+)
+from goes_processor.actions.a03_download.core01_download_from_s3.fn09_slot_matcher import resolve_match_tolerance
+from goes_processor.actions.a03_download.core04_storage_budget.code01_storage_budget_engine import (
+    match_evicted_slots
+)
+
+
+def _file(head, start):
+    return f"{head}_s{start}_e{start}_c{start}.nc"
+
+
+def _slot_time(match):
+    return match[1].time_stamp
+
+
+def test_off_slot_abi_file_goes_to_nearest_slot():
+    plan = generate_download_plan_day("east", "ABI-L2-MCMIPF", "2026", "003")
+    name = _file("OR_ABI-L2-MCMIPF-M6_G19", "20260030009596")     # 00:09:59.6 -> slot 00:10
+    matched = match_evicted_slots(plan, [name], resolve_match_tolerance("ABI-L2-MCMIPF"))
+    assert _slot_time(matched[name]) == "20260030010"
+
+
+def test_early_lstf_file_does_not_hit_previous_hour():
+    plan = generate_download_plan_day("east", "ABI-L2-LSTF", "2026", "003")
+    name = _file("OR_ABI-L2-LSTF-M6_G19", "20260030059506")       # 00:59:50.6 -> slot 01
+    matched = match_evicted_slots(plan, [name], resolve_match_tolerance("ABI-L2-LSTF"))
+    assert _slot_time(matched[name]) == "202600301"
+
+
+def test_recorded_file_name_wins_and_duplicates_are_ignored():
+    plan = generate_download_plan_day("east", "ABI-L2-MCMIPF", "2026", "003")
+    slot = next(s for s in plan.slots.values() if s.time_stamp == "20260030010")
+    kept = _file("OR_ABI-L2-MCMIPF-M6_G19", "20260030010207")
+    duplicate = _file("OR_ABI-L2-MCMIPF-M6_G19", "20260030010509")
+    slot.file_local.file_name = kept
+
+    tolerance = resolve_match_tolerance("ABI-L2-MCMIPF")
+    assert match_evicted_slots(plan, [duplicate], tolerance) == {}
+    assert _slot_time(match_evicted_slots(plan, [kept], tolerance)[kept]) == "20260030010"
+
+
+def test_zero_tolerance_uses_exact_prefix():
+    plan = generate_download_plan_day("east", "ABI-L2-MCMIPF", "2026", "003")
+    on_slot = _file("OR_ABI-L2-MCMIPF-M6_G19", "20260030010207")
+    off_slot = _file("OR_ABI-L2-MCMIPF-M6_G19", "20260030009596")
+    matched = match_evicted_slots(plan, [on_slot, off_slot], 0)
+    assert list(matched) == [on_slot]